@@ -1,4 +1,13 @@
 from .swarm import Swarm
+from .history import History
+from .checkpoint import Checkpoint
+from .callback import Callback, CallbackList, ConsoleReporter, JSONLinesLogger
+from .termination import Termination, Stall, SwarmDiameter, WallClock, EvaluationBudget, TargetValue
+from .topology import Topology, GlobalBest, Ring, VonNeumann, RandomK, KNearest
 from .optimizer import PSO_Optimizer
+from .island import IslandOptimizer
 
-__all__ = ["Swarm", "PSO_Optimizer"]
\ No newline at end of file
+__all__ = ["Swarm", "History", "Checkpoint", "PSO_Optimizer", "IslandOptimizer",
+		   "Callback", "CallbackList", "ConsoleReporter", "JSONLinesLogger",
+		   "Termination", "Stall", "SwarmDiameter", "WallClock", "EvaluationBudget", "TargetValue",
+		   "Topology", "GlobalBest", "Ring", "VonNeumann", "RandomK", "KNearest"]
\ No newline at end of file
@@ -0,0 +1,179 @@
+'''
+This module implements the callbacks which observe the progress of PSO_Optimizer.
+'''
+import sys
+import json
+import time
+import numpy as np
+
+class Callback:
+	'''
+	Parent class of the callbacks, every hook does nothing.
+
+	Every hook receives the optimizer and a dict of structured data.
+	Synchronous PSO:
+		on_iteration_start : iteration
+		on_evaluation_done : iteration, evaluation_time
+		on_iteration_end : iteration, iterations, gbest_eval, evaluation_time, topology_time,
+			update_time, snap_time, iteration_time
+	Asynchronous PSO:
+		on_evaluation_done : iteration, particle, evaluation
+		on_iteration_end : iteration, iterations, gbest_eval, iteration_time,
+			called once every particles completed evaluations
+	Both:
+		on_finish : iterations, gbest_eval, gbest_pos, total_time
+	on_close(optimizer) is called when a run ends, also when it raises or is interrupted,
+	to release the resources of the callback.
+	All times are in seconds. topology_time is the time spent finding the neighbours,
+	i.e. building and querying the KD-tree for KNearest.
+	'''
+	def on_iteration_start(self, optimizer, info):
+		pass
+
+	def on_evaluation_done(self, optimizer, info):
+		pass
+
+	def on_iteration_end(self, optimizer, info):
+		pass
+
+	def on_finish(self, optimizer, info):
+		pass
+
+	def on_close(self, optimizer):
+		pass
+
+
+class CallbackList(Callback):
+	'''
+	Forward every hook to a list of callbacks.
+
+	Attributes
+	----------
+	callbacks : list of Callback
+	'''
+	def __init__(self, callbacks):
+		self.callbacks = list(callbacks)
+
+	def on_iteration_start(self, optimizer, info):
+		for callback in self.callbacks:
+			callback.on_iteration_start(optimizer, info)
+
+	def on_evaluation_done(self, optimizer, info):
+		for callback in self.callbacks:
+			callback.on_evaluation_done(optimizer, info)
+
+	def on_iteration_end(self, optimizer, info):
+		for callback in self.callbacks:
+			callback.on_iteration_end(optimizer, info)
+
+	def on_finish(self, optimizer, info):
+		for callback in self.callbacks:
+			callback.on_finish(optimizer, info)
+
+	def on_close(self, optimizer):
+		for callback in self.callbacks:
+			callback.on_close(optimizer)
+
+
+class ConsoleReporter(Callback):
+	'''
+	Print the progress to a stream, at most once every interval seconds and every given
+	iterations. Only the best evaluation and the times are printed per iteration, the best
+	position is printed when the optimization is done.
+
+	Attributes
+	----------
+	every : int
+		report every given iterations
+	interval : float
+		the minimum seconds between two reports
+	stream : file
+		the stream to write, sys.stdout if None
+	'''
+	def __init__(self, every=1, interval=1.0, stream=None):
+		self.every = every
+		self.interval = interval
+		self.stream = stream
+		self.last_time = -np.inf
+
+	def write(self, text):
+		stream = sys.stdout if self.stream is None else self.stream
+		stream.write(text + '\n')
+
+	def on_iteration_end(self, optimizer, info):
+		now = time.time()
+		if (info['iteration'] + 1) % self.every == 0 and now - self.last_time >= self.interval:
+			self.last_time = now
+			self.write("Iteration {}/{}: best evaluation: {}; time consume: {:.6f}.".format(
+				info['iteration'], info['iterations'], info['gbest_eval'], info['iteration_time']))
+
+	def on_finish(self, optimizer, info):
+		self.write("---------------Optimization Done---------------")
+		for key, value in info.items():
+			self.write("{}: {}".format(key, value))
+
+
+class JSONLinesLogger(Callback):
+	'''
+	Write every event as one JSON object per line, e.g.
+		{"event": "iteration_end", "iteration": 0, "gbest_eval": 1.5, ...}
+	The per-particle evaluations of the asynchronous PSO are written only if evaluations is True.
+	The file is closed when the run ends and opened again, in append mode, by the next run.
+	It can also be closed by close() or by using the logger as a context manager.
+
+	Attributes
+	----------
+	path : str
+		the path of the log file
+	evaluations : bool
+		whether to log on_evaluation_done
+	file : file or None
+		the open log file, None when it is closed
+	'''
+	def __init__(self, path, evaluations=False):
+		self.path = path
+		self.evaluations = evaluations
+		self.file = open(path, 'a')
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def write(self, event, info):
+		record = {'event' : event, 'time' : time.time()}
+		for key, value in info.items():
+			if isinstance(value, np.ndarray):
+				value = value.tolist()
+			elif isinstance(value, np.generic):
+				value = value.item()
+			record[key] = value
+		if self.file is None:
+			self.file = open(self.path, 'a')
+		self.file.write(json.dumps(record) + '\n')
+
+	def on_iteration_start(self, optimizer, info):
+		self.write('iteration_start', info)
+
+	def on_evaluation_done(self, optimizer, info):
+		if self.evaluations:
+			self.write('evaluation_done', info)
+
+	def on_iteration_end(self, optimizer, info):
+		self.write('iteration_end', info)
+
+	def on_finish(self, optimizer, info):
+		self.write('finish', info)
+		self.file.flush()
+
+	def on_close(self, optimizer):
+		self.close()
+
+	def close(self):
+		'''
+		Flush and close the log file.
+		'''
+		if not self.file is None:
+			self.file.close()
+			self.file = None
@@ -0,0 +1,136 @@
+'''
+This module implements Checkpoint class, the periodic and atomic checkpoints of PSO_Optimizer.
+'''
+import os
+import json
+import time
+import numpy as np
+
+class Checkpoint:
+	'''
+	A Checkpoint Class
+
+	This class writes the state of a PSO_Optimizer to a binary .npz file every given iterations
+	or seconds, whichever comes first. The file is written to a temporary file in the same
+	directory and renamed over the checkpoint, so a crash never leaves a corrupted checkpoint.
+
+	The state covers position, velocity, evaluation, pbest, gbest, the iteration and evaluation
+	counters, the total iterations (which define the inertia schedule), the state of the numpy
+	Generator, the state of the topology and the state of the termination criteria, e.g. the
+	stall count of Stall and the time spent for WallClock. PSO_Optimizer.resume() continues the
+	run identically when it is given the same criteria in the same order.
+
+	Attributes
+	----------
+	path : str
+		the path of the checkpoint file
+	every : int or None
+		write a checkpoint every given iterations
+	interval : float or None
+		write a checkpoint every given seconds
+	last_time : float
+		the time of the last checkpoint
+	'''
+	def __init__(self, path, every=None, interval=None):
+		if every is None and interval is None:
+			raise ValueError("Parameter every or interval must be given.")
+		if not (every is None or (isinstance(every, int) and every > 0)):
+			raise ValueError("Parameter every must be a positive int.")
+		self.path = path
+		self.every = every
+		self.interval = interval
+		self.last_time = time.time()
+
+	def due(self, iteration):
+		'''
+		Check whether a checkpoint should be written after the given number of iterations.
+		'''
+		if not self.every is None and iteration % self.every == 0:
+			return True
+		if not self.interval is None and time.time() - self.last_time >= self.interval:
+			return True
+		return False
+
+	def save(self, optimizer):
+		'''
+		Write the state of the optimizer atomically.
+
+		Parameters
+		----------
+		optimizer : PSO_Optimizer
+			the optimizer to be saved
+		'''
+		swarm = optimizer.pswarm
+		state = {
+			'position' : swarm.position,
+			'velocity' : swarm.velocity,
+			'evaluation' : swarm.evaluation,
+			'pbest_pos' : swarm.pbest_pos,
+			'pbest_eval' : swarm.pbest_eval,
+			'gbest_pos' : swarm.gbest_pos,
+			'gbest_eval' : np.array(swarm.gbest_eval, dtype=float),
+			'iteration' : np.array(optimizer.iteration),
+			'iterations' : np.array(optimizer.iterations),
+			'evaluations' : np.array(optimizer.evaluations),
+			'rng_state' : np.array(json.dumps(optimizer.rng.bit_generator.state))
+			}
+		for name, value in optimizer.topology.get_state().items():
+			state['topology_' + name] = value
+		for i, criterion in enumerate(optimizer.termination):
+			for name, value in criterion.get_state().items():
+				state['termination{}_{}'.format(i, name)] = value
+		directory = os.path.dirname(os.path.abspath(self.path))
+		temp_path = os.path.join(directory, '.' + os.path.basename(self.path) + '.tmp')
+		with open(temp_path, 'wb') as f:
+			np.savez(f, **state)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(temp_path, self.path)
+		self.last_time = time.time()
+
+
+def load(path, optimizer, termination=()):
+	'''
+	Restore the state of the optimizer and of the termination criteria from a checkpoint.
+
+	Parameters
+	----------
+	path : str
+		the path of the checkpoint file
+	optimizer : PSO_Optimizer
+		the optimizer to be restored, created with the same particles, variables and topology
+	termination : list of Termination
+		the criteria to be restored, the same criteria in the same order as the checkpointed run
+
+	Raises
+	------
+	ValueError
+		When the checkpoint does not match the size of the optimizer's swarm.
+	'''
+	with np.load(path) as data:
+		if not data['position'].shape == (optimizer.particles, optimizer.dimensions):
+			raise ValueError("The checkpoint does not match the swarm of the optimizer.")
+		swarm = optimizer.pswarm
+		swarm.position = data['position']
+		swarm.velocity = data['velocity']
+		swarm.evaluation = data['evaluation']
+		swarm.pbest_pos = data['pbest_pos']
+		swarm.pbest_eval = data['pbest_eval']
+		swarm.gbest_pos = data['gbest_pos']
+		swarm.gbest_eval = float(data['gbest_eval'])
+		optimizer.iteration = int(data['iteration'])
+		optimizer.iterations = int(data['iterations'])
+		optimizer.evaluations = int(data['evaluations'])
+		optimizer.rng.bit_generator.state = json.loads(str(data['rng_state']))
+		topology_state = {}
+		for name in data.files:
+			if name.startswith('topology_'):
+				topology_state[name[len('topology_'):]] = data[name]
+		optimizer.topology.set_state(topology_state)
+		for i, criterion in enumerate(termination):
+			prefix = 'termination{}_'.format(i)
+			criterion_state = {}
+			for name in data.files:
+				if name.startswith(prefix):
+					criterion_state[name[len(prefix):]] = data[name]
+			criterion.set_state(criterion_state)
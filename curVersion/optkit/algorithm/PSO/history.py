@@ -0,0 +1,122 @@
+'''
+This module implements History class.
+'''
+import os
+import numpy as np
+
+class History:
+	'''
+	A History Class
+
+	This class records the swarm of every iteration into arrays preallocated for the whole run,
+	nothing is reallocated between iterations. Every field is opt-in, so large runs can record
+	only the gbest. If directory is given, the arrays are memory-mapped .npy files in the
+	directory instead of being held in memory.
+
+	Fields
+	------
+	position : position of size (iterations, particles, dimensions)
+	velocity : velocity of size (iterations, particles, dimensions)
+	evaluation : evaluation of size (iterations, particles)
+	pbest : pbest_pos of size (iterations, particles, dimensions) and pbest_eval of size (iterations, particles)
+	gbest : gbest_pos of size (iterations, dimensions) and gbest_eval of size iterations
+
+	Attributes
+	----------
+	iterations : int
+		the maximum number of iterations to be recorded
+	particles : int
+		number of particles in the swarm
+	dimensions : int
+		number of dimensions in the swarm
+	fields : tuple of str
+		the recorded fields
+	directory : str or None
+		the directory of the memory-mapped files
+	arrays : dict
+		{name} : ndarray or numpy.memmap
+	size : int
+		the number of recorded iterations
+	'''
+	FIELDS = ('position', 'velocity', 'evaluation', 'pbest', 'gbest')
+
+	def __init__(self, iterations, particles, dimensions, fields=('gbest',), directory=None):
+		for field in fields:
+			if not field in self.FIELDS:
+				raise ValueError("Field {} must be one of {}.".format(field, self.FIELDS))
+		self.iterations = iterations
+		self.particles = particles
+		self.dimensions = dimensions
+		self.fields = tuple(fields)
+		self.directory = directory
+		self.size = 0
+		shapes = {}
+		if 'position' in self.fields:
+			shapes['position'] = (iterations, particles, dimensions)
+		if 'velocity' in self.fields:
+			shapes['velocity'] = (iterations, particles, dimensions)
+		if 'evaluation' in self.fields:
+			shapes['evaluation'] = (iterations, particles)
+		if 'pbest' in self.fields:
+			shapes['pbest_pos'] = (iterations, particles, dimensions)
+			shapes['pbest_eval'] = (iterations, particles)
+		if 'gbest' in self.fields:
+			shapes['gbest_pos'] = (iterations, dimensions)
+			shapes['gbest_eval'] = (iterations,)
+		if not directory is None and not os.path.exists(directory):
+			os.makedirs(directory)
+		self.arrays = {}
+		for name, shape in shapes.items():
+			if directory is None:
+				self.arrays[name] = np.zeros(shape)
+			else:
+				self.arrays[name] = np.lib.format.open_memmap(
+					os.path.join(directory, name + '.npy'), mode='w+', dtype=float, shape=shape)
+
+	def __getitem__(self, name):
+		'''
+		Return the recorded iterations of an array, e.g. history['gbest_eval'].
+		'''
+		return self.arrays[name][:self.size]
+
+	def __len__(self):
+		return self.size
+
+	def record(self, swarm):
+		'''
+		Copy the recorded fields of the swarm into the next iteration of the arrays.
+
+		Parameters
+		----------
+		swarm : Swarm
+			the swarm to be recorded
+
+		Raises
+		------
+		IndexError
+			When the history is full.
+		'''
+		if self.size >= self.iterations:
+			raise IndexError("History is full.")
+		for name, array in self.arrays.items():
+			array[self.size] = getattr(swarm, name)
+		self.size += 1
+
+	def flush(self):
+		'''
+		Write the memory-mapped arrays to their files.
+		'''
+		for array in self.arrays.values():
+			if isinstance(array, np.memmap):
+				array.flush()
+
+	def save(self, path):
+		'''
+		Save the recorded iterations to a compressed .npz file.
+
+		Parameters
+		----------
+		path : str
+			the path of the .npz file
+		'''
+		np.savez_compressed(path, **{name : self[name] for name in self.arrays})
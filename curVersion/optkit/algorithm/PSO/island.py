@@ -0,0 +1,243 @@
+'''
+This module implements IslandOptimizer class, the multi-swarm (island model) PSO.
+'''
+import time
+import traceback
+import multiprocessing
+import numpy as np
+from ..evaluator import SerialEvaluator
+from .optimizer import PSO_Optimizer, get_callback
+
+def island_worker(conn, particles, neighbour, variables, seed, topology, obj_func, batch):
+	'''
+	Run one island in a worker process. The island is a PSO_Optimizer driven by the commands
+	received from conn:
+		('run', iterations, until, migrants) : run the iterations until until,
+			reply the migrants' positions and evaluations and the gbest_eval
+		('immigrate', positions, evaluations) : replace the worst particles by the immigrants
+		('stop',) : reply the gbest and exit
+	Every reply is ('ok', data) or ('error', traceback).
+	'''
+	try:
+		opt = PSO_Optimizer(particles, neighbour, variables, seed=seed, topology=topology)
+		evaluator = None if batch else SerialEvaluator()
+		conn.send(('ok', None))
+	except Exception:
+		conn.send(('error', traceback.format_exc()))
+		conn.close()
+		return
+	while True:
+		command = conn.recv()
+		try:
+			if command[0] == 'run':
+				_, opt.iterations, until, migrants = command
+				opt.run(obj_func, batch=batch, evaluator=evaluator, until=until)
+				best = np.argsort(opt.pswarm.pbest_eval)[:migrants]
+				conn.send(('ok', (opt.pswarm.pbest_pos[best].copy(), opt.pswarm.pbest_eval[best].copy(),
+								  float(opt.pswarm.gbest_eval))))
+			elif command[0] == 'immigrate':
+				_, positions, evaluations = command
+				worst = np.argsort(opt.pswarm.pbest_eval)[::-1][:len(evaluations)]
+				opt.pswarm.position[worst] = positions
+				opt.pswarm.pbest_pos[worst] = positions
+				opt.pswarm.pbest_eval[worst] = evaluations
+				opt.pswarm.update_gbest()
+				conn.send(('ok', None))
+			elif command[0] == 'stop':
+				conn.send(('ok', (opt.pswarm.gbest_pos, opt.pswarm.gbest_eval, opt.evaluations)))
+				break
+		except Exception:
+			conn.send(('error', traceback.format_exc()))
+			break
+	conn.close()
+
+
+class IslandOptimizer:
+	'''
+	An IslandOptimizer Class
+
+	Several swarms (islands) run the PSO_Optimizer update rules, each in its own worker process,
+	so every core is used by both the swarm update and the evaluation. Every migration_interval
+	iterations, each island sends copies of its best pbest (the migrants) to other islands, which
+	replace their worst particles by them. The migration topology is
+		'ring' : island i sends its migrants to island i+1
+		'full' : every island receives the best migrants of all other islands
+
+	The objective function is called by the worker processes, so it must be picklable, e.g.
+	defined at module level. It is obj_func(positions) on the whole swarm of an island if batch,
+	otherwise obj_func(position) on one particle, run by a SerialEvaluator in the island's process.
+	The scalar obj_func() contract is not supported, because the islands do not share the
+	Variable objects.
+
+	Attributes
+	----------
+	islands : int
+		the number of islands
+	particles : int
+		the number of the particles of each island
+	neighbour : int
+		the size of a particle's neighbourhood
+	variables : list of Variable
+		the variables of the project
+	migration_interval : int
+		the number of iterations between two migrations
+	migrants : int
+		the number of particles sent by each island per migration
+	migration_topology : str
+		'ring' or 'full'
+	seeds : list of numpy.random.SeedSequence
+		the seed of each island, spawned from seed
+	topology : Topology or None
+		the neighbourhood topology of every island, see PSO_Optimizer
+	gbest_pos : ndarray of float, size dimensions
+		the global best position of all islands
+	gbest_eval : float
+		the global best evaluation of all islands
+	island_best : list of float
+		the gbest_eval of every island
+	evaluations : int
+		the number of the objective evaluations of all islands
+	'''
+	MIGRATION_TOPOLOGIES = ('ring', 'full')
+
+	def __init__(self, islands, particles, neighbour, variables, migration_interval=10, migrants=1,
+				 migration_topology='ring', seed=None, topology=None):
+		if not (isinstance(islands, int) and islands > 0):
+			raise ValueError("Parameter islands must be a positive int.")
+		if not (isinstance(migration_interval, int) and migration_interval > 0):
+			raise ValueError("Parameter migration_interval must be a positive int.")
+		if not (isinstance(migrants, int) and 0 <= migrants <= particles):
+			raise ValueError("Parameter migrants must be an int in [0, particles].")
+		if not migration_topology in self.MIGRATION_TOPOLOGIES:
+			raise ValueError("Parameter migration_topology must be one of {}.".format(self.MIGRATION_TOPOLOGIES))
+		self.islands = islands
+		self.particles = particles
+		self.neighbour = neighbour
+		self.variables = variables
+		self.migration_interval = migration_interval
+		self.migrants = migrants
+		self.migration_topology = migration_topology
+		self.seeds = np.random.SeedSequence(seed).spawn(islands)
+		self.topology = topology
+		self.gbest_pos = np.array([])
+		self.gbest_eval = np.inf
+		self.island_best = []
+		self.evaluations = 0
+
+	def optimize(self, iterations, obj_func, *, batch=False, callback=None):
+		'''
+		Run every island for iterations, migrating every migration_interval iterations.
+
+		Parameters
+		----------
+		iterations : int
+			the number of iterations of every island
+		obj_func : callable
+			the objective function, see the class docstring
+		batch : bool
+			whether obj_func evaluates the whole swarm of an island in one call,
+			otherwise it evaluates one particle per call
+		callback : Callback or list of Callback or None
+			called with on_iteration_end after every migration and on_finish, see Callback
+		'''
+		callback = get_callback(callback)
+		time_init = time.time()
+		try:
+			conns = []
+			workers = []
+			try:
+				for island in range(self.islands):
+					parent_conn, child_conn = multiprocessing.Pipe()
+					worker = multiprocessing.Process(
+						target=island_worker,
+						args=(child_conn, self.particles, self.neighbour, self.variables,
+							  self.seeds[island], self.topology, obj_func, batch),
+						daemon=True)
+					worker.start()
+					child_conn.close()
+					conns.append(parent_conn)
+					workers.append(worker)
+				self.gather(conns)
+				for start in range(0, iterations, self.migration_interval):
+					time_start = time.time()
+					until = min(start + self.migration_interval, iterations)
+					for conn in conns:
+						conn.send(('run', iterations, until, self.migrants))
+					replies = self.gather(conns)
+					migrants = [(positions, evaluations) for positions, evaluations, _ in replies]
+					if until < iterations and self.migrants > 0 and self.islands > 1:
+						for conn, immigrants in zip(conns, self.migrate(migrants)):
+							conn.send(('immigrate',) + immigrants)
+						self.gather(conns)
+					callback.on_iteration_end(self, {
+						'iteration' : until - 1,
+						'iterations' : iterations,
+						'gbest_eval' : min(gbest_eval for _, _, gbest_eval in replies),
+						'iteration_time' : time.time() - time_start
+						})
+				for conn in conns:
+					conn.send(('stop',))
+				results = self.gather(conns)
+			finally:
+				for conn in conns:
+					conn.close()
+				for worker in workers:
+					worker.join(timeout=5)
+					if worker.is_alive():
+						worker.terminate()
+			self.island_best = [float(gbest_eval) for _, gbest_eval, _ in results]
+			best = int(np.argmin(self.island_best))
+			self.gbest_pos = results[best][0]
+			self.gbest_eval = self.island_best[best]
+			self.evaluations = sum(evaluations for _, _, evaluations in results)
+			callback.on_finish(self, {
+				'iterations' : iterations,
+				'evaluations' : self.evaluations,
+				'gbest_eval' : self.gbest_eval,
+				'gbest_pos' : self.gbest_pos,
+				'island_best' : self.island_best,
+				'total_time' : time.time() - time_init
+				})
+		finally:
+			callback.on_close(self)
+
+	def gather(self, conns):
+		'''
+		Receive one reply from every island in island order.
+
+		Raises
+		------
+		RuntimeError
+			When an island failed.
+		'''
+		replies = []
+		for island, conn in enumerate(conns):
+			status, data = conn.recv()
+			if status == 'error':
+				raise RuntimeError("Island {} failed:\n{}".format(island, data))
+			replies.append(data)
+		return replies
+
+	def migrate(self, migrants):
+		'''
+		Decide the immigrants of every island.
+
+		Parameters
+		----------
+		migrants : list of (ndarray, ndarray)
+			the migrants' positions and evaluations of every island
+
+		Returns
+		-------
+		immigrants : list of (ndarray, ndarray)
+			the immigrants' positions and evaluations of every island
+		'''
+		if self.migration_topology == 'ring':
+			return [migrants[(island - 1) % self.islands] for island in range(self.islands)]
+		immigrants = []
+		for island in range(self.islands):
+			positions = np.concatenate([migrants[i][0] for i in range(self.islands) if not i == island])
+			evaluations = np.concatenate([migrants[i][1] for i in range(self.islands) if not i == island])
+			best = np.argsort(evaluations)[:self.migrants]
+			immigrants.append((positions[best], evaluations[best]))
+		return immigrants
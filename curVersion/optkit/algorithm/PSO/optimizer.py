@@ -2,14 +2,17 @@
 This module implements Optimizer class.
 '''
 import time
-from collections import namedtuple
-from scipy.spatial import cKDTree
+from concurrent.futures import Future, wait, FIRST_COMPLETED
 import numpy as np
 from . import Swarm
-from ...workflow import Continuous, Discrete, Constant
+from .topology import KNearest
+from . import checkpoint as _checkpoint
+from .callback import Callback, CallbackList
+from .termination import Termination
+from ...workflow import Continuous, Discrete, Constant, VariableSet
 
 class PSO_Optimizer:
-	def __init__(self, particles, neighbour, variables):
+	def __init__(self, particles, neighbour, variables, seed=None, topology=None):
 		'''
 		Parameters
 		----------
@@ -19,6 +22,10 @@ class PSO_Optimizer:
 			the size of a particle's neighbourhood
 		variables : list of Variable
 			the variables of the project
+		seed : int or None
+			the seed of the random number generator
+		topology : Topology or None
+			the neighbourhood topology, KNearest(neighbour) if None
 
 		Attributes
 		----------
@@ -28,114 +35,422 @@ class PSO_Optimizer:
 			the number of the dimensions
 		neighbour : int
 			the size of a particle's neighbourhood
+		topology : Topology
+			the neighbourhood topology of the swarm
 		pswarm : Swarm
 			the particle swarm of this optimizer
-		history : list of namedtuple
-			store every iteration's gbest_pos, gbest_eval, pbest_pos, pbest_eval, position, velocity, evaluation
-		History : type
-			a structure and the basic element of history
+		history : History or None
+			the history recorder of the last optimize()
+		iteration : int
+			the number of finished iterations of the current run
+		iterations : int
+			the total iterations of the current run
+		timing : dict
+			the seconds spent by the last update_swarm(), {'topology' : float, 'update' : float}
+		evaluations : int
+			the number of the objective evaluations of the current run, cached ones excluded
+		stop_reason : str
+			why the last run stopped, 'iterations' if it ran all iterations
+		termination : list of Termination
+			the termination criteria of the current run
 		var_list : list of Variable
 			the list of input variables
+		variable_set : VariableSet or None
+			the set of var_list if they are views of one VariableSet, see VariableSet.locate()
+		var_indices : ndarray of int or None
+			the index of each variable of var_list in variable_set
 		upper : ndarray of float, size dimensions
 			the upper bound of each dimension
 		lower : ndarray of float, size dimensions
 			the lower bound of each dimension
+		baseline : ndarray of float, size dimensions
+			the baseline of each dimension, used to standardize the position
 		v_limit : ndarray of float, size dimensions
 			the limit of velocity. set to (upper-lower)/2
+		v_limit_neg : ndarray of float, size dimensions
+			-v_limit
+		all_index : ndarray of int
+			the index of all particles
+		rng : numpy.random.Generator
+			the random number generator of the optimizer
+		discrete_index : list of int
+			the dimensions of the discrete variables
+		discrete_sets : list of ndarray of float
+			the sorted value set of each discrete dimension, the lookup tables of post_process()
 		'''
 		self.particles = particles
 		self.neighbour = neighbour
-		'''
-		self.history = []
-		self.History = namedtuple(
-			'History',
-			[
-				'gbest_eval',
-				'gbest_pos',
-				'pbest_eval',
-				'pbest_pos',
-				'position',
-				'evaluation',
-				'velocity'
-			])
-		'''
-		self.var_list = []
-		_upper = []
-		_lower = []
-		for var in variables:
-			if not isinstance(var, Constant):
-				self.var_list.append(var)
-				_lower.append(var.var_range[0])
-				_upper.append(var.var_range[-1])
-			else:
-				pass
+		self.rng = np.random.default_rng(seed)
+		self.history = None
+		self.iteration = 0
+		self.iterations = 0
+		self.timing = {'topology' : 0.0, 'update' : 0.0}
+		self.evaluations = 0
+		self.stop_reason = ''
+		self.termination = []
+		self.var_list = [var for var in variables if not isinstance(var, Constant)]
+		self.variable_set, self.var_indices = VariableSet.locate(self.var_list)
+		if self.variable_set is None:
+			_lower = [var.var_range[0] for var in self.var_list]
+			_upper = [var.var_range[-1] for var in self.var_list]
+			_baseline = [var.baseline for var in self.var_list]
+		else:
+			# the bounds are read from the columns of the set at once
+			_lower = self.variable_set.lower[self.var_indices]
+			_upper = self.variable_set.upper[self.var_indices]
+			_baseline = self.variable_set.baseline[self.var_indices]
 		self.dimensions = len(self.var_list)
+		self.discrete_index = []
+		self.discrete_sets = []
+		for var_index in range(self.dimensions):
+			if isinstance(self.var_list[var_index], Discrete):
+				self.discrete_index.append(var_index)
+				self.discrete_sets.append(np.sort(np.array(self.var_list[var_index].var_range, dtype=float)))
 		self.pswarm = Swarm(self.particles, self.dimensions)
 		_upper = np.array(_upper)
 		_lower = np.array(_lower)
 		self.lower = np.repeat(_lower[np.newaxis], self.particles, axis=0)
 		self.upper = np.repeat(_upper[np.newaxis], self.particles, axis=0)
 		self.v_limit = (self.upper - self.lower) / 40
-		self.pswarm.initiate(self.lower, self.upper)
+		self.v_limit_neg = -self.v_limit
+		self.all_index = np.arange(self.particles)
+		self.baseline = np.array(_baseline, dtype=float)
+		if topology is None:
+			topology = KNearest(self.neighbour)
+		self.topology = topology
+		self.topology.setup(self)
+		self.pswarm.initiate(self.lower, self.upper, self.rng)
 		self.post_process()
 
-	def optimize(self, iterations, obj_func):
+	def optimize(self, iterations, obj_func, *, batch=False, evaluator=None, history=None, checkpoint=None,
+				 cache=None, callback=None, termination=None):
 		'''
-		for iterations
-			for particles
-				pre-process the variables, run obj_func
-				update pbest
+		for iterations or until a termination criterion is met
+			evaluate the swarm
+			update pbest
 			update gbest
 			record history
 			update velocity, position
+			write checkpoint
+			check termination
+
+		Parameters
+		----------
+		iterations : int
+			the number of iterations
+		obj_func : callable
+			the objective function. See evaluate() for the two supported contracts.
+		batch : bool
+			whether obj_func evaluates the whole swarm in one call
+		evaluator : SerialEvaluator or None
+			the evaluator which farms the particles out to its workers
+		history : History or None
+			the recorder of every iteration's swarm, see History
+		checkpoint : Checkpoint or None
+			the periodic checkpoint of the run, see Checkpoint
+		cache : EvaluationCache or None
+			the cache of the evaluations, see EvaluationCache
+		callback : Callback or list of Callback or None
+			the observers of the progress, see Callback
+		termination : Termination or list of Termination or None
+			the criteria to stop the run before iterations, the run stops when any of them is met.
+			The criterion is reported by stop_reason. See Termination.
+		'''
+		self.iteration = 0
+		self.iterations = iterations
+		self.evaluations = 0
+		self.run(obj_func, batch=batch, evaluator=evaluator, history=history, checkpoint=checkpoint,
+				 cache=cache, callback=callback, termination=termination)
+
+	def resume(self, path, obj_func, *, batch=False, evaluator=None, history=None, checkpoint=None,
+			   cache=None, callback=None, termination=None):
+		'''
+		Continue a run from the checkpoint written by optimize(). The optimizer must be created
+		with the same particles, neighbour, variables and topology as the checkpointed one, and
+		termination must list the same criteria in the same order, their state is restored too.
+		The run continues exactly as if it had never been interrupted.
+
+		Parameters
+		----------
+		path : str
+			the path of the checkpoint file
+		others
+			see optimize()
+		'''
+		termination = get_termination(termination, self)
+		_checkpoint.load(path, self, termination)
+		self.run(obj_func, batch=batch, evaluator=evaluator, history=history, checkpoint=checkpoint,
+				 cache=cache, callback=callback, termination=termination)
+
+	def run(self, obj_func, *, batch=False, evaluator=None, history=None, checkpoint=None, cache=None,
+			callback=None, termination=None, until=None):
 		'''
-		time_init = time.time()
-		# do optimization
-		for i in range(iterations):
-			time_start = time.time()
-			# get evaluation
-			_evaluation = []
+		Run the iterations from self.iteration to until, see optimize().
+		until is self.iterations if None. A run can be split into several calls with increasing
+		until, e.g. by the island model to migrate particles between the calls.
+		The termination criteria are reset only when the run starts from iteration 0.
+		'''
+		self.history = history
+		callback = get_callback(callback)
+		termination = get_termination(termination, self, self.iteration == 0)
+		self.termination = termination
+		self.stop_reason = 'iterations'
+		iterations = self.iterations
+		if until is None:
+			until = iterations
+		try:
+			time_init = time.time()
+			# do optimization
+			while self.iteration < until:
+				i = self.iteration
+				time_start = time.time()
+				callback.on_iteration_start(self, {'iteration' : i})
+				# get evaluation
+				self.pswarm.evaluation = self.evaluate(obj_func, batch=batch, evaluator=evaluator, cache=cache)
+				time_evaluation = time.time() - time_start
+				callback.on_evaluation_done(self, {'iteration' : i, 'evaluation_time' : time_evaluation})
+				# update pbest
+				if i == 0:
+					self.pswarm.pbest_eval = self.pswarm.evaluation.copy()
+				else:
+					self.pswarm.update_pbest()
+				# update gbest
+				self.pswarm.update_gbest()
+				# record history
+				if not history is None:
+					history.record(self.pswarm)
+				# update velocity & position
+				self.update_swarm(iterations, i)
+				# post process the data of the value
+				time_snap = time.time()
+				self.post_process()
+				time_snap = time.time() - time_snap
+				# report iteration result
+				callback.on_iteration_end(self, {
+					'iteration' : i,
+					'iterations' : iterations,
+					'gbest_eval' : self.pswarm.gbest_eval,
+					'evaluation_time' : time_evaluation,
+					'topology_time' : self.timing['topology'],
+					'update_time' : self.timing['update'],
+					'snap_time' : time_snap,
+					'iteration_time' : time.time() - time_start
+					})
+				# check termination & write checkpoint
+				self.iteration += 1
+				stop = self.check_termination(termination)
+				if not checkpoint is None and (stop or self.iteration == iterations or checkpoint.due(self.iteration)):
+					checkpoint.save(self)
+				if stop:
+					break
+			self.finish(callback, time_init)
+		finally:
+			callback.on_close(self)
+	
+	def optimize_async(self, iterations, obj_func, evaluator, cache=None, callback=None, termination=None):
+		'''
+		Asynchronous (steady-state) PSO.
+		Every particle is submitted to the evaluator. As soon as the evaluation of a particle
+		completes, its pbest and the gbest are updated, its velocity and position are updated by
+		update_swarm() with the current pbest of its neighbourhood, and it is resubmitted.
+		No particle waits for the slowest evaluation of an iteration.
+
+		Parameters
+		----------
+		iterations : int
+			the number of iterations. The run stops after iterations * particles evaluations,
+			and the iteration used for calculating w is the number of completed evaluations
+			divided by particles.
+		obj_func : callable
+			obj_func(position) -> float, see SerialEvaluator.map()
+		evaluator : SerialEvaluator
+			the evaluator which runs the particles on its workers
+		cache : EvaluationCache or None
+			the cache of the evaluations, a cached particle is not submitted to the evaluator
+		callback : Callback or list of Callback or None
+			the observers of the progress, see Callback
+		termination : Termination or list of Termination or None
+			the criteria to stop the run, checked every particles completed evaluations.
+			When one is met, no particle is resubmitted and the pending evaluations are finished.
+		'''
+		callback = get_callback(callback)
+		termination = get_termination(termination, self)
+		self.termination = termination
+		self.stop_reason = 'iterations'
+		self.iteration = 0
+		self.iterations = iterations
+		self.evaluations = 0
+		try:
+			time_init = time.time()
+			time_start = time_init
+			budget = iterations * self.particles
+			self.pswarm.evaluation = np.full(self.particles, np.inf)
+			self.pswarm.pbest_eval = np.full(self.particles, np.inf)
+			self.pswarm.pbest_pos = self.pswarm.position.copy()
+			self.pswarm.gbest_eval = np.inf
+			self.pswarm.gbest_pos = self.pswarm.position[0].copy()
+			# submit the whole swarm
+			pending = {}
 			for j in range(self.particles):
-				for var_index in range(self.dimensions):
-					self.var_list[var_index].value = self.pswarm.position[j][var_index]
-				p_eval = obj_func()
-				_evaluation.append(p_eval)
-			self.pswarm.evaluation = np.array(_evaluation)
-			# update pbest
-			if i == 0:
-				self.pswarm.pbest_eval = self.pswarm.evaluation.copy()
-			else:
-				for j in range(self.particles):
-					if self.pswarm.evaluation[j] < self.pswarm.pbest_eval[j]:
-						self.pswarm.pbest_eval[j] = self.pswarm.evaluation[j]
+				pending[self.submit(obj_func, j, evaluator, cache)] = j
+			submitted = self.particles
+			completed = 0
+			stop = False
+			while pending:
+				done, _ = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					j = pending.pop(future)
+					p_eval = float(future.result())
+					if not cache is None and not future.cache_key is None:
+						cache.put([future.cache_key], [p_eval])
+					completed += 1
+					self.pswarm.evaluation[j] = p_eval
+					callback.on_evaluation_done(self, {'iteration' : self.iteration, 'particle' : j, 'evaluation' : p_eval})
+					# update pbest & gbest
+					if p_eval < self.pswarm.pbest_eval[j]:
+						self.pswarm.pbest_eval[j] = p_eval
 						self.pswarm.pbest_pos[j] = self.pswarm.position[j]
-					else:
-						pass
-			# update gbest
-			self.pswarm.gbest_eval = self.pswarm.pbest_eval.min(axis=0)
-			self.pswarm.gbest_pos = self.pswarm.pbest_pos[self.pswarm.pbest_eval.argmin(axis=0)]
-			# update velocity & position
-			self.update_swarm(iterations, i)
-			# post process the data of the value
-			self.post_process()
-			# print iteration result / record history
-			time_consume = time.time() - time_start
-			print("Iteration {}/{}: best position: {}; best evaluation: {}; time consume: {}.".format(
-				i, iterations, self.pswarm.gbest_pos, self.pswarm.gbest_eval, time_consume))
-		# print result
-		time_total = time.time() - time_init
-		print("---------------Optimization Done---------------")
-		print("Best position: {}".format(self.pswarm.gbest_pos))
-		print("Best evaluation: {}".format(self.pswarm.gbest_eval))
-		print("Total time: {}".format(time_total))
-	
-	def update_swarm(self, iterations, current_iter):
+						if p_eval < self.pswarm.gbest_eval:
+							self.pswarm.gbest_eval = p_eval
+							self.pswarm.gbest_pos = self.pswarm.position[j].copy()
+					if completed % self.particles == 0:
+						callback.on_iteration_end(self, {
+							'iteration' : self.iteration,
+							'iterations' : iterations,
+							'gbest_eval' : self.pswarm.gbest_eval,
+							'iteration_time' : time.time() - time_start
+							})
+						self.iteration += 1
+						time_start = time.time()
+						stop = stop or self.check_termination(termination)
+					# update velocity & position of this particle and resubmit it
+					if submitted < budget and not stop:
+						self.update_swarm(iterations, completed // self.particles, [j])
+						self.post_process([j])
+						pending[self.submit(obj_func, j, evaluator, cache)] = j
+						submitted += 1
+			self.finish(callback, time_init)
+		finally:
+			callback.on_close(self)
+
+	def check_termination(self, termination):
+		'''
+		Check the termination criteria, set stop_reason to the first one met.
+
+		Returns
+		-------
+		stop : bool
+		'''
+		for criterion in termination:
+			if criterion.check(self):
+				self.stop_reason = criterion.reason
+				return True
+		return False
+
+	def finish(self, callback, time_init):
+		'''
+		Report the result of the optimization.
+		'''
+		callback.on_finish(self, {
+			'iterations' : self.iteration,
+			'evaluations' : self.evaluations,
+			'stop_reason' : self.stop_reason,
+			'gbest_eval' : self.pswarm.gbest_eval,
+			'gbest_pos' : self.pswarm.gbest_pos,
+			'total_time' : time.time() - time_init
+			})
+
+	def submit(self, obj_func, j, evaluator, cache=None):
+		'''
+		Submit the position of particle j to the evaluator, used by optimize_async().
+		If the position is cached, a completed future is returned instead.
+
+		Returns
+		-------
+		future : concurrent.futures.Future
+			the future of the evaluation, its attribute cache_key is the key to store the
+			evaluation into the cache, None if nothing to store
+		'''
+		position = self.pswarm.position[j].copy()
+		key = None
+		if not cache is None:
+			key = cache.keys(position[np.newaxis])[0]
+			p_eval = cache.get(key)
+			if not p_eval is None:
+				future = Future()
+				future.set_result(p_eval)
+				future.cache_key = None
+				return future
+		self.evaluations += 1
+		future = evaluator.submit(obj_func, position)
+		future.cache_key = key
+		return future
+
+	def evaluate(self, obj_func, *, batch=False, evaluator=None, cache=None):
+		'''
+		Evaluate every particle of the swarm.
+		If cache is given, only the particles whose design is not cached are evaluated.
+
+		Parameters
+		----------
+		obj_func : callable
+			If batch is True, obj_func(position) receives the position matrix of size
+			(particles, dimensions) and returns the evaluations of size particles.
+			If evaluator is given, obj_func(position) receives the position of one
+			particle of size dimensions and returns its evaluation.
+			Otherwise obj_func() is called once per particle after the particle's
+			position is written to the value of each variable in var_list, in one
+			operation if they are views of one VariableSet.
+		batch : bool
+			whether obj_func evaluates the whole swarm in one call
+		evaluator : SerialEvaluator or None
+			the evaluator which farms the particles out to its workers
+		cache : EvaluationCache or None
+			the cache of the evaluations
+
+		Returns
+		-------
+		evaluation : ndarray of float, size particles
+			the evaluation of every particle
+
+		Raises
+		------
+		ValueError
+			When both batch and evaluator are given, or the batch evaluation is not of size
+			particles.
+		'''
+		if batch and not evaluator is None:
+			raise ValueError("Parameters batch and evaluator are exclusive.")
+
+		def evaluate_positions(positions):
+			self.evaluations += len(positions)
+			if batch:
+				evaluation = np.asarray(obj_func(positions), dtype=float).reshape(-1)
+				if not evaluation.shape[0] == len(positions):
+					raise ValueError("obj_func must return one evaluation per particle.")
+				return evaluation
+			if not evaluator is None:
+				return evaluator.map(obj_func, positions)
+			evaluation = np.empty(len(positions))
+			for j in range(len(positions)):
+				if self.variable_set is None:
+					for var_index in range(self.dimensions):
+						self.var_list[var_index].value = positions[j][var_index]
+				else:
+					self.variable_set.value[self.var_indices] = positions[j]
+				evaluation[j] = obj_func()
+			return evaluation
+
+		if cache is None:
+			return evaluate_positions(self.pswarm.position)
+		return cache.evaluate(evaluate_positions, self.pswarm.position)
+
+	def update_swarm(self, iterations, current_iter, index=None):
 		'''
 		Update the velocity and position of the swarm.
-		First, calculate the neighbour of each particle using cKDTree. Before calculating distances
-		between particles, different dimensions of the position need to be standardized.
-		Second, calculate the local best of each particle.
-		Finally, update the velocity and position basing on:
+		First, calculate the local best of each particle with the topology, e.g. KNearest finds
+		the neighbours in the standardized position using cKDTree.
+		Then, update the velocity and position basing on:
 			v(t+1) = w * v(t) + c1 * rand() * (pbest-x) + c2 * rand() * (lbest-x)
 			x(t+1) = x(t) + v(t)
 			c1 = c2 = 2
@@ -144,6 +459,8 @@ class PSO_Optimizer:
 			v_{i}(t+1) = v^_{i}(t+1) if |v^_{i}(t+1)| < v_{i}_limit else v_{i}_limit or -v_{i}_limit
 			x_{i}(t+1) = x^_{i}(t+1) if lower < x^_{i}(t+1) < upper else lower or upper
 				where v^ and x^ mean the temp value and i means the ith dimension.
+		The whole swarm is updated in place with the scratch buffers of the swarm, no temporary
+		array of size (particles, dimensions) is allocated.
 
 		Attributes
 		----------
@@ -151,68 +468,127 @@ class PSO_Optimizer:
 			the total iterations of the algorithm, used for calculating w.
 		current_iter : int
 			the current iteration, used for calculating w.
+		index : array_like of int or None
+			the particles to be updated, all particles if None.
 		'''
-		# standardize the position, std_pos = pos/baseline
-		std_pos = self.pswarm.position.copy()
-		for i in range(self.dimensions):
-			for j in range(self.particles):
-				std_pos[j][i] = std_pos[j][i] / self.var_list[i].baseline
-		# use cKDTree to get neighbour 
-		tree = cKDTree(std_pos)
-		_, nb_index = tree.query(std_pos, k=self.neighbour, p=2)
+		w = 0.5 * (iterations - current_iter) / iterations + 0.4
+		time_start = time.time()
+		if index is None:
+			# calculate local_best
+			local_best = self.topology.local_best(self.pswarm, self.all_index, out=self.pswarm.local_best)
+			time_topology = time.time()
+			self.timing['topology'] = time_topology - time_start
+			self.move_swarm(w, local_best)
+			self.timing['update'] = time.time() - time_topology
+			return
 		# calculate local_best
-		if self.neighbour == 1:
-			local_best = self.pswarm.pbest_pos
-		else:
-			index_min = self.pswarm.pbest_eval[nb_index].argmin(axis=1)
-			local_best = self.pswarm.pbest_pos[nb_index[np.arange(self.particles), index_min]]
+		local_best = self.topology.local_best(self.pswarm, index)
+		time_topology = time.time()
+		self.timing['topology'] = time_topology - time_start
+		position = self.pswarm.position[index]
+		v_limit = self.v_limit[index]
 
 		# update veloctiy
-		w = 0.5 * (iterations - current_iter) / iterations + 0.4
-		cognitive = 2 * np.random.uniform(0, 1, (self.particles, self.dimensions)) \
-					* (self.pswarm.pbest_pos - self.pswarm.position)
-		social = 2 * np.random.uniform(0, 1, (self.particles, self.dimensions)) \
-				 * (local_best - self.pswarm.position)
-		temp_velocity = w * self.pswarm.velocity + cognitive + social
+		cognitive = 2 * self.rng.uniform(0, 1, (len(index), self.dimensions)) \
+					* (self.pswarm.pbest_pos[index] - position)
+		social = 2 * self.rng.uniform(0, 1, (len(index), self.dimensions)) \
+				 * (local_best - position)
+		temp_velocity = w * self.pswarm.velocity[index] + cognitive + social
 		'''
 		# if velocity exceed the limit, don't change.
 		mask = np.logical_and(temp_velocity >= -self.v_limit, temp_velocity <= self.v_limit)
 		self.pswarm.veloctiy = np.where(mask, temp_velocity, self.pswarm.veloctiy)
 		'''
-		mask = temp_velocity >= -self.v_limit
-		temp_velocity = np.where(mask, temp_velocity, -self.v_limit)
-		mask = temp_velocity <= self.v_limit
-		self.pswarm.velocity = np.where(mask, temp_velocity, self.v_limit)
+		mask = temp_velocity >= -v_limit
+		temp_velocity = np.where(mask, temp_velocity, -v_limit)
+		mask = temp_velocity <= v_limit
+		velocity = np.where(mask, temp_velocity, v_limit)
+		self.pswarm.velocity[index] = velocity
 		# update position
-		temp_position = self.pswarm.position + self.pswarm.velocity
-		mask = temp_position >= self.lower
-		temp_position = np.where(mask, temp_position, self.lower)
-		mask = temp_position <= self.upper
-		self.pswarm.position = np.where(mask, temp_position, self.upper)
+		temp_position = position + velocity
+		mask = temp_position >= self.lower[index]
+		temp_position = np.where(mask, temp_position, self.lower[index])
+		mask = temp_position <= self.upper[index]
+		self.pswarm.position[index] = np.where(mask, temp_position, self.upper[index])
+		self.timing['update'] = time.time() - time_topology
+
+	def move_swarm(self, w, local_best):
+		'''
+		Update the velocity and position of the whole swarm in place, see update_swarm().
+
+		Parameters
+		----------
+		w : float
+			the inertia weight
+		local_best : ndarray of float, size (particles, dimensions)
+			the local best position of every particle
+		'''
+		swarm = self.pswarm
+		self.rng.random(out=swarm.rand_cognitive)
+		self.rng.random(out=swarm.rand_social)
+		# v = w * v + 2 * r1 * (pbest - x) + 2 * r2 * (lbest - x)
+		swarm.velocity *= w
+		np.subtract(swarm.pbest_pos, swarm.position, out=swarm.scratch)
+		swarm.scratch *= swarm.rand_cognitive
+		swarm.scratch *= 2
+		swarm.velocity += swarm.scratch
+		np.subtract(local_best, swarm.position, out=swarm.scratch)
+		swarm.scratch *= swarm.rand_social
+		swarm.scratch *= 2
+		swarm.velocity += swarm.scratch
+		np.clip(swarm.velocity, self.v_limit_neg, self.v_limit, out=swarm.velocity)
+		# x = x + v
+		swarm.position += swarm.velocity
+		np.clip(swarm.position, self.lower, self.upper, out=swarm.position)
 
-	def post_process(self):
+	def post_process(self, index=None):
 		'''
 		Approximate the discrete variables' value to the set.
+		For every discrete dimension, the value v is snapped to the nearest member of the
+		sorted set using binary search. When v is exactly in the middle of two members,
+		the greater one is chosen. Values out of the set's range are snapped to its bounds.
+
+		Parameters
+		----------
+		index : array_like of int or None
+			the particles to be processed, all particles if None.
 		'''
-		for var_index in range(self.dimensions):
-			if isinstance(self.var_list[var_index], Discrete):
-				for p in range(self.particles):
-					v = self.pswarm.position[p][var_index]
-					self.pswarm.position[p][var_index] = self.var_list[var_index].var_range[-1]
-					for set_index in range(len(self.var_list[var_index].var_range)):
-						if v <= self.var_list[var_index].var_range[set_index]:
-							if set_index == 0:
-								self.pswarm.position[p][var_index] = self.var_list[var_index].var_range[0]
-								break
-							else:
-								if (v - self.var_list[var_index].var_range[set_index-1]) < \
-									(self.var_list[var_index].var_range[set_index] - v):
-									self.pswarm.position[p][var_index] = self.var_list[var_index].var_range[set_index-1]
-									break
-								else:
-									self.pswarm.position[p][var_index] = self.var_list[var_index].var_range[set_index]
-									break
-						else:
-							pass
-			else:
-				pass
\ No newline at end of file
+		if index is None:
+			index = slice(None)
+		for var_index, var_set in zip(self.discrete_index, self.discrete_sets):
+			v = self.pswarm.position[index, var_index]
+			# var_set[upper_index-1] < v <= var_set[upper_index]
+			upper_index = np.searchsorted(var_set, v, side='left')
+			np.clip(upper_index, 1, len(var_set) - 1, out=upper_index)
+			lower_value = var_set[upper_index - 1]
+			upper_value = var_set[upper_index]
+			self.pswarm.position[index, var_index] = np.where(
+				(v - lower_value) < (upper_value - v), lower_value, upper_value)
+
+
+def get_callback(callback):
+	'''
+	Return a Callback from None, a Callback or a list of Callback.
+	'''
+	if callback is None:
+		return Callback()
+	if isinstance(callback, (list, tuple)):
+		return CallbackList(callback)
+	return callback
+
+
+def get_termination(termination, optimizer, reset=True):
+	'''
+	Return a list of Termination from None, a Termination or a list of Termination,
+	and reset them for a new run of the optimizer if reset.
+	'''
+	if termination is None:
+		termination = []
+	elif isinstance(termination, Termination):
+		termination = [termination]
+	else:
+		termination = list(termination)
+	if reset:
+		for criterion in termination:
+			criterion.reset(optimizer)
+	return termination
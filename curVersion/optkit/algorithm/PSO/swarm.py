@@ -32,6 +32,14 @@ class Swarm:
 		the global best position of the swarm
 	gbest_eval : float
 		the global best evaluation of the swarm
+	rand_cognitive : numpy.ndarray of n-dimension list of float
+		scratch buffer of the random factors of the cognitive term
+	rand_social : numpy.ndarray of n-dimension list of float
+		scratch buffer of the random factors of the social term
+	local_best : numpy.ndarray of n-dimension list of float
+		scratch buffer of the local best position of every particle
+	scratch : numpy.ndarray of n-dimension list of float
+		scratch buffer of the velocity update
 	'''
 	# need attribute
 	particles = attrib(type=int, validator=instance_of(int))
@@ -44,8 +52,13 @@ class Swarm:
 	pbest_eval = attrib(type=np.ndarray, default=np.array([]), validator=instance_of(np.ndarray))
 	gbest_pos = attrib(type=np.ndarray, default=np.array([]), validator=instance_of(np.ndarray))
 	gbest_eval = attrib(type=float, default=np.inf, validator=instance_of((float,int)))
+	# scratch buffers of the swarm update, allocated once by initiate()
+	rand_cognitive = attrib(type=np.ndarray, default=np.array([]), validator=instance_of(np.ndarray))
+	rand_social = attrib(type=np.ndarray, default=np.array([]), validator=instance_of(np.ndarray))
+	local_best = attrib(type=np.ndarray, default=np.array([]), validator=instance_of(np.ndarray))
+	scratch = attrib(type=np.ndarray, default=np.array([]), validator=instance_of(np.ndarray))
 
-	def initiate(self, lower, upper):
+	def initiate(self, lower, upper, rng=None):
 		'''
 		Generate swarm's position & velocity.
 		
@@ -54,8 +67,39 @@ class Swarm:
 			the upper bound of dimensions
 		lower : ndarray of float, size dimensions
 			the lower bound of dimensions
+		rng : numpy.random.Generator or None
+			the random number generator, a new one is created if None
 		'''
-		self.position = np.random.uniform(low=lower, high=upper, size=(self.particles, self.dimensions))
-		self.velocity = (upper - lower) * np.random.random_sample(size=(self.particles, self.dimensions)) \
+		if rng is None:
+			rng = np.random.default_rng()
+		self.position = rng.uniform(low=lower, high=upper, size=(self.particles, self.dimensions))
+		self.velocity = (upper - lower) * rng.random(size=(self.particles, self.dimensions)) \
 						- (upper - lower) / 2
-		self.pbest_pos = self.position.copy()
\ No newline at end of file
+		self.pbest_pos = self.position.copy()
+		self.allocate_buffers()
+
+	def allocate_buffers(self):
+		'''
+		Allocate the scratch buffers of size (particles, dimensions).
+		'''
+		shape = (self.particles, self.dimensions)
+		self.rand_cognitive = np.empty(shape)
+		self.rand_social = np.empty(shape)
+		self.local_best = np.empty(shape)
+		self.scratch = np.empty(shape)
+
+	def update_pbest(self):
+		'''
+		Update pbest with the current evaluation, only the improved particles are copied.
+		'''
+		improved = self.evaluation < self.pbest_eval
+		np.copyto(self.pbest_eval, self.evaluation, where=improved)
+		np.copyto(self.pbest_pos, self.position, where=improved[:, np.newaxis])
+
+	def update_gbest(self):
+		'''
+		Update gbest with the best pbest.
+		'''
+		best = self.pbest_eval.argmin()
+		self.gbest_eval = self.pbest_eval[best]
+		self.gbest_pos = self.pbest_pos[best].copy()
\ No newline at end of file
@@ -0,0 +1,172 @@
+'''
+This module implements the termination criteria of PSO_Optimizer.
+'''
+import time
+import numpy as np
+
+class Termination:
+	'''
+	Parent class of the termination criteria.
+	The criteria are checked at the end of every iteration, the run stops when any of them is met.
+
+	Attributes
+	----------
+	reason : str
+		the description of the criterion, reported by the optimizer when it stops the run
+	'''
+	reason = ''
+
+	def reset(self, optimizer):
+		'''
+		Called when a run starts.
+		'''
+		pass
+
+	def get_state(self):
+		'''
+		Return the state to be saved in a checkpoint, a dict of ndarray.
+		'''
+		return {}
+
+	def set_state(self, state):
+		'''
+		Restore the state returned by get_state().
+		'''
+		pass
+
+	def check(self, optimizer):
+		'''
+		Return True if the run should stop.
+
+		Parameters
+		----------
+		optimizer : PSO_Optimizer
+			the optimizer at the end of an iteration
+		'''
+		raise NotImplementedError
+
+
+class Stall(Termination):
+	'''
+	Stop when gbest_eval has not improved by more than tol for patience iterations.
+
+	Attributes
+	----------
+	patience : int
+		the number of iterations without improvement
+	tol : float
+		the minimum improvement
+	'''
+	def __init__(self, patience, tol=0.0):
+		if not (isinstance(patience, int) and patience > 0):
+			raise ValueError("Parameter patience must be a positive int.")
+		self.patience = patience
+		self.tol = tol
+		self.best = np.inf
+		self.stalled = 0
+		self.reason = "gbest_eval stalled for {} iterations".format(patience)
+
+	def reset(self, optimizer):
+		self.best = np.inf
+		self.stalled = 0
+
+	def get_state(self):
+		return {'best' : np.array(self.best, dtype=float), 'stalled' : np.array(self.stalled)}
+
+	def set_state(self, state):
+		if 'best' in state:
+			self.best = float(state['best'])
+			self.stalled = int(state['stalled'])
+
+	def check(self, optimizer):
+		if optimizer.pswarm.gbest_eval < self.best - self.tol:
+			self.best = optimizer.pswarm.gbest_eval
+			self.stalled = 0
+		else:
+			self.stalled += 1
+		return self.stalled >= self.patience
+
+
+class SwarmDiameter(Termination):
+	'''
+	Stop when the swarm has collapsed: the diagonal of the bounding box of the particles in the
+	standardized space (pos / baseline) is below threshold. The diagonal is an upper bound of
+	the largest distance between two particles and costs O(particles * dimensions).
+
+	Attributes
+	----------
+	threshold : float
+		the minimum diameter
+	'''
+	def __init__(self, threshold):
+		self.threshold = threshold
+		self.reason = "swarm diameter below {}".format(threshold)
+
+	def check(self, optimizer):
+		std_pos = optimizer.pswarm.position / optimizer.baseline
+		diameter = np.linalg.norm(std_pos.max(axis=0) - std_pos.min(axis=0))
+		return diameter < self.threshold
+
+
+class WallClock(Termination):
+	'''
+	Stop when the run has taken seconds.
+
+	Attributes
+	----------
+	seconds : float
+		the time budget of the run
+	'''
+	def __init__(self, seconds):
+		self.seconds = seconds
+		self.time_start = time.time()
+		self.reason = "wall-clock budget of {} seconds".format(seconds)
+
+	def reset(self, optimizer):
+		self.time_start = time.time()
+
+	def get_state(self):
+		# the time already spent, the clock does not run while the run is interrupted
+		return {'elapsed' : np.array(time.time() - self.time_start, dtype=float)}
+
+	def set_state(self, state):
+		if 'elapsed' in state:
+			self.time_start = time.time() - float(state['elapsed'])
+
+	def check(self, optimizer):
+		return time.time() - self.time_start >= self.seconds
+
+
+class EvaluationBudget(Termination):
+	'''
+	Stop before the number of the objective evaluations (optimizer.evaluations) would exceed
+	evaluations. Evaluations served by the cache are not counted.
+
+	Attributes
+	----------
+	evaluations : int
+		the evaluation budget of the run
+	'''
+	def __init__(self, evaluations):
+		self.evaluations = evaluations
+		self.reason = "evaluation budget of {}".format(evaluations)
+
+	def check(self, optimizer):
+		return optimizer.evaluations + optimizer.particles > self.evaluations
+
+
+class TargetValue(Termination):
+	'''
+	Stop when gbest_eval reaches target.
+
+	Attributes
+	----------
+	target : float
+		the target objective value
+	'''
+	def __init__(self, target):
+		self.target = target
+		self.reason = "target value {} reached".format(target)
+
+	def check(self, optimizer):
+		return optimizer.pswarm.gbest_eval <= self.target
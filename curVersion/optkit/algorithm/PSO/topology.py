@@ -0,0 +1,247 @@
+'''
+This module implements the neighbourhood topologies of the swarm.
+'''
+import math
+import numpy as np
+from scipy.spatial import cKDTree
+
+class Topology:
+	'''
+	Parent class of the topologies.
+
+	A topology decides which particles inform a particle. The local best of a particle is the
+	best pbest among its neighbours. Subclasses implement neighbours(), or override local_best()
+	directly.
+
+	Attributes
+	----------
+	particles : int
+		the number of the particles in the swarm, set by setup()
+	'''
+	def __init__(self):
+		self.particles = 0
+
+	def setup(self, optimizer):
+		'''
+		Precompute whatever the topology needs. Called once by the optimizer.
+
+		Parameters
+		----------
+		optimizer : PSO_Optimizer
+			the optimizer using this topology
+		'''
+		self.particles = optimizer.particles
+
+	def get_state(self):
+		'''
+		Return the state to be saved in a checkpoint, a dict of ndarray.
+		'''
+		return {}
+
+	def set_state(self, state):
+		'''
+		Restore the state returned by get_state().
+		'''
+		pass
+
+	def neighbours(self, position, index):
+		'''
+		Parameters
+		----------
+		position : ndarray of float, size (particles, dimensions)
+			the current position of the swarm
+		index : ndarray of int
+			the particles whose neighbours are needed
+
+		Returns
+		-------
+		nb_index : ndarray of int, size (len(index), k)
+			the neighbours of every particle in index, including the particle itself
+		'''
+		raise NotImplementedError
+
+	def local_best(self, swarm, index, out=None):
+		'''
+		Calculate the local best position of the particles in index.
+
+		Parameters
+		----------
+		swarm : Swarm
+			the swarm
+		index : ndarray of int
+			the particles to be calculated
+		out : ndarray of float or None
+			the buffer to write the result, size (len(index), dimensions)
+
+		Returns
+		-------
+		local_best : ndarray of float, size (len(index), dimensions)
+		'''
+		nb_index = self.neighbours(swarm.position, index)
+		index_min = swarm.pbest_eval[nb_index].argmin(axis=1)
+		return np.take(swarm.pbest_pos, nb_index[np.arange(len(index)), index_min], axis=0, out=out)
+
+
+class StaticTopology(Topology):
+	'''
+	Parent class of the topologies whose neighbours do not depend on the position.
+	The neighbours are precomputed in setup() by build(), so a query is only an indexing.
+
+	Attributes
+	----------
+	nb_table : ndarray of int, size (particles, k)
+		the neighbours of every particle
+	'''
+	def __init__(self):
+		super(StaticTopology, self).__init__()
+		self.nb_table = np.empty((0, 0), dtype=np.intp)
+
+	def setup(self, optimizer):
+		super(StaticTopology, self).setup(optimizer)
+		self.nb_table = self.build(optimizer)
+
+	def build(self, optimizer):
+		'''
+		Return the neighbour table of size (particles, k).
+		'''
+		raise NotImplementedError
+
+	def get_state(self):
+		return {'nb_table' : self.nb_table}
+
+	def set_state(self, state):
+		if 'nb_table' in state:
+			self.nb_table = state['nb_table']
+
+	def neighbours(self, position, index):
+		return self.nb_table[index]
+
+
+class GlobalBest(Topology):
+	'''
+	Every particle is informed by the whole swarm, the local best is the gbest.
+	'''
+	def local_best(self, swarm, index, out=None):
+		best = swarm.pbest_pos[swarm.pbest_eval.argmin()]
+		if out is None:
+			return np.repeat(best[np.newaxis], len(index), axis=0)
+		out[:] = best
+		return out
+
+
+class Ring(StaticTopology):
+	'''
+	Particles are arranged on a ring, every particle is informed by the particles
+	within radius on both sides.
+
+	Attributes
+	----------
+	radius : int
+		the number of neighbours on each side
+	'''
+	def __init__(self, radius=1):
+		super(Ring, self).__init__()
+		if not (isinstance(radius, int) and radius > 0):
+			raise ValueError("Parameter radius must be a positive int.")
+		self.radius = radius
+
+	def build(self, optimizer):
+		offset = np.arange(-self.radius, self.radius + 1)
+		return (np.arange(self.particles)[:, np.newaxis] + offset) % self.particles
+
+
+class VonNeumann(StaticTopology):
+	'''
+	Particles are arranged on a torus grid of rows * columns, every particle is informed
+	by the particles above, below, on its left and on its right.
+	rows is the greatest divisor of particles not greater than sqrt(particles).
+	'''
+	def build(self, optimizer):
+		rows = 1
+		for r in range(1, math.isqrt(self.particles) + 1):
+			if self.particles % r == 0:
+				rows = r
+		columns = self.particles // rows
+		row, column = np.divmod(np.arange(self.particles), columns)
+		return np.stack([
+			row * columns + column,
+			((row - 1) % rows) * columns + column,
+			((row + 1) % rows) * columns + column,
+			row * columns + (column - 1) % columns,
+			row * columns + (column + 1) % columns
+			], axis=1)
+
+
+class RandomK(StaticTopology):
+	'''
+	Every particle is informed by itself and k particles drawn at random once in setup(),
+	using the random number generator of the optimizer.
+
+	Attributes
+	----------
+	k : int
+		the number of random informants of every particle
+	'''
+	def __init__(self, k=3):
+		super(RandomK, self).__init__()
+		if not (isinstance(k, int) and k > 0):
+			raise ValueError("Parameter k must be a positive int.")
+		self.k = k
+
+	def build(self, optimizer):
+		informants = optimizer.rng.integers(0, self.particles, size=(self.particles, self.k))
+		return np.concatenate([np.arange(self.particles)[:, np.newaxis], informants], axis=1)
+
+
+class KNearest(Topology):
+	'''
+	Every particle is informed by its k nearest particles (itself included) in the standardized
+	space, std_pos = pos / baseline. The neighbours are queried with cKDTree on all cores.
+
+	The tree is rebuilt once every particles updated particles, i.e. once per iteration of the
+	synchronous PSO. The asynchronous PSO, which updates one particle at a time, reuses the
+	tree of the last iteration instead of rebuilding it for every particle.
+
+	Attributes
+	----------
+	k : int
+		the size of a particle's neighbourhood
+	baseline : ndarray of float, size dimensions
+		the baseline of each dimension
+	tree : cKDTree or None
+		the tree of the last build
+	stale : int
+		the number of particles updated since the last build
+	'''
+	def __init__(self, k):
+		super(KNearest, self).__init__()
+		if not (isinstance(k, int) and k > 0):
+			raise ValueError("Parameter k must be a positive int.")
+		self.k = k
+		self.baseline = np.array([])
+		self.tree = None
+		self.stale = 0
+
+	def setup(self, optimizer):
+		super(KNearest, self).setup(optimizer)
+		self.baseline = optimizer.baseline
+		self.tree = None
+		self.stale = 0
+
+	def neighbours(self, position, index):
+		if self.tree is None or self.stale >= self.particles:
+			std_all = position / self.baseline
+			self.tree = cKDTree(std_all)
+			self.stale = 0
+			std_pos = std_all[index]
+		else:
+			std_pos = position[index] / self.baseline
+		self.stale += len(std_pos)
+		_, nb_index = self.tree.query(std_pos, k=self.k, p=2, workers=-1)
+		return nb_index
+
+	def local_best(self, swarm, index, out=None):
+		if self.k == 1:
+			return np.take(swarm.pbest_pos, index, axis=0, out=out)
+		return super(KNearest, self).local_best(swarm, index, out)
+
@@ -0,0 +1,3 @@
+from .evaluator import SerialEvaluator, ThreadEvaluator, ProcessEvaluator, get_evaluator
+from .cache import EvaluationCache
+from .distributed import WorkerServer, DistributedEvaluator, serve
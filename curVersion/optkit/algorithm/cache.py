@@ -0,0 +1,219 @@
+'''
+This module implements EvaluationCache class, the memoisation layer in front of the objective.
+'''
+import sqlite3
+from collections import OrderedDict
+import numpy as np
+from ..workflow import Continuous, Discrete, Constant
+
+class EvaluationCache:
+	'''
+	An EvaluationCache Class
+
+	This class remembers the evaluations of the design points. A design point is quantised before
+	it is looked up: a continuous dimension is rounded to its grid of resolution steps over
+	var_range, a discrete dimension is already snapped to its set and is used as it is. So the
+	design points on the same grid node share one evaluation.
+
+	The cache keeps the most recently used maxsize evaluations in memory. If path is given, every
+	evaluation is also stored in a sqlite database, so the later runs of the same project reuse
+	the earlier evaluations.
+
+	Attributes
+	----------
+	lower : ndarray of float, size dimensions
+		the lower bound of each dimension
+	step : ndarray of float, size dimensions
+		the grid step of each dimension, 0 for the discrete dimensions
+	maxsize : int or None
+		the maximum number of evaluations kept in memory, unbounded if None
+	path : str or None
+		the path of the sqlite database
+	hits : int
+		the number of lookups found in the cache
+	misses : int
+		the number of lookups not found in the cache
+	evictions : int
+		the number of evaluations evicted from memory
+	'''
+	def __init__(self, variables, maxsize=None, path=None):
+		'''
+		Parameters
+		----------
+		variables : list of Variable
+			the variables of the optimization, constants are skipped like PSO_Optimizer does
+		maxsize : int or None
+			the maximum number of evaluations kept in memory
+		path : str or None
+			the path of the sqlite database
+		'''
+		if not (maxsize is None or (isinstance(maxsize, int) and maxsize > 0)):
+			raise ValueError("Parameter maxsize must be a positive int or None.")
+		_lower = []
+		_step = []
+		for var in variables:
+			if isinstance(var, Continuous):
+				_lower.append(var.var_range[0])
+				_step.append((var.var_range[1] - var.var_range[0]) / var.resolution)
+			elif isinstance(var, Discrete):
+				_lower.append(0.0)
+				_step.append(0.0)
+			elif isinstance(var, Constant):
+				pass
+			else:
+				raise TypeError(var, "is not of type Variable.")
+		self.lower = np.array(_lower, dtype=float)
+		self.step = np.array(_step, dtype=float)
+		self.continuous = self.step > 0
+		self.maxsize = maxsize
+		self.path = path
+		self.memory = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.db = None
+		if not path is None:
+			self.open_db()
+
+	def __len__(self):
+		return len(self.memory)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def open_db(self):
+		'''
+		Open the sqlite database and check that it was written with the same quantisation.
+
+		Raises
+		------
+		ValueError
+			When the database belongs to different variables.
+		'''
+		signature = np.concatenate([self.lower, self.step]).tobytes()
+		self.db = sqlite3.connect(self.path)
+		self.db.execute("CREATE TABLE IF NOT EXISTS meta (signature BLOB)")
+		self.db.execute("CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, evaluation REAL)")
+		row = self.db.execute("SELECT signature FROM meta").fetchone()
+		if row is None:
+			self.db.execute("INSERT INTO meta VALUES (?)", (signature,))
+			self.db.commit()
+		elif not row[0] == signature:
+			self.db.close()
+			self.db = None
+			raise ValueError("The cache file {} belongs to different variables.".format(self.path))
+
+	def keys(self, positions):
+		'''
+		Quantise the design points.
+
+		Parameters
+		----------
+		positions : ndarray of float, size (n, dimensions)
+
+		Returns
+		-------
+		keys : list of bytes
+			the key of every design point
+		'''
+		quantised = np.array(positions, dtype=float)
+		quantised[:, self.continuous] = np.rint(
+			(quantised[:, self.continuous] - self.lower[self.continuous]) / self.step[self.continuous])
+		# -0.0 and 0.0 must share a key
+		quantised += 0.0
+		return [row.tobytes() for row in quantised]
+
+	def get(self, key):
+		'''
+		Return the evaluation of the key, None if it is not cached.
+		'''
+		if key in self.memory:
+			self.memory.move_to_end(key)
+			self.hits += 1
+			return self.memory[key]
+		if not self.db is None:
+			row = self.db.execute("SELECT evaluation FROM cache WHERE key = ?", (key,)).fetchone()
+			if not row is None:
+				self.remember(key, row[0])
+				self.hits += 1
+				return row[0]
+		self.misses += 1
+		return None
+
+	def put(self, keys, evaluation):
+		'''
+		Store the evaluations of the keys.
+		'''
+		for key, value in zip(keys, evaluation):
+			self.remember(key, float(value))
+		if not self.db is None:
+			self.db.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?)",
+								[(key, float(value)) for key, value in zip(keys, evaluation)])
+			self.db.commit()
+
+	def remember(self, key, value):
+		'''
+		Keep the evaluation in memory, evict the least recently used one if full.
+		'''
+		self.memory[key] = value
+		self.memory.move_to_end(key)
+		if not self.maxsize is None and len(self.memory) > self.maxsize:
+			self.memory.popitem(last=False)
+			self.evictions += 1
+
+	def evaluate(self, func, positions):
+		'''
+		Evaluate the design points, only the design points not in the cache are passed to func.
+		Equal design points in positions are evaluated once.
+
+		Parameters
+		----------
+		func : callable
+			func(positions) -> ndarray of float, size len(positions)
+		positions : ndarray of float, size (n, dimensions)
+
+		Returns
+		-------
+		evaluation : ndarray of float, size n
+		'''
+		keys = self.keys(positions)
+		evaluation = np.empty(len(keys))
+		missed = OrderedDict()
+		for j, key in enumerate(keys):
+			if key in missed:
+				missed[key].append(j)
+				self.hits += 1
+				continue
+			value = self.get(key)
+			if value is None:
+				missed[key] = [j]
+			else:
+				evaluation[j] = value
+		if missed:
+			rows = [index[0] for index in missed.values()]
+			result = np.asarray(func(positions[rows]), dtype=float).reshape(-1)
+			self.put(list(missed), result)
+			for value, index in zip(result, missed.values()):
+				evaluation[index] = value
+		return evaluation
+
+	def info(self):
+		'''
+		Return the statistics of the cache.
+		'''
+		return {'hits' : self.hits,
+				'misses' : self.misses,
+				'evictions' : self.evictions,
+				'size' : len(self.memory),
+				'maxsize' : self.maxsize}
+
+	def close(self):
+		'''
+		Close the sqlite database.
+		'''
+		if not self.db is None:
+			self.db.close()
+			self.db = None
@@ -0,0 +1,422 @@
+'''
+This module implements the distributed evaluation backend: WorkerServer evaluates the design
+points received over a socket, DistributedEvaluator farms the design points out to the servers.
+
+Protocol, every message is a pickled tuple sent by multiprocessing.connection:
+	client -> server
+		('batch', [(job_id, position), ...]) : evaluate the positions
+		('close',) : close the connection
+	server -> client, one message per job as soon as it completes
+		('result', job_id, evaluation)
+		('error', job_id, traceback)
+'''
+import time
+import itertools
+import functools
+import threading
+import traceback
+from concurrent.futures import Future, as_completed
+from multiprocessing.connection import Listener, Client
+import numpy as np
+from .evaluator import SerialEvaluator, get_evaluator
+
+class WorkerServer:
+	'''
+	A WorkerServer Class
+
+	This class listens on address and evaluates the design points of every connected client with
+	obj_func(position) on an evaluator, a process pool by default. Run it on every machine of
+	the farm with serve(), or start() it in the background for a local test.
+
+	Attributes
+	----------
+	obj_func : callable
+		obj_func(position) -> float, see SerialEvaluator.map()
+	address : tuple of (str, int)
+		the address the server listens on, the port is chosen by the system if 0 is given
+	authkey : bytes
+		the key the clients must present
+	evaluator : SerialEvaluator
+		the evaluator which runs the jobs
+	'''
+	def __init__(self, obj_func, address=('localhost', 0), authkey=b'optkit', executor='process', workers=None):
+		'''
+		Parameters
+		----------
+		obj_func : callable
+			obj_func(position) -> float
+		address : tuple of (str, int)
+			the address to listen on
+		authkey : bytes
+			the key the clients must present
+		executor : str
+			'serial', 'thread' or 'process', see get_evaluator()
+		workers : int or None
+			the number of workers of the evaluator
+		'''
+		self.obj_func = obj_func
+		self.authkey = authkey
+		self.evaluator = get_evaluator(executor, workers)
+		self.listener = Listener(address, authkey=authkey)
+		self.address = self.listener.address
+		self.closed = False
+		self.thread = None
+
+	def __enter__(self):
+		return self.start()
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def start(self):
+		'''
+		Serve in a background thread.
+
+		Returns
+		-------
+		self : WorkerServer
+		'''
+		self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+		self.thread.start()
+		return self
+
+	def serve_forever(self):
+		'''
+		Accept the clients until close(), every client is handled by its own thread.
+		'''
+		while not self.closed:
+			try:
+				conn = self.listener.accept()
+			except Exception:
+				continue
+			if self.closed:
+				conn.close()
+				break
+			threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+	def handle(self, conn):
+		'''
+		Receive the batches of a client, submit every job to the evaluator and send back its
+		result as soon as it completes.
+		'''
+		send_lock = threading.Lock()
+
+		def reply(job_id, future):
+			try:
+				message = ('result', job_id, float(future.result()))
+			except Exception:
+				message = ('error', job_id, traceback.format_exc())
+			with send_lock:
+				try:
+					conn.send(message)
+				except (EOFError, OSError):
+					pass
+
+		try:
+			while True:
+				command = conn.recv()
+				if command[0] == 'close':
+					break
+				for job_id, position in command[1]:
+					future = self.evaluator.submit(self.obj_func, position)
+					future.add_done_callback(functools.partial(reply, job_id))
+		except (EOFError, OSError):
+			pass
+		finally:
+			with send_lock:
+				conn.close()
+
+	def close(self):
+		'''
+		Stop accepting the clients and shut the evaluator down.
+		'''
+		if self.closed:
+			return
+		self.closed = True
+		if not self.thread is None:
+			# wake up accept()
+			try:
+				Client(self.address, authkey=self.authkey).close()
+			except Exception:
+				pass
+			self.thread.join()
+		self.listener.close()
+		self.evaluator.close()
+
+
+def serve(obj_func, address, authkey=b'optkit', executor='process', workers=None):
+	'''
+	Run a WorkerServer in the current process until it is interrupted.
+	See WorkerServer for the parameters.
+	'''
+	server = WorkerServer(obj_func, address, authkey, executor, workers)
+	try:
+		server.serve_forever()
+	finally:
+		server.close()
+
+
+class Job:
+	'''
+	One design point sent to the servers.
+
+	Attributes
+	----------
+	position : ndarray of float, size dimensions
+		the design point
+	future : concurrent.futures.Future
+		the future of the evaluation
+	attempts : int
+		the number of failed attempts
+	deadline : float
+		the time after which the current attempt is timed out
+	'''
+	def __init__(self, position):
+		self.position = position
+		self.future = Future()
+		self.attempts = 0
+		self.deadline = np.inf
+
+
+class WorkerLink:
+	'''
+	The connection of a DistributedEvaluator to one WorkerServer.
+
+	Attributes
+	----------
+	address : tuple of (str, int)
+		the address of the server
+	conn : multiprocessing.connection.Connection
+		the connection to the server
+	send_lock : threading.Lock
+		serialises the sends on conn
+	jobs : set of int
+		the ids of the jobs sent and not yet answered
+	alive : bool
+		whether the connection is usable
+	thread : threading.Thread
+		the thread receiving the results
+	'''
+	def __init__(self, address, authkey):
+		self.address = address
+		self.conn = Client(address, authkey=authkey)
+		self.send_lock = threading.Lock()
+		self.jobs = set()
+		self.alive = True
+		self.thread = None
+
+
+class DistributedEvaluator(SerialEvaluator):
+	'''
+	A DistributedEvaluator Class
+
+	This class sends the design points to WorkerServers over sockets and receives the
+	evaluations as they complete. It is used like the other evaluators, e.g.
+		PSO_Optimizer.optimize(iterations, obj_func, evaluator=DistributedEvaluator(addresses))
+	The objective function is the one the servers were started with, the obj_func given to
+	map() and submit() is only kept for the evaluator interface and is never sent.
+
+	The positions of a map() are sent in batches of batch_size, every batch to the server with
+	the fewest jobs in flight. A job which is not answered within timeout seconds of being sent,
+	or whose server is disconnected, is sent again up to retries times and then fails with
+	TimeoutError or ConnectionError. A job whose objective raised fails with RuntimeError
+	carrying the remote traceback and is not retried.
+
+	Attributes
+	----------
+	addresses : list of tuple of (str, int)
+		the addresses of the servers
+	authkey : bytes
+		the key presented to the servers
+	batch_size : int
+		the maximum number of jobs per message
+	timeout : float or None
+		the time limit of one attempt of a job, unlimited if None
+	retries : int
+		the number of times a job is sent again
+	workers : int
+		the number of servers
+	links : list of WorkerLink
+		the connections, opened on the first evaluation and kept until close()
+	jobs : dict
+		{job_id} : Job, the jobs in flight
+	'''
+	def __init__(self, addresses, authkey=b'optkit', batch_size=16, timeout=None, retries=2):
+		if isinstance(addresses, tuple):
+			addresses = [addresses]
+		if not (isinstance(batch_size, int) and batch_size > 0):
+			raise ValueError("Parameter batch_size must be a positive int.")
+		if not (isinstance(retries, int) and retries >= 0):
+			raise ValueError("Parameter retries must be a non-negative int.")
+		self.addresses = list(addresses)
+		self.authkey = authkey
+		self.batch_size = batch_size
+		self.timeout = timeout
+		self.retries = retries
+		self.workers = len(self.addresses)
+		self.links = None
+		self.jobs = {}
+		self.lock = threading.Lock()
+		self.job_ids = itertools.count()
+		self.poll_interval = 0.05 if timeout is None else min(0.05, timeout / 10)
+
+	def get_links(self):
+		'''
+		Return the connections, open them if necessary.
+		'''
+		if self.links is None:
+			links = [WorkerLink(address, self.authkey) for address in self.addresses]
+			for link in links:
+				link.thread = threading.Thread(target=self.receive, args=(link,), daemon=True)
+				link.thread.start()
+			self.links = links
+		return self.links
+
+	def map(self, obj_func, positions):
+		'''
+		Evaluate every row of positions on the servers.
+		See SerialEvaluator.map().
+		'''
+		futures = self.submit_many(positions)
+		return np.fromiter((future.result() for future in futures), dtype=float, count=len(futures))
+
+	def stream(self, positions):
+		'''
+		Evaluate every row of positions on the servers and yield the results as they complete.
+
+		Yields
+		------
+		index : int
+			the row of positions
+		evaluation : float
+			its evaluation
+		'''
+		futures = self.submit_many(positions)
+		index = {future : j for j, future in enumerate(futures)}
+		for future in as_completed(futures):
+			yield index[future], future.result()
+
+	def submit(self, obj_func, position):
+		'''
+		Send one design point to the servers.
+		See SerialEvaluator.submit().
+		'''
+		return self.submit_many([position])[0]
+
+	def submit_many(self, positions):
+		'''
+		Send the design points to the servers in batches.
+
+		Returns
+		-------
+		futures : list of concurrent.futures.Future
+			the futures of the evaluations in the order of positions
+		'''
+		self.get_links()
+		jobs = [Job(np.asarray(position, dtype=float)) for position in positions]
+		self.dispatch(jobs)
+		return [job.future for job in jobs]
+
+	def dispatch(self, jobs):
+		'''
+		Send the jobs in batches, every batch to the live server with the fewest jobs in flight.
+		'''
+		for start in range(0, len(jobs), self.batch_size):
+			batch = jobs[start:start + self.batch_size]
+			with self.lock:
+				live = [link for link in self.links if link.alive]
+				if live == []:
+					for job in batch:
+						job.future.set_exception(ConnectionError("No worker server is available."))
+					continue
+				link = min(live, key=lambda link: len(link.jobs))
+				message = []
+				deadline = np.inf if self.timeout is None else time.time() + self.timeout
+				for job in batch:
+					job_id = next(self.job_ids)
+					job.deadline = deadline
+					self.jobs[job_id] = job
+					link.jobs.add(job_id)
+					message.append((job_id, job.position))
+			try:
+				with link.send_lock:
+					link.conn.send(('batch', message))
+			except (EOFError, OSError):
+				self.drop(link)
+
+	def receive(self, link):
+		'''
+		Receive the results of one server until it is closed or disconnected, and time out
+		its jobs in flight.
+		'''
+		while link.alive:
+			try:
+				if link.conn.poll(self.poll_interval):
+					status, job_id, data = link.conn.recv()
+					with self.lock:
+						job = self.jobs.pop(job_id, None)
+						link.jobs.discard(job_id)
+					# a late answer of a timed out attempt is ignored
+					if not job is None:
+						if status == 'result':
+							job.future.set_result(data)
+						else:
+							job.future.set_exception(RuntimeError("Remote evaluation failed:\n" + data))
+			except (EOFError, OSError):
+				if link.alive:
+					self.drop(link)
+				return
+			if not self.timeout is None:
+				now = time.time()
+				with self.lock:
+					expired = [job_id for job_id in link.jobs if self.jobs[job_id].deadline < now]
+					jobs = [self.jobs.pop(job_id) for job_id in expired]
+					link.jobs.difference_update(expired)
+				self.retry(jobs, TimeoutError("The evaluation timed out after {} retries.".format(self.retries)))
+
+	def drop(self, link):
+		'''
+		Mark the server as disconnected and send its jobs in flight again.
+		'''
+		with self.lock:
+			link.alive = False
+			jobs = [self.jobs.pop(job_id) for job_id in link.jobs]
+			link.jobs.clear()
+		link.conn.close()
+		self.retry(jobs, ConnectionError("The worker server {} is disconnected.".format(link.address)))
+
+	def retry(self, jobs, error):
+		'''
+		Send the jobs again, a job which used up its retries fails with error.
+		'''
+		again = []
+		for job in jobs:
+			job.attempts += 1
+			if job.attempts > self.retries:
+				job.future.set_exception(error)
+			else:
+				again.append(job)
+		if again:
+			self.dispatch(again)
+
+	def close(self):
+		'''
+		Close the connections, the jobs in flight are cancelled.
+		'''
+		if self.links is None:
+			return
+		for link in self.links:
+			if link.alive:
+				link.alive = False
+				try:
+					with link.send_lock:
+						link.conn.send(('close',))
+				except (EOFError, OSError):
+					pass
+			link.thread.join()
+			link.conn.close()
+		with self.lock:
+			for job in self.jobs.values():
+				job.future.cancel()
+			self.jobs = {}
+		self.links = None
@@ -0,0 +1,174 @@
+'''
+This module implements the evaluators which farm the design points out to executors.
+'''
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+
+class SerialEvaluator:
+	'''
+	Evaluate the design points one after another in the current process.
+
+	The objective function receives the position of one particle explicitly:
+		obj_func(position) -> float
+	where position is an ndarray of size dimensions. It must not rely on the
+	value of the shared Variable objects.
+
+	Attributes
+	----------
+	workers : int
+		the number of workers, always 1
+	'''
+	def __init__(self, workers=1):
+		self.workers = 1
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def map(self, obj_func, positions):
+		'''
+		Evaluate every row of positions.
+
+		Parameters
+		----------
+		obj_func : callable
+			obj_func(position) -> float
+		positions : ndarray of float, size (particles, dimensions)
+			the design points to be evaluated
+
+		Returns
+		-------
+		evaluation : ndarray of float, size particles
+			the evaluations in the same order as positions
+		'''
+		evaluation = np.empty(len(positions))
+		for j, position in enumerate(positions):
+			evaluation[j] = obj_func(position)
+		return evaluation
+
+	def submit(self, obj_func, position):
+		'''
+		Evaluate one design point.
+		The serial evaluator runs it immediately and returns a completed future.
+
+		Parameters
+		----------
+		obj_func : callable
+			obj_func(position) -> float
+		position : ndarray of float, size dimensions
+			the design point to be evaluated
+
+		Returns
+		-------
+		future : concurrent.futures.Future
+			the future of the evaluation
+		'''
+		future = Future()
+		try:
+			future.set_result(obj_func(position))
+		except Exception as e:
+			future.set_exception(e)
+		return future
+
+	def close(self):
+		'''
+		Release the resources of the evaluator.
+		'''
+		pass
+
+
+class PoolEvaluator(SerialEvaluator):
+	'''
+	Evaluate the design points on a pool of workers.
+	The results are gathered in the order of the positions, so a run is reproducible
+	for a given seed no matter in which order the workers finish.
+
+	Attributes
+	----------
+	workers : int or None
+		the number of workers. None lets the executor decide.
+	executor : concurrent.futures.Executor
+		the pool, created on the first evaluation and reused until close()
+	'''
+	executor_type = None
+
+	def __init__(self, workers=None):
+		if not (workers is None or (isinstance(workers, int) and workers > 0)):
+			raise ValueError("Parameter workers must be a positive int or None.")
+		self.workers = workers
+		self.executor = None
+
+	def get_executor(self):
+		'''
+		Return the pool, create it if necessary.
+		'''
+		if self.executor is None:
+			self.executor = self.executor_type(max_workers=self.workers)
+		return self.executor
+
+	def map(self, obj_func, positions):
+		'''
+		Evaluate every row of positions on the pool.
+		See SerialEvaluator.map().
+		'''
+		executor = self.get_executor()
+		chunksize = 1
+		if self.workers is not None:
+			chunksize = max(1, len(positions) // (4 * self.workers))
+		results = executor.map(obj_func, list(positions), chunksize=chunksize)
+		return np.fromiter(results, dtype=float, count=len(positions))
+
+	def submit(self, obj_func, position):
+		'''
+		Submit one design point to the pool.
+		See SerialEvaluator.submit().
+		'''
+		return self.get_executor().submit(obj_func, position)
+
+	def close(self):
+		if not self.executor is None:
+			self.executor.shutdown(wait=True)
+			self.executor = None
+
+
+class ThreadEvaluator(PoolEvaluator):
+	'''
+	Evaluate the design points on a thread pool.
+	Suitable for objectives which release the GIL, e.g. driving external simulations.
+	'''
+	executor_type = ThreadPoolExecutor
+
+
+class ProcessEvaluator(PoolEvaluator):
+	'''
+	Evaluate the design points on a process pool.
+	The objective function must be picklable, e.g. defined at module level.
+	'''
+	executor_type = ProcessPoolExecutor
+
+
+evaluators = {"serial" : SerialEvaluator,
+			  "thread" : ThreadEvaluator,
+			  "process" : ProcessEvaluator
+			  }
+
+def get_evaluator(executor='serial', workers=None):
+	'''
+	Create an evaluator by the name of its executor.
+
+	Parameters
+	----------
+	executor : str
+		'serial', 'thread' or 'process'
+	workers : int or None
+		the number of workers
+
+	Returns
+	-------
+	evaluator : SerialEvaluator
+	'''
+	if not executor in evaluators:
+		raise ValueError("Parameter executor must be one of {}.".format(list(evaluators)))
+	return evaluators[executor](workers)
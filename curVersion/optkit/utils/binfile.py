@@ -0,0 +1,224 @@
+'''
+The binary project file data.npz, an uncompressed NumPy archive of the project's columns.
+
+Every field of the variables, responses, modules and processes is one array, so the numbers are
+read in bulk instead of being parsed field by field. The lists of variable length (the values of
+the discrete variables, the inlists and outlists of the modules, the modules of the processes) are
+stored flat with an offsets array: the items of row i are items[offsets[i]:offsets[i+1]].
+A column of str is stored as the uint8 array of its UTF-8 text, every item ended by a newline,
+see text_column() and text_list().
+
+	header : str column, [name, directory]
+	var_name, var_description : str columns
+	var_kind : int8 array, the index in VAR_KINDS
+	var_lower, var_upper : float arrays, the range of the variable, [baseline, baseline] for Constant
+	var_baseline : float array
+	var_resolution : int array, 0 for Discrete and Constant
+	var_values, var_offsets : the value sets of the variables, empty for Continuous and Constant
+	resp_name, resp_description : str columns
+	resp_kind : int8 array, the index in RESP_KINDS
+	resp_option, resp_weight : int and float arrays, the option and weight of Objective
+	resp_min, resp_max : float arrays, the range of Constraint
+	proc_name, proc_description : str columns
+	proc_offsets : the modules of the processes
+	mod_name, mod_portal, mod_description : str columns
+	mod_timeout : float array, NaN for None
+	mod_in, mod_in_offsets : the inlists, indices in variables + responses
+	mod_out, mod_out_offsets : the outlists, indices in variables + responses
+'''
+import numpy as np
+from ..workflow import *
+
+VAR_KINDS = (Continuous, Discrete, Constant)
+RESP_KINDS = (Objective, Constraint, Monitored)
+
+def kind_of(obj, kinds):
+	for i, kind in enumerate(kinds):
+		if isinstance(obj, kind):
+			return i
+	raise TypeError("Type {} cannot be saved.".format(type(obj).__name__))
+
+def offsets_of(lists):
+	'''
+	Return the offsets of the flat storage of lists.
+	'''
+	offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+	np.cumsum([len(l) for l in lists], out=offsets[1:])
+	return offsets
+
+def text_column(strings):
+	'''
+	Return the column of the strings, which must not contain newlines.
+	'''
+	return np.frombuffer(''.join(s + '\n' for s in strings).encode(), dtype=np.uint8)
+
+def text_list(column):
+	'''
+	Return the strings of the column.
+	'''
+	return column.tobytes().decode().split('\n')[:-1]
+
+def project_columns(proj):
+	'''
+	Return the columns of the project.
+
+	Returns
+	-------
+	columns : dict
+		{name} : ndarray, see the module docstring
+	'''
+	variables = proj.variables
+	responses = proj.responses
+	modules = [mod for proc in proj.processes for mod in proc.modules]
+	index = {obj : i for i, obj in enumerate([*variables, *responses])}
+	var_kind = [kind_of(var, VAR_KINDS) for var in variables]
+	lower = []
+	upper = []
+	values = []
+	for var, kind in zip(variables, var_kind):
+		if kind == 2:
+			lower.append(var.baseline)
+			upper.append(var.baseline)
+			values.append(())
+		else:
+			lower.append(var.var_range[0])
+			upper.append(var.var_range[-1])
+			values.append(var.var_range if kind == 1 else ())
+	resp_kind = [kind_of(resp, RESP_KINDS) for resp in responses]
+	mod_in = [[index[obj] for obj in mod.inlist] for mod in modules]
+	mod_out = [[index[obj] for obj in mod.outlist] for mod in modules]
+	return {
+		'header' : text_column([proj.name, proj.directory]),
+		'var_name' : text_column([var.name for var in variables]),
+		'var_description' : text_column([var.description for var in variables]),
+		'var_kind' : np.array(var_kind, dtype=np.int8),
+		'var_lower' : np.array(lower, dtype=float),
+		'var_upper' : np.array(upper, dtype=float),
+		'var_baseline' : np.array([var.baseline for var in variables], dtype=float),
+		'var_resolution' : np.array([var.resolution if kind == 0 else 0
+									 for var, kind in zip(variables, var_kind)], dtype=np.int64),
+		'var_values' : np.array([value for l in values for value in l], dtype=float),
+		'var_offsets' : offsets_of(values),
+		'resp_name' : text_column([resp.name for resp in responses]),
+		'resp_description' : text_column([resp.description for resp in responses]),
+		'resp_kind' : np.array(resp_kind, dtype=np.int8),
+		'resp_option' : np.array([resp.option if kind == 0 else 0
+								  for resp, kind in zip(responses, resp_kind)], dtype=np.int64),
+		'resp_weight' : np.array([resp.weight if kind == 0 else np.nan
+								  for resp, kind in zip(responses, resp_kind)], dtype=float),
+		'resp_min' : np.array([resp.resp_min if kind == 1 else np.nan
+							   for resp, kind in zip(responses, resp_kind)], dtype=float),
+		'resp_max' : np.array([resp.resp_max if kind == 1 else np.nan
+							   for resp, kind in zip(responses, resp_kind)], dtype=float),
+		'proc_name' : text_column([proc.name for proc in proj.processes]),
+		'proc_description' : text_column([proc.description for proc in proj.processes]),
+		'proc_offsets' : offsets_of([proc.modules for proc in proj.processes]),
+		'mod_name' : text_column([mod.name for mod in modules]),
+		'mod_portal' : text_column([mod.portal for mod in modules]),
+		'mod_description' : text_column([mod.description for mod in modules]),
+		'mod_timeout' : np.array([np.nan if mod.timeout is None else mod.timeout for mod in modules], dtype=float),
+		'mod_in' : np.array([i for l in mod_in for i in l], dtype=np.int64),
+		'mod_in_offsets' : offsets_of(mod_in),
+		'mod_out' : np.array([i for l in mod_out for i in l], dtype=np.int64),
+		'mod_out_offsets' : offsets_of(mod_out)
+		}
+
+def write_npz(proj, f):
+	'''
+	Write the columns of the project to the binary file f.
+	'''
+	np.savez(f, **project_columns(proj))
+
+def read_columns(path):
+	'''
+	Open the columns of a project file without creating the workflow objects, e.g. to load
+	the bounds of 100k variables in bulk. The arrays are read from the file on first access.
+
+	Returns
+	-------
+	columns : numpy.lib.npyio.NpzFile
+		{name} : ndarray, see the module docstring and text_list(), close it after use
+	'''
+	return np.load(path, allow_pickle=False)
+
+def columns_project(columns):
+	'''
+	Create the project from its columns.
+
+	Parameters
+	----------
+	columns : dict
+		{name} : ndarray, see the module docstring
+
+	Returns
+	-------
+	proj : Project
+
+	Raises
+	------
+	IOError
+		When the columns are not valid.
+	'''
+	try:
+		name, directory = text_list(columns['header'])
+		var_values = columns['var_values'].tolist()
+		var_offsets = columns['var_offsets'].tolist()
+		variables = []
+		for i, (var_name, kind, lower, upper, baseline, resolution, description) in enumerate(zip(
+				text_list(columns['var_name']), columns['var_kind'].tolist(),
+				columns['var_lower'].tolist(), columns['var_upper'].tolist(),
+				columns['var_baseline'].tolist(), columns['var_resolution'].tolist(),
+				text_list(columns['var_description']))):
+			if kind == 0:
+				variables.append(Continuous(var_name, (lower, upper), baseline, resolution, description))
+			elif kind == 1:
+				variables.append(Discrete(var_name, var_values[var_offsets[i]:var_offsets[i + 1]],
+										  baseline, description))
+			elif kind == 2:
+				variables.append(Constant(var_name, baseline, description))
+			else:
+				raise IOError("Error when parsing the variables.")
+		responses = []
+		for resp_name, kind, option, weight, resp_min, resp_max, description in zip(
+				text_list(columns['resp_name']), columns['resp_kind'].tolist(),
+				columns['resp_option'].tolist(), columns['resp_weight'].tolist(),
+				columns['resp_min'].tolist(), columns['resp_max'].tolist(),
+				text_list(columns['resp_description'])):
+			if kind == 0:
+				responses.append(Objective(resp_name, option, weight, description))
+			elif kind == 1:
+				responses.append(Constraint(resp_name, resp_min, resp_max, description))
+			elif kind == 2:
+				responses.append(Monitored(resp_name, description))
+			else:
+				raise IOError("Error when parsing the responses.")
+		objects = [*variables, *responses]
+		mod_in = columns['mod_in'].tolist()
+		mod_in_offsets = columns['mod_in_offsets'].tolist()
+		mod_out = columns['mod_out'].tolist()
+		mod_out_offsets = columns['mod_out_offsets'].tolist()
+		modules = []
+		for i, (mod_name, portal, description, timeout) in enumerate(zip(
+				text_list(columns['mod_name']), text_list(columns['mod_portal']),
+				text_list(columns['mod_description']), columns['mod_timeout'].tolist())):
+			inlist = [objects[j] for j in mod_in[mod_in_offsets[i]:mod_in_offsets[i + 1]]]
+			outlist = [objects[j] for j in mod_out[mod_out_offsets[i]:mod_out_offsets[i + 1]]]
+			modules.append(Module(mod_name, portal, inlist, outlist, description,
+								  None if timeout != timeout else timeout))
+		proc_offsets = columns['proc_offsets'].tolist()
+		processes = []
+		for i, (proc_name, description) in enumerate(zip(
+				text_list(columns['proc_name']), text_list(columns['proc_description']))):
+			proc = Process(proc_name, [], description)
+			proc.add_many(modules[proc_offsets[i]:proc_offsets[i + 1]])
+			processes.append(proc)
+	except (KeyError, ValueError, IndexError) as e:
+		raise IOError("Error when parsing the project file: {}".format(e))
+	return Project(name, variables, responses, processes, directory)
+
+def open_npz(path):
+	'''
+	Load the project from the file path.
+	'''
+	with read_columns(path) as columns:
+		return columns_project(columns)
@@ -1,29 +1,64 @@
 '''
 The file system of the software.
+
+The project file data.txt is written section by section through a buffered writer and parsed
+in a single pass over its lines:
+	{name}\t{directory}
+	variables:
+	one line per variable, see Continuous, Discrete and Constant
+	responses:
+	one line per response, see Objective, Constraint and Monitored
+	processes:
+	one line per process: {name}\t{number of modules}\t{description},
+		followed by one line per module: {name}\t{portal}\t[{inlist}]\t[{outlist}]\t{description}
+		or, if its timeout is set, {name}\t{portal}\t[{inlist}]\t[{outlist}]\ttimeout={timeout}\t{description}
+
+A project can also be stored in the binary file data.npz, see binfile. Parameter fmt of save(),
+save_as() and open_proj() selects the file, convert() converts one file to the other.
+
+A project file is written to a temporary file which then replaces it, so a crash during a save
+leaves the previous file intact.
+
+Frequent saves can be appended to the journal journal.txt instead, see Journal. Every save is one
+transaction of records ended by a line "end":
+	base\t{inode}\t{size}\t{mtime}     the data.txt the journal applies to, the first line
+	header\t{name}\t{directory}
+	variable\t{line of the variable}    added or replaced, by name
+	response\t{line of the response}
+	process\t{line of the process}      followed by the lines of its modules
+	variables\t{name}\t{name}...       the variables in order, the others are deleted
+	responses\t{name}\t{name}...
+	processes\t{name}\t{name}...
+open_proj() applies the complete transactions of the journal to data.txt. A journal whose base
+line does not match data.txt, left by a crash after data.txt was replaced, is ignored.
 '''
+import os
+import stat
+import tempfile
 from ..workflow import *
+from .binfile import write_npz, open_npz
 
-def save(proj):
+BUFFER_SIZE = 1 << 20
+JOURNAL_FILE = 'journal.txt'
+
+formats = {'txt' : 'data.txt',
+		   'npz' : 'data.npz'
+		   }
+
+def save(proj, fmt='txt'):
 	'''
 	Save project's data to its directory.
+
+	Parameters
+	----------
+	fmt : str
+		'txt' or 'npz', the project file to write
 	'''
 	if proj.whether_changed():
-		if not os.path.exists(proj.directory):
-				os.mkdir(proj.directory)
-			data_file = os.path.join(proj.directory,'data.txt')
-			f = open(data_file,'w')
-			try:
-				f.write(proj.__str__())
-			except Exception as e:
-				raise e
-			else:
-				proj.flags2False()
-			finally:
-				f.close()
-		else:
-			pass
+		write_proj(proj, proj.directory, fmt)
+		proj.flags2False()
 
-def save_as(proj, name, proj_dir):
+def save_as(proj, name, proj_dir, fmt='txt'):
 	'''
 	Save the project to a new directory and with new name.
 
@@ -33,22 +68,91 @@ def save_as(proj, name, proj_dir):
 		the new name of the project
 	proj_dir : str
 		the new work directory of the project (eg: X:\\...\\{name})
+	fmt : str
+		'txt' or 'npz', the project file to write
 	'''
-	if not os.path.exists(proj_dir):
-		os.mkdir(proj_dir)
-	f = open(os.path.join(proj_dir,'data.txt'), 'w')
+	proj.name = name
+	proj.directory = proj_dir
+	write_proj(proj, proj_dir, fmt)
+	proj.flags2False()
+
+def write_proj(proj, proj_dir, fmt='txt'):
+	'''
+	Replace the project file of the directory, see Project.lines() and binfile.
+	The journal of data.txt is removed, it does not apply to the new file.
+	'''
+	path = proj_file(proj_dir, fmt)
+	os.makedirs(proj_dir, exist_ok=True)
+	if fmt == 'npz':
+		replace_file(path, lambda f: write_npz(proj, f), binary=True)
+		return
+	replace_file(path, lambda f: f.writelines(proj.lines()))
+	journal = os.path.join(proj_dir, JOURNAL_FILE)
+	if os.path.exists(journal):
+		os.remove(journal)
+
+def replace_file(path, write, binary=False):
+	'''
+	Write a temporary file in the directory of path with write(f), flush it to the disk and
+	rename it to path, so path is either the old or the new file after a crash.
+
+	Parameters
+	----------
+	path : str
+		the file to replace
+	write : callable
+		write(f), writes the content to the open file f
+	binary : bool
+		whether f is opened in binary mode
+	'''
+	directory, name = os.path.split(path)
+	fd, temp = tempfile.mkstemp(prefix='.' + name + '.', suffix='.tmp', dir=directory or None)
 	try:
-		proj.name = name
-		proj.directory = proj_dir
-		f.write(proj.__str__())
-	except Exception as e:
-		raise e
-	else:
-		proj.flags2False()
-	finally:
-		f.close()
+		with os.fdopen(fd, 'wb' if binary else 'w', buffering=BUFFER_SIZE) as f:
+			write(f)
+			f.flush()
+			os.fsync(f.fileno())
+		# mkstemp creates the file readable by the owner only
+		mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+		os.chmod(temp, mode)
+		os.replace(temp, path)
+	except BaseException:
+		if os.path.exists(temp):
+			os.remove(temp)
+		raise
 
-def open_proj(proj_dir):
+def proj_file(proj_dir, fmt):
+	'''
+	Return the path of the project file of the format.
+	'''
+	if not fmt in formats:
+		raise ValueError("Parameter fmt must be one of {}.".format(tuple(formats)))
+	return os.path.join(proj_dir, formats[fmt])
+
+def convert(proj_dir, fmt):
+	'''
+	Convert the project file of the directory to the format, e.g. convert(proj_dir, 'npz')
+	writes data.npz from data.txt.
+
+	Parameters
+	----------
+	proj_dir : str
+		the directory of existed project
+	fmt : str
+		'txt' or 'npz', the project file to write
+
+	Returns
+	-------
+	proj : Project
+		the project which was converted
+	'''
+	proj_file(proj_dir, fmt)
+	source = 'txt' if fmt == 'npz' else 'npz'
+	proj = open_proj(proj_dir, source)
+	write_proj(proj, proj_dir, fmt)
+	return proj
+
+def open_proj(proj_dir, fmt='txt'):
 	'''
 	Load existed project from given directory.
 
@@ -56,55 +160,310 @@ def open_proj(proj_dir):
 	----------
 	proj_dir : str
 		the directory of existed project (eg: X:\\...\\{name})
+	fmt : str
+		'txt' or 'npz', the project file to read, the journal is applied to data.txt
 
 	Returns
 	-------
 	proj : Project
 		the new project be opened
+
+	Raises
+	------
+	IOError
+		When the project file is not valid.
 	'''
-	f = open(os.path.join(proj_dir, 'data.txt'), 'r')
-	try:
-		proj_info = f.readline().rstrip('\n').split('\t')
-		name = proj_info[0]
-		directory = proj_info[1]
-		variables = []
-		responses = []
-		processes = []
-		if not f.readline().rstrip('\n') == "variables:":
-			raise IOError("Error when parsing the project file.")
-		# parse variables
-		line = f.readline().rstrip('\n')
-		while not line == "responses:":
-			variables.append(parse_var(line))
-			line = f.readline().rstrip('\n')
-		# parse responses
-		line = f.readline().rstrip('\n')
-		while not line == "processes:":
-			responses.append(parse_resp(line))
-			line = f.readline().rstrip('\n')
-		# parse processes
-		line = f.readline().rstrip('\n')
-		while not line == '':
-			proc, mod_num = parse_proc(line)
-			line = f.readline().rstrip('\n')
-			for i in range(mod_num):
-				proc.add_mod(parse_mod(line))
-				line = f.readline().rstrip('\n')
-			processes.append(proc)
-		# create a new proj
-		proj = Project(name, variables, responses, processes, directory)
-	except Exception as e:
-		raise e
-	else:
+	path = proj_file(proj_dir, fmt)
+	if fmt == 'npz':
+		proj = open_npz(path)
 		proj.flags2False()
 		return proj
-	finally:
-		f.close()
+	with open(path, 'r', buffering=BUFFER_SIZE) as f:
+		lines = (line.rstrip('\n') for line in f)
+		transactions = read_journal(proj_dir, base_key(path))
+		if transactions:
+			lines = replay(lines, transactions)
+		proj = parse_proj(lines)
+	proj.flags2False()
+	return proj
+
+def parse_proj(lines):
+	'''
+	Parse the lines of a project file, without newlines, to a project.
+
+	Parameters
+	----------
+	lines : iterator of str
+
+	Returns
+	-------
+	proj : Project
+	'''
+	proj_info = next(lines, '').split('\t')
+	name = proj_info[0]
+	directory = proj_info[1] if len(proj_info) > 1 else ''
+	if not next(lines, None) == "variables:":
+		raise IOError("Error when parsing the project file.")
+	# parse variables
+	variables = []
+	for line in lines:
+		if line == "responses:":
+			break
+		variables.append(parse_var(line))
+	else:
+		raise IOError("Error when parsing the project file.")
+	# parse responses
+	responses = []
+	for line in lines:
+		if line == "processes:":
+			break
+		responses.append(parse_resp(line))
+	else:
+		raise IOError("Error when parsing the project file.")
+	# parse processes
+	names = {}
+	for obj in [*variables, *responses]:
+		names[obj.name] = obj
+	processes = []
+	for line in lines:
+		if line == '':
+			break
+		proc, mod_num = parse_proc(line)
+		modules = []
+		for i in range(mod_num):
+			line = next(lines, None)
+			if line is None:
+				raise IOError("Error when parsing the project file.")
+			modules.append(parse_mod(line, names))
+		proc.add_many(modules)
+		processes.append(proc)
+	return Project(name, variables, responses, processes, directory)
+
+def base_key(path):
+	'''
+	Return the identity of the file path, which changes whenever the file is replaced.
+	'''
+	info = os.stat(path)
+	return '{}\t{}\t{}'.format(info.st_ino, info.st_size, info.st_mtime_ns)
+
+def read_journal(proj_dir, key):
+	'''
+	Read the complete transactions of the journal of the directory.
+
+	Parameters
+	----------
+	proj_dir : str
+	key : str
+		the base_key() of data.txt
+
+	Returns
+	-------
+	transactions : list of list of str
+		the lines of every transaction, [] if there is no journal or it is stale
+	'''
+	path = os.path.join(proj_dir, JOURNAL_FILE)
+	if not os.path.exists(path):
+		return []
+	transactions = []
+	with open(path, 'r', buffering=BUFFER_SIZE) as f:
+		if not f.readline().rstrip('\n') == 'base\t' + key:
+			return []
+		transaction = []
+		for line in f:
+			line = line.rstrip('\n')
+			if line == 'end':
+				transactions.append(transaction)
+				transaction = []
+			else:
+				transaction.append(line)
+	# the incomplete transaction of a crashed save is dropped
+	return transactions
+
+def replay(lines, transactions):
+	'''
+	Apply the transactions of a journal to the lines of a project file.
+
+	Parameters
+	----------
+	lines : iterator of str
+		the lines of data.txt, without newlines
+	transactions : list of list of str
+		see read_journal()
+
+	Returns
+	-------
+	lines : iterator of str
+		the lines of the project file with the changes
+	'''
+	header = next(lines, '')
+	sections = {'variables' : {}, 'responses' : {}, 'processes' : {}}
+	current = None
+	for line in lines:
+		if line[:-1] in sections and line[-1:] == ':':
+			current = sections[line[:-1]]
+		elif current is sections['processes'] and line:
+			mod_num = int(line.split('\t')[1])
+			current[line.split('\t', 1)[0]] = [line] + [next(lines) for i in range(mod_num)]
+		elif not current is None and line:
+			current[line.split('\t', 1)[0]] = line
+	for transaction in transactions:
+		records = iter(transaction)
+		for record in records:
+			kind, _, data = record.partition('\t')
+			if kind == 'header':
+				header = data
+			elif kind in ('variable', 'response'):
+				sections[kind + 's'][data.split('\t', 1)[0]] = data
+			elif kind == 'process':
+				mod_num = int(data.split('\t')[1])
+				sections['processes'][data.split('\t', 1)[0]] = [data] + [next(records) for i in range(mod_num)]
+			elif kind in sections:
+				section = sections[kind]
+				try:
+					sections[kind] = {name : section[name] for name in data.split('\t') if name}
+				except KeyError:
+					raise IOError("Error when replaying the journal.")
+			else:
+				raise IOError("Error when replaying the journal.")
+	yield header
+	yield 'variables:'
+	yield from sections['variables'].values()
+	yield 'responses:'
+	yield from sections['responses'].values()
+	yield 'processes:'
+	for proc_lines in sections['processes'].values():
+		yield from proc_lines
+
+
+class Journal:
+	'''
+	A Journal Class
+
+	This class saves a project by appending the changed variables, responses and processes to
+	journal.txt, so a save costs the size of the changes instead of the size of the project.
+	When the journal grows larger than compact_ratio times data.txt, it is compacted: data.txt is
+	replaced by the whole project and the journal is removed. open_proj() reads data.txt with
+	the journal applied.
+
+	The project must be saved only through this journal while it is in use. The changes are
+	known from the dirty flags, see Project.changed_nodes(), and from the names of the sections,
+	which also reveal the deletions and renames.
+
+	Attributes
+	----------
+	proj : Project
+		the project to save
+	compact_ratio : float
+		the size of the journal relative to data.txt which triggers a compaction
+	size : int
+		the size of the journal in bytes
+	base_size : int
+		the size of data.txt in bytes
+	orders : dict
+		{section} : list of str, the names of the variables, responses and processes saved last
+	'''
+	def __init__(self, proj, compact_ratio=0.5):
+		'''
+		Parameters
+		----------
+		proj : Project
+			the project, opened by open_proj() or just saved if it is not changed
+		compact_ratio : float
+			see the class docstring
+		'''
+		if not compact_ratio > 0:
+			raise ValueError("Parameter compact_ratio must be positive.")
+		self.proj = proj
+		self.compact_ratio = compact_ratio
+		path = proj_file(proj.directory, 'txt')
+		journal = os.path.join(proj.directory, JOURNAL_FILE)
+		if proj.whether_changed() or not os.path.exists(path):
+			self.compact()
+			return
+		self.orders = self.current_orders()
+		self.base_size = os.path.getsize(path)
+		self.size = 0
+		if os.path.exists(journal):
+			if read_journal(proj.directory, base_key(path)):
+				self.size = os.path.getsize(journal)
+			else:
+				os.remove(journal)
+
+	def current_orders(self):
+		return {'variables' : [var.name for var in self.proj.variables],
+				'responses' : [resp.name for resp in self.proj.responses],
+				'processes' : [proc.name for proc in self.proj.processes]}
+
+	def records(self, orders):
+		'''
+		Yield the records of the changes since the last save, see the module docstring.
+
+		Parameters
+		----------
+		orders : dict
+			the current names of the sections, see current_orders()
+		'''
+		proj = self.proj
+		dirty = proj.dirty
+		yield 'header\t' + proj.name + '\t' + proj.directory + '\n'
+		for var in dirty:
+			if isinstance(var, Variable):
+				yield 'variable\t' + var.__str__() + '\n'
+		for resp in dirty:
+			if isinstance(resp, Response):
+				yield 'response\t' + resp.__str__() + '\n'
+		# a deleted or renamed name must be written in the module lines of every process
+		renamed = False
+		for section in ('variables', 'responses'):
+			old = self.orders[section]
+			renamed = renamed or not orders[section][:len(old)] == old
+		for proc in proj.processes:
+			if renamed or proc in dirty:
+				proc_lines = proc.lines()
+				yield 'process\t' + next(proc_lines)
+				yield from proc_lines
+		for section in ('variables', 'responses', 'processes'):
+			if not orders[section] == self.orders[section]:
+				yield section + '\t' + '\t'.join(orders[section]) + '\n'
+
+	def save(self):
+		'''
+		Append the changes since the last save to the journal as one transaction, compact the
+		journal when it is too large.
+		'''
+		proj = self.proj
+		if not proj.whether_changed():
+			return
+		orders = self.current_orders()
+		path = os.path.join(proj.directory, JOURNAL_FILE)
+		with open(path, 'a', buffering=BUFFER_SIZE) as f:
+			if self.size == 0:
+				f.write('base\t' + base_key(proj_file(proj.directory, 'txt')) + '\n')
+			f.writelines(self.records(orders))
+			f.write('end\n')
+			f.flush()
+			os.fsync(f.fileno())
+			self.size = f.tell()
+		self.orders = orders
+		proj.flags2False()
+		if self.size > self.compact_ratio * self.base_size:
+			self.compact()
+
+	def compact(self):
+		'''
+		Replace data.txt by the whole project and remove the journal.
+		'''
+		proj = self.proj
+		write_proj(proj, proj.directory, 'txt')
+		proj.flags2False()
+		self.orders = self.current_orders()
+		self.base_size = os.path.getsize(proj_file(proj.directory, 'txt'))
+		self.size = 0
 
 def parse_var(line):
 	'''
 	Parse a string to a variable.
-	
+
 	Parameters
 	----------
 	line : str
@@ -193,53 +552,53 @@ def parse_proc(line):
 	proc = Process(name, [], description)
 	return (proc, mod_num)
 
-def parse_mod(line):
+def parse_mod(line, names):
 	'''
 	Parse a string to a module.
 
 	Parameters
 	----------
 	line : str
+	names : dict
+		{name} : Variable or Response, the objects the inlist and outlist refer to
 
 	Returns
 	-------
 	mod : Module
+		the timeout is None if the line has no timeout field, e.g. in the files written before it
 	'''
 	info = line.split('\t')
 	name = info[0]
 	portal = info[1]
-	str_inlist = info[2][1:-1].split(',')
 	inlist = []
-	for i in str_inlist:
-		found = False
-		for var in params.variables:
-			if var.name == i:
-				inlist.append(var)
-				found = True
-				break
-		if not found:
-			for resp in params.responses:
-				if resp.name == i:
-					inlist.append(resp)
-					found = True
-					break
-		if not found:
+	for i in parse_names(info[2]):
+		if not i in names:
 			raise IOError("Error when parsing module.")
-	str_outlist = info[3][1:-1].split(',')
+		inlist.append(names[i])
 	outlist = []
-	for i in str_outlist:
-		found = False
-		for resp in self.params.responses:
-			if resp.name == i:
-				outlist.append(resp)
-				found = True
-				break
-		if not found:
+	for i in parse_names(info[3]):
+		if not isinstance(names.get(i), Response):
+			raise IOError("Error when parsing module.")
+		outlist.append(names[i])
+	timeout = None
+	if len(info) > 5 and info[4].startswith('timeout='):
+		try:
+			timeout = float(info[4][len('timeout='):])
+		except ValueError:
 			raise IOError("Error when parsing module.")
-	description = self.parse_description(info[4:])
-	return Module(name, portal, inlist, outlist, description)
+		del info[4]
+	description = parse_description(info[4:])
+	return Module(name, portal, inlist, outlist, description, timeout)
+
+def parse_names(s):
+	'''
+	Parse "[name,name,...]" to a list of names, "[]" to an empty list.
+	'''
+	if s == '[]':
+		return []
+	return s[1:-1].split(',')
 
-def parse_description(self, l):
+def parse_description(l):
 	'''
 	Parse description.
 
@@ -252,8 +611,4 @@ def parse_description(self, l):
 	-------
 	description : str
 	'''
-	description = ''
-	for i in range(len(l)-1):
-		description += l[i] + '\t'
-	description += l[-1]
-	return description
\ No newline at end of file
+	return '\t'.join(l)
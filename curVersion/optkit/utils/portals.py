@@ -1,7 +1,256 @@
 '''
 portals : dict
 	the protals of the softwares
-	{name} : [commands,]
+	{name} : Portal
+
+A portal launches the command of a software to evaluate a module: the values of the module's
+inlist are written to the software, the responses of its outlist are parsed from its output.
+Both are plain text, one "name value" pair per line, e.g.
+	x0 1.5
+	x1 -2.0
+"name = value" and "name: value" are also accepted in the output.
 '''
-portals = {"General" : []
-		   }
\ No newline at end of file
+import os
+import re
+import time
+import queue
+import tempfile
+import threading
+import subprocess
+
+class PortalWorker:
+	'''
+	A long-lived process of a portal in server mode.
+
+	The process reads the requests from its stdin and writes the replies to its stdout. A request
+	or a reply is the "name value" lines followed by a line "END".
+
+	Attributes
+	----------
+	process : subprocess.Popen
+		the process of the software
+	lines : queue.Queue
+		the lines of stdout, None when stdout is closed
+	'''
+	def __init__(self, command):
+		self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+										text=True, bufsize=1)
+		self.lines = queue.Queue()
+		self.thread = threading.Thread(target=self.read, daemon=True)
+		self.thread.start()
+
+	def read(self):
+		for line in self.process.stdout:
+			self.lines.put(line)
+		self.lines.put(None)
+
+	def request(self, text, timeout=None):
+		'''
+		Send one request and wait for its reply.
+
+		Raises
+		------
+		TimeoutError
+			When the reply is not complete within timeout seconds.
+		RuntimeError
+			When the process exits before replying.
+		'''
+		self.process.stdin.write(text + 'END\n')
+		self.process.stdin.flush()
+		reply = []
+		deadline = None if timeout is None else time.monotonic() + timeout
+		while True:
+			try:
+				line = self.lines.get(timeout=None if deadline is None else max(0, deadline - time.monotonic()))
+			except queue.Empty:
+				raise TimeoutError("The portal server did not reply within {} seconds.".format(timeout))
+			if line is None:
+				raise RuntimeError("The portal server exited with code {}.".format(self.process.wait()))
+			if line.strip() == 'END':
+				return ''.join(reply)
+			reply.append(line)
+
+	def close(self):
+		'''
+		Close stdin so the process can exit, kill it if it does not.
+		'''
+		try:
+			self.process.stdin.close()
+			self.process.wait(timeout=5)
+		except (OSError, subprocess.TimeoutExpired):
+			self.process.kill()
+			self.process.wait()
+
+
+class Portal:
+	'''
+	A Portal Class
+
+	One-shot mode: every execution runs command in a new temporary directory. The input is written
+	to input_file in that directory, or to stdin if input_file is None. The output is read from
+	output_file, or from stdout if output_file is None.
+
+	Server mode: the command is started once and kept alive, every execution is one request to
+	an idle worker process (see PortalWorker), so the start-up cost of the software is paid once
+	per worker. A worker is created when no idle one is left, at most max_workers are kept idle.
+	A worker which timed out or failed is killed instead of being reused.
+
+	Attributes
+	----------
+	name : str
+		the name of the portal
+	command : list of str
+		the command line of the software, None if the portal cannot be executed
+	input_file : str or None
+		the name of the input file
+	output_file : str or None
+		the name of the output file
+	timeout : float or None
+		the default time limit of one execution in seconds
+	server : bool
+		whether the software runs in server mode
+	max_workers : int or None
+		the maximum number of idle workers kept in server mode, unlimited if None
+	'''
+	line_pattern = re.compile(r'^\s*(\S+?)\s*(?:[=:]\s*|\s+)(\S+)\s*$')
+
+	def __init__(self, name, command=None, input_file=None, output_file=None, timeout=None,
+				 server=False, max_workers=None):
+		self.name = str(name)
+		self.command = command
+		self.input_file = input_file
+		self.output_file = output_file
+		self.timeout = timeout
+		self.server = server
+		self.max_workers = max_workers
+		self.idle = []
+		self.lock = threading.Lock()
+
+	def format_input(self, values):
+		'''
+		Return the input text of the values.
+
+		Parameters
+		----------
+		values : dict
+			{name} : float
+		'''
+		return ''.join('{} {!r}\n'.format(name, float(value)) for name, value in values.items())
+
+	def parse_output(self, text):
+		'''
+		Return the values in the output text, the lines which are not "name value" are skipped.
+
+		Returns
+		-------
+		values : dict
+			{name} : float
+		'''
+		values = {}
+		for line in text.splitlines():
+			match = self.line_pattern.match(line)
+			if match is None:
+				continue
+			try:
+				values[match.group(1)] = float(match.group(2))
+			except ValueError:
+				continue
+		return values
+
+	def run(self, values, timeout=None):
+		'''
+		Execute the software with the values.
+
+		Parameters
+		----------
+		values : dict
+			{name} : float, the input values
+		timeout : float or None
+			the time limit of this execution, self.timeout if None
+
+		Returns
+		-------
+		values : dict
+			{name} : float, the output values
+
+		Raises
+		------
+		ValueError
+			When the portal has no command.
+		TimeoutError
+			When the software did not finish within timeout seconds.
+		RuntimeError
+			When the software failed.
+		'''
+		if not self.command:
+			raise ValueError("Portal {} has no command.".format(self.name))
+		if timeout is None:
+			timeout = self.timeout
+		if self.server:
+			return self.run_server(values, timeout)
+		text = self.format_input(values)
+		with tempfile.TemporaryDirectory() as directory:
+			stdin = text
+			if not self.input_file is None:
+				with open(os.path.join(directory, self.input_file), 'w') as f:
+					f.write(text)
+				stdin = None
+			try:
+				completed = subprocess.run(self.command, input=stdin, cwd=directory, capture_output=True,
+										   text=True, timeout=timeout)
+			except subprocess.TimeoutExpired:
+				raise TimeoutError("Portal {} did not finish within {} seconds.".format(self.name, timeout))
+			if not completed.returncode == 0:
+				raise RuntimeError("Portal {} failed with code {}:\n{}".format(
+					self.name, completed.returncode, completed.stderr))
+			if self.output_file is None:
+				return self.parse_output(completed.stdout)
+			with open(os.path.join(directory, self.output_file), 'r') as f:
+				return self.parse_output(f.read())
+
+	def run_server(self, values, timeout):
+		'''
+		Execute one request on an idle worker, see run().
+		'''
+		with self.lock:
+			worker = self.idle.pop() if self.idle else None
+		if worker is None:
+			worker = PortalWorker(self.command)
+		try:
+			output = worker.request(self.format_input(values), timeout)
+		except Exception:
+			worker.process.kill()
+			worker.close()
+			raise
+		with self.lock:
+			if self.max_workers is None or len(self.idle) < self.max_workers:
+				self.idle.append(worker)
+				worker = None
+		if not worker is None:
+			worker.close()
+		return self.parse_output(output)
+
+	def close(self):
+		'''
+		Stop the idle workers of the server mode.
+		'''
+		with self.lock:
+			idle, self.idle = self.idle, []
+		for worker in idle:
+			worker.close()
+
+
+portals = {"General" : Portal("General")
+		   }
+
+def add_portal(portal):
+	'''
+	Register a portal, so the modules can use it by name.
+
+	Parameters
+	----------
+	portal : Portal
+	'''
+	if not isinstance(portal, Portal):
+		raise TypeError("Parameter portal must be of type Portal.")
+	portals[portal.name] = portal
@@ -1,11 +1,12 @@
 from .node import Node 
 from .variable import Variable, Continuous, Discrete, Constant
+from .variable_set import VariableSet
 from .response import Response, Objective, Constraint, Monitored
 from .module import Module 
-from .process import Process 
+from .process import Process, ProcessObjective
 from .project import Project
 
 
-__all__ = ["Variable", "Continuous", "Discrete", "Constant",
+__all__ = ["Variable", "Continuous", "Discrete", "Constant", "VariableSet",
 		   "Response", "Objective", "Constraint", "Monitored",
-		   "Node", "Project", "Process", "Module"]
\ No newline at end of file
+		   "Node", "Project", "Process", "ProcessObjective", "Module"]
\ No newline at end of file
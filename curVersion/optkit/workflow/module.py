@@ -1,18 +1,19 @@
 '''
-Complete execute()
-
 Define class Module.
 '''
 from . import Node, Variable, Response
 from ..utils.portals import portals
 
 class Module(Node):
+	__slots__ = ('portal', 'inlist', 'outlist', 'description', 'timeout')
+
 	def __init__(self,
 				 name,
 				 portal='General',
-				 inlist=[],
-				 outlist=[],
-				 description=''):
+				 inlist=None,
+				 outlist=None,
+				 description='',
+				 timeout=None):
 		'''
 		Initiate class Module.
 
@@ -32,28 +33,28 @@ class Module(Node):
 			the output list of the module
 		description : str
 			the description of the module
+		timeout : float or None
+			the time limit of one execution in seconds, the portal's timeout if None
 		'''
 		super(Module, self).__init__(None, True)
 		self.name = str(name)
 		self.portal = portal
-		self.inlist = inlist
-		self.outlist = outlist
+		self.inlist = [] if inlist is None else inlist
+		self.outlist = [] if outlist is None else outlist
 		self.description = str(description)
+		self.timeout = timeout
 		self.validator()
 
 	def __str__(self):
-		str_inlist = '['
-		for i in range(len(self.inlist)-1):
-			str_inlist += self.inlist[i].name + ','
-		str_inlist += self.inlist[-1].name + ']'
-		str_outlist = '['
-		for i in range(len(self.outlist)-1):
-			str_outlist += self.outlist[i].name + ','
-		str_outlist += self.outlist[-1].name + ']'
+		str_inlist = '[' + ','.join(obj.name for obj in self.inlist) + ']'
+		str_outlist = '[' + ','.join(obj.name for obj in self.outlist) + ']'
+		# the timeout field is written only when it is set, see utils.file.parse_mod()
+		str_timeout = '' if self.timeout is None else 'timeout=' + str(self.timeout) + '\t'
 		return (self.name + '\t' + 
 				self.portal + '\t' +
 				str_inlist + '\t' +
 				str_outlist + '\t' +
+				str_timeout +
 				self.description)
 
 	def validator(self):
@@ -80,16 +81,18 @@ class Module(Node):
 
 	def edit(self, **kwargs):
 		'''
-		Support edition of parameter name, portal and description.
+		Support edition of parameter name, portal, description and timeout.
 		'''
 		try:
 			if 'name' in kwargs:
-				self.name = kwargs['name']
+				self.rename(str(kwargs['name']))
 			if 'portal' in kwargs:
 				self.portal = kwargs['portal']
 				self.validator_portal()
 			if 'description' in kwargs:
 				self.description = kwargs['description']
+			if 'timeout' in kwargs:
+				self.timeout = kwargs['timeout']
 		except Exception as e:
 			raise e
 		else:
@@ -98,10 +101,17 @@ class Module(Node):
 	def add_inlist(self, obj):
 		'''
 		Support add object to inlist.
+		The organized processes of the module are updated, see Process.organize().
+
+		Raises
+		------
+		ValueError
+			When obj would form a cycle in a process, the module is left unchanged.
 		'''
 		try:
 			if not (isinstance(obj, Variable) or isinstance(obj, Response)):
 				raise TypeError("Parameter obj must be of type Variable or Response.")
+			self.notify('inlist_added', 'inlist_removed', obj)
 		except Exception as e:
 			raise e
 		else:
@@ -117,6 +127,8 @@ class Module(Node):
 				raise ValueError("obj is not in inlist.")
 			else:
 				self.inlist.remove(obj)
+				for proc in self.parents:
+					proc.inlist_removed(self, obj)
 		except Exception as e:
 			raise e
 		else:
@@ -125,10 +137,17 @@ class Module(Node):
 	def add_outlist(self, obj):
 		'''
 		Support add object to outlist.
+		The organized processes of the module are updated, see Process.organize().
+
+		Raises
+		------
+		ValueError
+			When obj would form a cycle in a process, the module is left unchanged.
 		'''
 		try:
 			if not isinstance(obj, Response):
 				raise TypeError("Parameter obj must be of type Response.")
+			self.notify('outlist_added', 'outlist_removed', obj)
 		except Exception as e:
 			raise e
 		else:
@@ -144,15 +163,62 @@ class Module(Node):
 				raise ValueError("obj is not in outlist.")
 			else:
 				self.outlist.remove(obj)
+				for proc in self.parents:
+					proc.outlist_removed(self, obj)
 		except Exception as e:
 			raise e
 		else:
 			super(Module, self).change_flag()
 
+	def notify(self, added, removed, obj):
+		'''
+		Call the method added of every process of the module. If one of them raises, the
+		method removed of the processes already updated is called and the error is raised.
+		'''
+		updated = []
+		try:
+			for proc in self.parents:
+				getattr(proc, added)(self, obj)
+				updated.append(proc)
+		except Exception:
+			for proc in updated:
+				getattr(proc, removed)(self, obj)
+			raise
+
 	def execute(self):
 		'''
 		Send inlist's data to portal software.
 		Drive software do calculations.
 		Get data to outlist.
+		See Portal.run().
+
+		Raises
+		------
+		ValueError
+			When the output of the software misses a response of outlist.
+		'''
+		self.store(self.compute())
+
+	def compute(self):
+		'''
+		Run the portal software with inlist's data and return its output, the module and its
+		responses are left unchanged. So the module can be computed in another process.
+
+		Returns
+		-------
+		results : dict
+			{name} : float, the output values of the software
+		'''
+		values = {}
+		for obj in self.inlist:
+			values[obj.name] = obj.value
+		return portals[self.portal].run(values, self.timeout)
+
+	def store(self, results):
+		'''
+		Set the value of every response of outlist from the output of compute().
 		'''
-		pass
\ No newline at end of file
+		for resp in self.outlist:
+			if not resp.name in results:
+				raise ValueError("Module {}'s output misses response {}.".format(self.name, resp.name))
+			resp.value = results[resp.name]
\ No newline at end of file
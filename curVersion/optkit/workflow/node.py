@@ -1,7 +1,37 @@
 '''
 A class for the nodes on the workflow tree.
 '''
+# the dirty set of a node without children, replaced by a set when a child is linked
+NO_DIRTY = frozenset()
+
+def copy_containers(value, copies):
+	'''
+	Copy the lists, dicts and sets in value recursively, their other items are shared.
+	copies maps the id of a copied container to its copy, so containers shared by several
+	attributes, e.g. the child and the modules of a process, stay shared in the copy.
+	'''
+	if not isinstance(value, (list, dict, set)):
+		return value
+	if id(value) in copies:
+		return copies[id(value)]
+	if isinstance(value, list):
+		result = []
+		copies[id(value)] = result
+		result.extend(copy_containers(i, copies) for i in value)
+	elif isinstance(value, dict):
+		result = {}
+		copies[id(value)] = result
+		for key, item in value.items():
+			result[key] = copy_containers(item, copies)
+	else:
+		result = set(value)
+		copies[id(value)] = result
+	return result
+
 class Node:
+	# the workflow classes declare their attributes as __slots__, so a node has no __dict__
+	__slots__ = ('child', 'changedFlag', 'parents', 'dirty', 'name')
+
 	def __init__(self, child=None, changedFlag=True):
 		'''
 		Attributes
@@ -9,11 +39,88 @@ class Node:
 		child : list of Node
 			all children of the node
 		changedFlag : bool
-			whether this node has been changed
+			whether this node or one of its descendants has been changed
+		parents : list of Node
+			the nodes which have this node as a child
+		dirty : set of Node
+			the children which have been changed
+
+		A changed node is in the dirty set of each of its parents, which are changed too. So
+		whether a subtree has been changed is known from its root in O(1).
 		'''
 		self.child = child
 		self.changedFlag = changedFlag
+		self.parents = []
+		self.dirty = NO_DIRTY
 		self.validator_node()
+		if not self.child == None:
+			for i in self.child:
+				self.link_child(i)
+
+	def __getstate__(self):
+		'''
+		Return the state for pickle: the __dict__ of a subclass which has one, and the slots
+		which are set. A slot overridden by a property, e.g. the value of a VariableSet view,
+		is stored elsewhere and skipped. parents and dirty are not stored, so a pickled node
+		never carries its ancestors, e.g. a module sent to a worker process does not carry the
+		project which holds its variables. __setstate__() links the children again.
+		'''
+		slots = {}
+		for cls in type(self).__mro__:
+			for name in cls.__dict__.get('__slots__', ()):
+				if not (name in slots or name in ('parents', 'dirty') or
+						isinstance(getattr(type(self), name), property)):
+					try:
+						slots[name] = getattr(self, name)
+					except AttributeError:
+						pass
+		return (getattr(self, '__dict__', None), slots)
+
+	def __setstate__(self, state):
+		'''
+		Restore the state returned by __getstate__(), the node becomes a parent of its children.
+		A child whose state is not restored yet counts as changed.
+		'''
+		state, slots = state
+		if state:
+			self.__dict__.update(state)
+		for name, value in slots.items():
+			setattr(self, name, value)
+		try:
+			self.parents
+		except AttributeError:
+			# not yet linked by a parent restored before this node
+			self.parents = []
+		self.dirty = NO_DIRTY
+		if self.child:
+			self.dirty = set()
+			for node in self.child:
+				try:
+					node.parents.append(self)
+				except AttributeError:
+					node.parents = [self]
+				if getattr(node, 'changedFlag', True):
+					self.dirty.add(node)
+
+	def __copy__(self):
+		'''
+		Return a shallow copy: the children and the other objects are shared, the lists, dicts
+		and sets holding them are copied, so editing the copy does not change self. The copy is
+		not registered as a parent of the children, the tree of self is left unchanged.
+		'''
+		cls = type(self)
+		node = cls.__new__(cls)
+		state, slots = self.__getstate__()
+		copies = {}
+		if state:
+			node.__dict__.update(copy_containers(state, copies))
+		for name, value in slots.items():
+			setattr(node, name, copy_containers(value, copies))
+		node.parents = []
+		node.dirty = NO_DIRTY
+		if node.child:
+			node.dirty = set(i for i in node.child if i.changedFlag)
+		return node
 
 	def validator_node(self):
 		'''
@@ -33,4 +140,102 @@ class Node:
 			if not isinstance(self.changedFlag, bool):
 				raise TypeError("Parameter changedFlag must be of type bool.")
 		except Exception as e:
-			raise e
\ No newline at end of file
+			raise e
+
+	def link_child(self, node):
+		'''
+		Register the node as a child of self, a changed node marks self as changed.
+		The caller adds the node to its own list of children.
+		'''
+		node.parents.append(self)
+		if not isinstance(self.dirty, set):
+			self.dirty = set()
+		if node.changedFlag:
+			self.dirty.add(node)
+			self.change_flag()
+
+	def unlink_child(self, node):
+		'''
+		Unregister the node as a child of self, self is marked as changed.
+		A shallow copy is not registered with the children it shares, see __copy__().
+		'''
+		if self in node.parents:
+			node.parents.remove(self)
+		self.dirty.discard(node)
+		self.change_flag()
+
+	def rename(self, name):
+		'''
+		Rename the node. Every parent may reject the name by check_rename() and is told the old
+		name by renamed(), so the parents can keep their name indexes current.
+		'''
+		for parent in self.parents:
+			parent.check_rename(self, name)
+		old_name = self.name
+		self.name = name
+		for parent in self.parents:
+			parent.renamed(self, old_name)
+		self.change_flag()
+
+	def check_rename(self, node, name):
+		'''
+		Called before the child node is renamed, raise ValueError to reject the name.
+		'''
+		pass
+
+	def renamed(self, node, old_name):
+		'''
+		Called after the child node is renamed.
+		'''
+		pass
+
+	def change_flag(self):
+		'''
+		Mark the node and its ancestors as changed.
+		The propagation stops at the ancestors which already know the change, so marking a
+		node which is already changed is O(1).
+		'''
+		self.changedFlag = True
+		stack = [self]
+		while stack:
+			node = stack.pop()
+			for parent in node.parents:
+				if not node in parent.dirty:
+					parent.dirty.add(node)
+					parent.changedFlag = True
+					stack.append(parent)
+
+	def clear_flags(self):
+		'''
+		Mark the node and its descendants as unchanged, only the changed subtrees are visited.
+		'''
+		stack = [self]
+		while stack:
+			node = stack.pop()
+			node.changedFlag = False
+			if node.dirty:
+				stack.extend(node.dirty)
+				node.dirty.clear()
+
+	def dirty_nodes(self):
+		'''
+		Return the changed nodes of the subtree, only the changed subtrees are visited.
+
+		Returns
+		-------
+		nodes : list of Node
+			the changed nodes, self first if it is changed
+		'''
+		if not self.changedFlag:
+			return []
+		nodes = [self]
+		seen = {self}
+		stack = [self]
+		while stack:
+			node = stack.pop()
+			for i in node.dirty:
+				if not i in seen:
+					seen.add(i)
+					nodes.append(i)
+					stack.append(i)
+		return nodes
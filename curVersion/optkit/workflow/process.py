@@ -1,13 +1,23 @@
 '''
 Define class Process.
 '''
-from queue import Queue
-from . import Node, Module
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED, FIRST_EXCEPTION
+from . import Node, Module, Objective, VariableSet
+
+executors = {"thread" : ThreadPoolExecutor,
+			 "process" : ProcessPoolExecutor
+			 }
+schedules = ('level', 'dag')
 
 class Process(Node):
+	__slots__ = ('modules', 'levels', 'description', 'executor', 'workers', 'schedule', 'pool', 'reuse',
+				 'outputs', 'executed', 'mod_names', 'resp_set', 'producers', 'consumers', 'preds', 'succs',
+				 'level')
+
 	def __init__(self,
 				 name,
-				 modules=[],
+				 modules=None,
 				 description=''):
 		'''
 		Initiate class Process.
@@ -23,22 +33,82 @@ class Process(Node):
 		modules : list of Module
 			the modules of the process
 		organized : list of list of Module
-			store topol-sorted modules
+			store topol-sorted modules, kept current on every edit once organize() is called
 		description : str
 			the description of the module
+		executor : str or None
+			'thread' or 'process' to run the independent modules concurrently, None to run them
+			one after another, see set_parallel()
+		workers : int or None
+			the number of workers of the executor
+		schedule : str
+			'level' or 'dag', see run_proc()
+		reuse : bool
+			whether run_proc() reuses the outputs of the modules whose inputs have not changed
+		outputs : dict
+			{module} : (signature, results), the inputs and outputs of the last run of a module
+		executed : list of Module
+			the modules run by the last run_proc(), the others reused their outputs
+		mod_names : dict
+			{name} : Module
+
+		The dependency graph, built by organize() and updated by the edits:
+		resp_set : set of Response or None
+			the responses which connect the modules, every response if None
+		producers : dict
+			{response} : list of Module, the modules producing it
+		consumers : dict
+			{object} : list of Module, the modules using it
+		preds, succs : dict
+			{module} : {module} : int, the predecessors or successors of a module and the number
+			of the responses linking them
+		level : dict
+			{module} : int, the topol order of a module, the length of the longest path to it
+		levels : list of dict or None
+			the modules of each topol order, None until organize() is called
 		'''
+		if modules is None:
+			modules = []
 		super(Process, self).__init__(modules, True)
 		self.name = str(name)
 		self.modules = modules
-		self.organized = []
+		self.levels = None
 		self.description = str(description)
+		self.executor = None
+		self.workers = None
+		self.schedule = 'level'
+		self.pool = None
+		self.reuse = True
+		self.outputs = {}
+		self.executed = []
 		self.validator()
+		self.mod_names = {}
+		for mod in modules:
+			if mod.name in self.mod_names:
+				raise ValueError("Module's name must be unique.")
+			self.mod_names[mod.name] = mod
+
+	def __getstate__(self):
+		state, slots = super(Process, self).__getstate__()
+		slots['pool'] = None
+		return (state, slots)
+
+	@property
+	def organized(self):
+		if self.levels is None:
+			return []
+		return [list(step) for step in self.levels if step]
 
 	def __str__(self):
-		str_self = self.name + '\t' + str(len(self.modules)) + '\t' + self.description + '\n'
+		return ''.join(self.lines())
+
+	def lines(self):
+		'''
+		Yield the line of the process and the lines of its modules.
+		'''
+		yield self.name + '\t' + str(len(self.modules)) + '\t' + self.description + '\n'
 		for mod in self.modules:
-			str_self += mod.__str__() + '\n'
-		return str_self
+			yield mod.__str__() + '\n'
 
 	def print_organized(self):
 		'''
@@ -75,24 +145,92 @@ class Process(Node):
 		Support edition of name and description.
 		'''
 		if 'name' in kwargs:
-			self.name = str(kwargs['name'])
+			self.rename(str(kwargs['name']))
 		if 'description' in kwargs:
 			self.description = str(kwargs['description'])
+		self.change_flag()
+
+	def find_mod(self, name):
+		'''
+		Return the module of the name, None if there is none. O(1).
+		'''
+		return self.mod_names.get(name)
+
+	def check_rename(self, node, name):
+		'''
+		Called by Node.rename() before a module is renamed.
+
+		Raises
+		------
+		ValueError
+			When the name is used by another module.
+		'''
+		if not self.mod_names.get(name, node) is node:
+			raise ValueError("Module's name must be unique.")
+
+	def renamed(self, node, old_name):
+		'''
+		Called by Node.rename() after a module is renamed.
+		'''
+		del self.mod_names[old_name]
+		self.mod_names[node.name] = node
 
 	def add_mod(self, mod):
 		'''
 		Add module to self.modules
+
+		Raises
+		------
+		ValueError
+			When the module's name is used.
+			When the module would form a cycle in an organized process.
+		'''
+		if not isinstance(mod, Module):
+			raise TypeError("Parameter mod must be of type Module.")
+		self.add_many([mod])
+
+	def add_many(self, modules):
+		'''
+		Add modules in one pass. Every module is validated before any is added. O(n) in total,
+		plus the incremental update of an organized process.
+
+		Parameters
+		----------
+		modules : list of Module
+
+		Raises
+		------
+		TypeError
+			When an element is not of type Module.
+		ValueError
+			When a name is already used, by the process or by another module.
+			When a module would form a cycle in an organized process, no module is added.
 		'''
 		try:
-			if not isinstance(mod, Module):
-				raise TypeError("Parameter mod must be of type Module.")
-			for m in self.modules:
-				if m.name == mod.name:
+			names = set()
+			for mod in modules:
+				if not isinstance(mod, Module):
+					raise TypeError("Elements of modules must be of type Module.")
+				if mod.name in self.mod_names or mod.name in names:
 					raise	ValueError("Module's name must be unique.")
+				names.add(mod.name)
+			if not self.levels is None:
+				inserted = []
+				try:
+					for mod in modules:
+						self.insert_module(mod)
+						inserted.append(mod)
+				except ValueError:
+					for mod in inserted:
+						self.remove_module(mod)
+					raise
 		except Exception as e:
 			raise e
 		else:
-			self.modules.append(mod)
+			for mod in modules:
+				self.modules.append(mod)
+				self.mod_names[mod.name] = mod
+				self.link_child(mod)
 			super(Process, self).change_flag()
 
 	def del_mod(self, mod):
@@ -100,10 +238,14 @@ class Process(Node):
 		Delete module from self.modules
 		'''
 		try:
-			if not mod in self.modules:
+			if not self.mod_names.get(mod.name) is mod:
 				raise ValueError("Module not found.")
 			else:
 				self.modules.remove(mod)
+				del self.mod_names[mod.name]
+				self.unlink_child(mod)
+				if not self.levels is None:
+					self.remove_module(mod)
 		except Exception as e:
 			raise e
 		else:
@@ -115,102 +257,353 @@ class Process(Node):
 		Edit the attributes of module.
 		'''
 		try:
-			if not mod in self.modules:
+			if not self.mod_names.get(mod.name) is mod:
 				raise ValueError("Module not found.")
 			else:
-				if 'name' in kwargs:
-					for m in self.modules:
-						if m.name == kwargs['name']:
-							raise ValueError("Module's name must be unique.")
-				self.modules[self.modules.index(mod)].edit(**kwargs)
+				mod.edit(**kwargs)
 		except Exception as e:
 			raise e
 		else:
 			super(Process, self).change_flag()
 
-	def organize(self, resp_list):
+	def organize(self, resp_list=None):
 		'''
-		Reorganize the modules in order to parallelize
+		Reorganize the modules in order to parallelize.
+		The modules are sorted into levels by Kahn's algorithm: level 0 holds the modules which
+		use no response produced by another module, a module is on the level after the last of
+		its predecessors. O(modules + responses + edges).
+		After organize(), the graph and organized are kept current by every structural edit of
+		the process and its modules for O(affected) cost, an edit which would form a cycle
+		raises ValueError and is not applied. Within a level, the order of the modules is not
+		significant.
 
 		Parameters
 		----------
 		resp_list : project.parameters.responses
 			When the project call this function, the project need to pass the responses.
+
+		Raises
+		------
+		ValueError
+			When the modules form a cycle, the modules of one cycle are named.
 		'''
-		# Form a directed graph of modules.
-		# sourceMatrix : module -> response
-		# targetMatrix : response -> module
-		# moduleGraph : module -> module (the product of sourceMatrix & targetMatrix)
-		sourceMatrix = []
-		targetMatrix = []
-		moduleGraph = []
-		module_num = len(self.modules)
+		self.resp_set = None if resp_list is None else set(resp_list)
+		self.producers = {}
+		self.consumers = {}
+		self.preds = {mod : {} for mod in self.modules}
+		self.succs = {mod : {} for mod in self.modules}
 		for mod in self.modules:
-			stemp = []
-			ttemp = []
-			for resp in resp_list:
-				if resp in mod.outlist:
-					stemp.append(1)
-				else:
-					stemp.append(0)
-				if resp in mod.inlist:
-					ttemp.append(1)
-				else:
-					ttemp.append(0)
-			sourceMatrix.append(stemp)
-			targetMatrix.append(ttemp)
-		for i in range(module_num):
-			temp = []
-			for j in range(module_num):
-				addition = 0
-				for n in range(len(resp_list)):
-					addition += sourceMatrix[i][n] * targetMatrix[j][n]
-				temp.append(addition)
-			moduleGraph.append(temp)
-		# Calculate the indegree of each module and initiate the queue.
-		# topol_info : [[indegree, topol_order],...]
-		# topol_que : the queue used to topol-sort
-		# temp_organized : the temporary organized list of modules
-		topol_que = Queue()
-		topol_info = []
+			for resp in mod.outlist:
+				if self.connects(resp):
+					self.producers.setdefault(resp, []).append(mod)
+		for mod in self.modules:
+			for obj in mod.inlist:
+				self.consumers.setdefault(obj, []).append(mod)
+				for pred in self.producers.get(obj, ()):
+					self.count_edge(pred, mod, 1)
+		# level : module -> topol order
+		level = {}
 		temp_organized = []
-		for i in range(module_num):
-			indegree = 0
-			for j in range(module_num):
-				indegree += moduleGraph[j][i]
-			if indegree == 0:
-				topol_info.append([indegree, 0])
-				topol_que.put(i)
-				if len(temp_organized) == 0:
-					temp_organized.append([])
-				temp_organized[0].append(self.modules[i])
-			else:
-				topol_info.append([indegree, -1])
-		# topol-sort
-		while not topol_que.empty():
-			mod_index = topol_que.get()
-			for i in range(module_num):
-				if not moduleGraph[mod_index][i] == 0:
-					topol_info[i][0] -= 1
-					if topol_info[i][0] == 0:
-						topol_info[i][1] = topol_info[mod_index][1] + 1
-						topol_que.put(i)
-						if len(temp_organized) <= topol_info[i][1]:
-							temp_organized.append([])
-						temp_organized[topol_info[i][1]].append(self.modules[i])
-		# circle detection & set self.organized
+		topol_que = deque()
+		for mod in self.modules:
+			if not self.preds[mod]:
+				level[mod] = 0
+				topol_que.append(mod)
+		if topol_que:
+			temp_organized.append(list(topol_que))
+		remaining = {mod : len(self.preds[mod]) for mod in self.modules}
+		while topol_que:
+			mod = topol_que.popleft()
+			for succ in self.succs[mod]:
+				remaining[succ] -= 1
+				if remaining[succ] == 0:
+					level[succ] = level[mod] + 1
+					topol_que.append(succ)
+					if len(temp_organized) <= level[succ]:
+						temp_organized.append([])
+					temp_organized[level[succ]].append(succ)
+		if len(level) < len(self.modules):
+			self.levels = None
+			cycle = self.find_cycle([mod for mod in self.modules if not mod in level])
+			raise ValueError("Circle structure exist in the topology: {}.".format(
+				' -> '.join(mod.name for mod in cycle)))
+		self.level = level
+		self.levels = [dict.fromkeys(step) for step in temp_organized]
+
+	def connects(self, resp):
+		'''
+		Whether resp connects its producers to its consumers.
+		'''
+		return self.resp_set is None or resp in self.resp_set
+
+	def count_edge(self, pred, succ, count):
+		'''
+		Add count responses to the edge pred -> succ, remove the edge when none is left.
+
+		Returns
+		-------
+		changed : bool
+			whether the edge was created or removed
+		'''
+		total = self.preds[succ].get(pred, 0) + count
+		if total == 0:
+			del self.preds[succ][pred]
+			del self.succs[pred][succ]
+			return True
+		self.preds[succ][pred] = total
+		self.succs[pred][succ] = total
+		return total == count
+
+	def find_cycle(self, modules):
+		'''
+		Return the modules of one cycle, the first module repeated at the end.
+
+		Parameters
+		----------
+		modules : list of Module
+			the modules left by Kahn's algorithm, each of them is on a cycle or after one
+		'''
+		left = set(modules)
+		# every module left has a predecessor left, walk backwards until a module repeats
+		path = []
+		position = {}
+		mod = modules[0]
+		while not mod in position:
+			position[mod] = len(path)
+			path.append(mod)
+			mod = next(pred for pred in self.preds[mod] if pred in left)
+		cycle = path[position[mod]:][::-1]
+		return cycle + [cycle[0]]
+
+	def find_path(self, source, target):
+		'''
+		Return a path source -> ... -> target in the organized graph, None if there is none.
+		Only the modules below the level of target are searched: the levels strictly increase
+		along every path.
+		'''
+		if source is target:
+			return [source]
+		if self.level[source] >= self.level[target]:
+			return None
+		previous = {source : None}
+		stack = [source]
+		while stack:
+			mod = stack.pop()
+			for succ in self.succs[mod]:
+				if succ in previous:
+					continue
+				if succ is target:
+					path = [target, mod]
+					while not previous[mod] is None:
+						mod = previous[mod]
+						path.append(mod)
+					return path[::-1]
+				if self.level[succ] < self.level[target]:
+					previous[succ] = mod
+					stack.append(succ)
+		return None
+
+	def add_edges(self, edges):
+		'''
+		Add one response to every edge pred -> succ and update the levels.
+		Nothing is changed if an edge would form a cycle.
+
+		Parameters
+		----------
+		edges : list of (Module, Module)
+
+		Raises
+		------
+		ValueError
+			When an edge would form a cycle, the modules of the cycle are named.
+		'''
+		for i, (pred, succ) in enumerate(edges):
+			if not pred in self.preds[succ]:
+				path = self.find_path(succ, pred)
+				if not path is None:
+					self.remove_edges(edges[:i])
+					raise ValueError("Circle structure exist in the topology: {}.".format(
+						' -> '.join(mod.name for mod in [pred] + path)))
+			if self.count_edge(pred, succ, 1):
+				self.update_levels([succ])
+
+	def remove_edges(self, edges):
+		'''
+		Remove one response from every edge pred -> succ and update the levels.
+		'''
+		changed = []
+		for pred, succ in edges:
+			if self.count_edge(pred, succ, -1):
+				changed.append(succ)
+		self.update_levels(changed)
+
+	def update_levels(self, modules):
+		'''
+		Recompute the level of the modules from their predecessors, and the levels of the
+		successors of every module whose level changed.
+		'''
+		worklist = deque(modules)
+		while worklist:
+			mod = worklist.popleft()
+			if not mod in self.level:
+				continue
+			new_level = 0
+			for pred in self.preds[mod]:
+				new_level = max(new_level, self.level[pred] + 1)
+			if new_level == self.level[mod]:
+				continue
+			del self.levels[self.level[mod]][mod]
+			while len(self.levels) <= new_level:
+				self.levels.append({})
+			self.levels[new_level][mod] = None
+			self.level[mod] = new_level
+			worklist.extend(self.succs[mod])
+		while self.levels and not self.levels[-1]:
+			self.levels.pop()
+
+	def insert_module(self, mod):
+		'''
+		Add a module to the organized graph.
+		'''
+		self.preds[mod] = {}
+		self.succs[mod] = {}
+		self.level[mod] = 0
+		if not self.levels:
+			self.levels.append({})
+		self.levels[0][mod] = None
+		edges = []
+		for obj in mod.inlist:
+			for pred in self.producers.get(obj, ()):
+				edges.append((pred, mod))
+		for resp in mod.outlist:
+			if self.connects(resp):
+				for succ in self.consumers.get(resp, ()):
+					edges.append((mod, succ))
+				if resp in mod.inlist:
+					edges.append((mod, mod))
 		try:
-			for mod_info in topol_info:
-				if mod_info[1] == -1:
-					raise ValueError("Circle structure exist in the topology.")
-		except Exception as e:
-			raise e
-		else:
-			self.organized = temp_organized
+			self.add_edges(edges)
+		except ValueError:
+			del self.levels[0][mod]
+			del self.preds[mod], self.succs[mod], self.level[mod]
+			raise
+		for obj in mod.inlist:
+			self.consumers.setdefault(obj, []).append(mod)
+		for resp in mod.outlist:
+			if self.connects(resp):
+				self.producers.setdefault(resp, []).append(mod)
+
+	def remove_module(self, mod):
+		'''
+		Remove a module from the organized graph.
+		'''
+		self.invalidate(mod)
+		for obj in mod.inlist:
+			self.consumers[obj].remove(mod)
+		for resp in mod.outlist:
+			if self.connects(resp):
+				self.producers[resp].remove(mod)
+		successors = list(self.succs[mod])
+		for pred in list(self.preds[mod]):
+			del self.succs[pred][mod]
+		for succ in successors:
+			del self.preds[succ][mod]
+		del self.levels[self.level[mod]][mod]
+		del self.preds[mod], self.succs[mod], self.level[mod]
+		self.update_levels(successors)
+
+	def inlist_added(self, mod, obj):
+		'''
+		Update the organized graph for obj added to mod.inlist, called by Module.add_inlist().
+		'''
+		if self.levels is None:
+			return
+		self.add_edges([(pred, mod) for pred in self.producers.get(obj, ())])
+		self.consumers.setdefault(obj, []).append(mod)
+
+	def inlist_removed(self, mod, obj):
+		'''
+		Update the organized graph for obj removed from mod.inlist.
+		'''
+		if self.levels is None:
+			return
+		self.consumers[obj].remove(mod)
+		self.remove_edges([(pred, mod) for pred in self.producers.get(obj, ())])
+
+	def outlist_added(self, mod, resp):
+		'''
+		Update the organized graph for resp added to mod.outlist, called by Module.add_outlist().
+		'''
+		self.invalidate(mod)
+		if self.levels is None or not self.connects(resp):
+			return
+		self.add_edges([(mod, succ) for succ in self.consumers.get(resp, ())])
+		self.producers.setdefault(resp, []).append(mod)
+
+	def outlist_removed(self, mod, resp):
+		'''
+		Update the organized graph for resp removed from mod.outlist.
+		'''
+		self.invalidate(mod)
+		if self.levels is None or not self.connects(resp):
+			return
+		self.producers[resp].remove(mod)
+		self.remove_edges([(mod, succ) for succ in self.consumers.get(resp, ())])
+
+	def set_parallel(self, executor='thread', workers=None, schedule='level'):
+		'''
+		Configure the concurrent execution of run_proc().
+
+		Parameters
+		----------
+		executor : str or None
+			'thread' or 'process', None to run the modules one after another.
+			With 'process' the portals must be registered when optkit is imported in the workers.
+		workers : int or None
+			the number of workers, None lets the executor decide
+		schedule : str
+			'level' or 'dag', see run_proc()
+		'''
+		if not (executor is None or executor in executors):
+			raise ValueError("Parameter executor must be None or one of {}.".format(list(executors)))
+		if not schedule in schedules:
+			raise ValueError("Parameter schedule must be one of {}.".format(schedules))
+		self.close()
+		self.executor = executor
+		self.workers = workers
+		self.schedule = schedule
+
+	def get_pool(self):
+		'''
+		Return the pool of the executor, create it if necessary.
+		'''
+		if self.pool is None:
+			self.pool = executors[self.executor](max_workers=self.workers)
+		return self.pool
+
+	def close(self):
+		'''
+		Shut the pool of the executor down.
+		'''
+		if not self.pool is None:
+			self.pool.shutdown(wait=True)
+			self.pool = None
 
 	def run_proc(self):
 		'''
 		Run every module in the process.
+		Without an executor, the modules are run one after another in the organized order.
+		With an executor (see set_parallel()), the modules are computed on its workers and their
+		outputs are stored in the current process:
+			'level' : the modules of each level of organized run concurrently, the next level starts
+				when the whole level is done
+			'dag' : a module starts as soon as the modules producing its inputs are done
+		The run fails fast: on the first error the modules not started are cancelled, the running
+		ones are waited for, and the error is raised.
+
+		If reuse is True, a module whose inlist values and portal are the same as in its last
+		run is not run again, its cached outputs are stored instead. So only the modules
+		downstream of the changed variables and responses are run.
 		
 		Returns
 		-------
@@ -219,7 +612,158 @@ class Process(Node):
 		'''
 		if self.organized == []:
 			raise ValueError("Process is not organized yet.")
+		self.executed = []
+		if self.executor is None:
+			for step in self.organized:
+				for mod in step:
+					if not self.reuse_outputs(mod):
+						self.store_outputs(mod, mod.compute())
+		elif self.schedule == 'level':
+			self.run_levels()
+		else:
+			self.run_dag()
+		return self.evaluate()
+
+	def signature(self, mod):
+		'''
+		Return what the outputs of mod depend on: its portal and the values of its inlist.
+		'''
+		return (mod.portal, tuple(obj.value for obj in mod.inlist))
+
+	def reuse_outputs(self, mod):
+		'''
+		Store the cached outputs of mod if its signature has not changed since its last run.
+
+		Returns
+		-------
+		reused : bool
+		'''
+		if not self.reuse or not mod in self.outputs:
+			return False
+		key, results = self.outputs[mod]
+		if not key == self.signature(mod):
+			return False
+		mod.store(results)
+		return True
+
+	def store_outputs(self, mod, results):
+		'''
+		Store the outputs of a run of mod and cache them.
+		'''
+		mod.store(results)
+		self.outputs[mod] = (self.signature(mod), results)
+		self.executed.append(mod)
+
+	def invalidate(self, mod=None):
+		'''
+		Drop the cached outputs of mod, or of every module if mod is None, so they are run again.
+		'''
+		if mod is None:
+			self.outputs = {}
+		else:
+			self.outputs.pop(mod, None)
+
+	def run_levels(self):
+		'''
+		Run the levels of organized one after another, the modules of a level concurrently.
+		'''
+		pool = self.get_pool()
 		for step in self.organized:
-			for mod in step:
-				mod.execute()
-		return evaluate()##################
+			futures = {pool.submit(mod.compute) : mod for mod in step if not self.reuse_outputs(mod)}
+			done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+			for future in done:
+				if not future.exception() is None:
+					for f in pending:
+						f.cancel()
+					wait(pending)
+					raise future.exception()
+			for future, mod in futures.items():
+				self.store_outputs(mod, future.result())
+
+	def run_dag(self):
+		'''
+		Run every module as soon as the modules producing its inputs are done.
+		'''
+		modules = [mod for step in self.organized for mod in step]
+		indegree = {mod : len(self.preds[mod]) for mod in modules}
+		pool = self.get_pool()
+		futures = {}
+		# ready : the modules whose predecessors are done, a reused module is done at once
+		ready = deque(mod for mod in modules if indegree[mod] == 0)
+		while ready or futures:
+			while ready:
+				mod = ready.popleft()
+				if self.reuse_outputs(mod):
+					for succ in self.succs[mod]:
+						indegree[succ] -= 1
+						if indegree[succ] == 0:
+							ready.append(succ)
+				else:
+					futures[pool.submit(mod.compute)] = mod
+			if not futures:
+				break
+			done, _ = wait(futures, return_when=FIRST_COMPLETED)
+			for future in done:
+				mod = futures.pop(future)
+				if not future.exception() is None:
+					for f in futures:
+						f.cancel()
+					wait(futures)
+					raise future.exception()
+				self.store_outputs(mod, future.result())
+				for succ in self.succs[mod]:
+					indegree[succ] -= 1
+					if indegree[succ] == 0:
+						ready.append(succ)
+
+	def evaluate(self):
+		'''
+		Combine the objectives output by the modules into the evaluation to be minimized:
+			evaluation = sum(weight * value) over the objectives to minimize
+					   - sum(weight * value) over the objectives to maximize
+
+		Returns
+		-------
+		evaluation : float
+		'''
+		evaluation = 0.0
+		for mod in self.modules:
+			for resp in mod.outlist:
+				if isinstance(resp, Objective):
+					if resp.option == 0:
+						evaluation += resp.weight * resp.value
+					else:
+						evaluation -= resp.weight * resp.value
+		return evaluation
+
+
+class ProcessObjective:
+	'''
+	The objective function obj_func(position) of a process, as used by the evaluators, e.g. the
+	WorkerServers of a DistributedEvaluator. The position is written to the value of each
+	variable, then the process is run. If the variables are views of one VariableSet, the
+	position is written to its value array in one operation.
+
+	Attributes
+	----------
+	proc : Process
+		the organized process to run
+	variables : list of Variable
+		the variables in the order of the position, constants excluded
+	variable_set : VariableSet or None
+		the set of the variables, see VariableSet.locate()
+	indices : ndarray of int or None
+		the index of each variable in variable_set
+	'''
+	def __init__(self, proc, variables):
+		self.proc = proc
+		self.variables = variables
+		self.variable_set, self.indices = VariableSet.locate(variables)
+
+	def __call__(self, position):
+		if self.variable_set is None:
+			for var, value in zip(self.variables, position):
+				var.value = value
+		else:
+			self.variable_set.value[self.indices] = position
+		return self.proc.run_proc()
@@ -4,15 +4,16 @@ Run(), check_validity() check the validity of whole proj before run.
 Define class Project, the highest hierarchy of the workflow.
 '''
 import os
-from queue import Queue
-from . import Node, Variable, Response, Module, Process
+from . import Node, Variable, Response, Module, Process, ProcessObjective
 
 class Project(Node):
+	__slots__ = ('variables', 'responses', 'processes', 'directory', 'names', 'proc_names')
+
 	def __init__(self, 
 				 name='untitled',
-				 variables=[],
-				 responses=[],
-				 processes=[],
+				 variables=None,
+				 responses=None,
+				 processes=None,
 				 directory=''):
 		'''
 		Initiate class Project.
@@ -33,7 +34,14 @@ class Project(Node):
 			the processes of the project
 		directory : str
 			the work directory of the project (eg: X:\\...\\{name})
+		names : dict
+			{name} : Variable or Response, the variables and responses share one namespace
+		proc_names : dict
+			{name} : Process
 		'''
+		variables = [] if variables is None else variables
+		responses = [] if responses is None else responses
+		processes = [] if processes is None else processes
 		super(Project, self).__init__([*variables, *responses, *processes], True)
 		self.name = str(name)
 		self.variables = variables
@@ -41,19 +49,34 @@ class Project(Node):
 		self.processes = processes
 		self.directory = directory
 		self.validator()
+		self.names = {}
+		self.proc_names = {}
+		for obj in [*variables, *responses]:
+			if obj.name in self.names:
+				raise ValueError("Name already exists.")
+			self.names[obj.name] = obj
+		for proc in processes:
+			if proc.name in self.proc_names:
+				raise ValueError("Process's name must be unique.")
+			self.proc_names[proc.name] = proc
 
 	def __str__(self):
-		str_self = self.name + '\t' + self.directory + '\n'
-		str_vars = 'variables:\n'
+		return ''.join(self.lines())
+
+	def lines(self):
+		'''
+		Yield the lines of the project file one by one, see utils.file.save().
+		'''
+		yield self.name + '\t' + self.directory + '\n'
+		yield 'variables:\n'
 		for var in self.variables:
-			str_vars += var.__str__() + '\n'
-		str_resps = 'responses:\n'
+			yield var.__str__() + '\n'
+		yield 'responses:\n'
 		for resp in self.responses:
-			str_resps += resp.__str__() + '\n'
-		str_procs = 'processes:\n'
+			yield resp.__str__() + '\n'
+		yield 'processes:\n'
 		for proc in self.processes:
-			str_procs += proc.__str__() 
-		return (str_self + str_vars + str_resps + str_procs)
+			yield from proc.lines()
 
 	def validator(self):
 		'''
@@ -80,40 +103,138 @@ class Project(Node):
 	
 	def whether_changed(self):
 		'''
-		Check whether the project has been changed.
-		Use BFS to search the tree.
+		Check whether the project has been changed. O(1), see Node.change_flag().
 
 		Return
 		------
 		changed : bool
 		'''
-		q = Queue()
-		q.put(self)
-		changed = False
-		while not q.empty():
-			node = q.get()
-			if node.changedFlag == True:
-				changed = True
-				break
-			else:
-				if not node.child == None:
-					for i in node.child:
-						q.put(i)
-		return changed
+		return self.changedFlag
 
 	def flags2False(self):
 		'''
 		Turn the changedFlag of all nodes on the workflow tree to False.
-		Use BFS to search the tree.
+		Only the changed subtrees are visited, see Node.clear_flags().
+		'''
+		self.clear_flags()
+
+	def changed_nodes(self):
+		'''
+		Return the nodes changed since the last flags2False(), e.g. for a save to write only
+		what changed. The changed variables, responses and processes are in self.dirty.
+
+		Returns
+		-------
+		nodes : list of Node
+		'''
+		return self.dirty_nodes()
+
+	def adopt(self, node, nodes):
+		'''
+		Append node to nodes (variables, responses or processes) and to the children.
+		'''
+		nodes.append(node)
+		self.child.append(node)
+		self.link_child(node)
+
+	def abandon(self, node, nodes):
+		'''
+		Remove node from nodes (variables, responses or processes) and from the children.
+		'''
+		nodes.remove(node)
+		self.child.remove(node)
+		self.unlink_child(node)
+
+	def find(self, name):
+		'''
+		Return the variable or response of the name, None if there is none. O(1).
+		'''
+		return self.names.get(name)
+
+	def find_proc(self, name):
+		'''
+		Return the process of the name, None if there is none. O(1).
+		'''
+		return self.proc_names.get(name)
+
+	def owns(self, obj):
+		'''
+		Whether obj is a variable, response or process of the project. O(1).
+		'''
+		if isinstance(obj, Process):
+			return self.proc_names.get(obj.name) is obj
+		return self.names.get(obj.name) is obj
+
+	def check_rename(self, node, name):
+		'''
+		Called by Node.rename() before a child is renamed.
+
+		Raises
+		------
+		ValueError
+			When the name is used by another node.
+		'''
+		if isinstance(node, Process):
+			if not self.proc_names.get(name, node) is node:
+				raise ValueError("Process's name must be unique.")
+		elif not self.names.get(name, node) is node:
+			raise ValueError("Name already exists.")
+
+	def renamed(self, node, old_name):
+		'''
+		Called by Node.rename() after a child is renamed.
+		'''
+		index = self.proc_names if isinstance(node, Process) else self.names
+		del index[old_name]
+		index[node.name] = node
+
+	def add_many(self, variables=(), responses=(), processes=()):
 		'''
-		q = Queue()
-		q.put(self)
-		while not q.empty():
-			node = q.get()
-			node.changedFlag = False
-			if not node.child == None:
-				for i in node.child:
-					q.put(i)
+		Add variables, responses and processes in one pass. Everything is validated before
+		anything is added. O(n) in total.
+
+		Parameters
+		----------
+		variables : list of Variable
+		responses : list of Response
+		processes : list of Process
+
+		Raises
+		------
+		TypeError
+			When an element is not of the type of its list.
+		ValueError
+			When a name is already used, by the project or by another element.
+		'''
+		try:
+			names = set()
+			for objs, cls in [(variables, Variable), (responses, Response)]:
+				for obj in objs:
+					if not isinstance(obj, cls):
+						raise TypeError(obj, "is not of type {}.".format(cls.__name__))
+					if obj.name in self.names or obj.name in names:
+						raise ValueError("Name already exists.")
+					names.add(obj.name)
+			proc_names = set()
+			for proc in processes:
+				if not isinstance(proc, Process):
+					raise TypeError(proc, "is not of type Process.")
+				if proc.name in self.proc_names or proc.name in proc_names:
+					raise ValueError("Process's name must be unique.")
+				proc_names.add(proc.name)
+		except Exception as e:
+			raise e
+		else:
+			for var in variables:
+				self.adopt(var, self.variables)
+				self.names[var.name] = var
+			for resp in responses:
+				self.adopt(resp, self.responses)
+				self.names[resp.name] = resp
+			for proc in processes:
+				self.adopt(proc, self.processes)
+				self.proc_names[proc.name] = proc
+			self.change_flag()
 
 	def add_var(self, var):
 		'''
@@ -131,26 +252,12 @@ class Project(Node):
 		ValueError
 			When var's name is already used.
 		'''
-		try:
-			if isinstance(var, Variable):
-				for cur_var in self.variables:
-					if var.name == cur_var.name:
-						raise ValueError("Name already exists.")
-				self.variables.append(var)
-			elif isinstance(var, list):
-				for v in var:
-					if not isinstance(v, Variable):
-						raise TypeError(v, "is not of type Variable.")
-					for cur_var in self.variables:
-						if var.name == cur_var.name:
-							raise ValueError("Name already exists.")
-					self.variables.append(var)
-			else:
-				raise TypeError(var, "must be of type Variable or list of Variable.")
-		except Exception as e:
-			raise e
+		if isinstance(var, Variable):
+			self.add_many(variables=[var])
+		elif isinstance(var, list):
+			self.add_many(variables=var)
 		else:
-			self.changedFlag = True
+			raise TypeError(var, "must be of type Variable or list of Variable.")
 
 	def del_var(self, var):
 		'''
@@ -167,15 +274,16 @@ class Project(Node):
 			When var is not in variables.
 		'''
 		try:
-			if not var in self.variables:
+			if not (isinstance(var, Variable) and self.owns(var)):
 				raise ValueError("Variable not found.")
 			else:
-				self.variables.remove(var)
+				self.abandon(var, self.variables)
+				del self.names[var.name]
 		except Exception as e:
 			raise e
 		else:
 			print('deleted ', var)
-			self.changedFlag = True
+			self.change_flag()
 
 	def edit_var(self, var, **kwargs):
 		'''
@@ -196,21 +304,14 @@ class Project(Node):
 			Check Variable.edit()
 		'''
 		try:
-			if not var in self.variables:
+			if not (isinstance(var, Variable) and self.owns(var)):
 				raise ValueError("Variable not found.")
 			else:
-				if 'name' in kwargs:
-					for v in self.variables:
-						if v.name == kwargs['name']:
-							raise ValueError("Name already exists.")
-					for r in self.responses:
-						if r.name == kwargs['name']:
-							raise ValueError("Name already exists.")
-				self.variables[self.variables.index(var)].edit(**kwargs)
+				var.edit(**kwargs)
 		except Exception as e:
 			raise e
 		else:
-			self.changedFlag = True
+			self.change_flag()
 
 	def add_resp(self, resp):
 		'''
@@ -228,26 +329,12 @@ class Project(Node):
 		ValueError
 			When resp's name is already used.
 		'''
-		try:
-			if isinstance(resp, Response):
-				for cur_resp in self.responses:
-					if resp.name == cur_resp.name:
-						raise ValueError("Name already exists.")
-				self.responses.append(resp)
-			elif isinstance(resp, list):
-				for r in resp:
-					if not isinstance(r, Response):
-						raise TypeError(r, "is not of type Response.")
-					for cur_resp in self.responses:
-						if r.name == cur_resp.name:
-							raise ValueError("Name already exists.")
-					self.responses.append(resp)
-			else:
-				raise TypeError(resp, "must be of type Response or list of Response.")
-		except Exception as e:
-			raise e
+		if isinstance(resp, Response):
+			self.add_many(responses=[resp])
+		elif isinstance(resp, list):
+			self.add_many(responses=resp)
 		else:
-			self.changedFlag = True
+			raise TypeError(resp, "must be of type Response or list of Response.")
 
 	def del_resp(self, resp):
 		'''
@@ -264,15 +351,16 @@ class Project(Node):
 			When resp is not in responses.
 		'''
 		try:
-			if not resp in self.responses:
+			if not (isinstance(resp, Response) and self.owns(resp)):
 				raise ValueError("Response not found.")
 			else:
-				self.responses.remove(resp)
+				self.abandon(resp, self.responses)
+				del self.names[resp.name]
 		except Exception as e:
 			raise e
 		else:
 			print('deleted ', resp)
-			self.changedFlag = True
+			self.change_flag()
 
 	def edit_resp(self, resp, **kwargs):
 		'''
@@ -293,21 +381,14 @@ class Project(Node):
 			Check Response.edit()
 		'''
 		try:
-			if not resp in self.responses:
+			if not (isinstance(resp, Response) and self.owns(resp)):
 				raise ValueError("Response not found.")
 			else:
-				if 'name' in kwargs:
-					for r in self.responses:
-						if r.name == kwargs['name']:
-							raise ValueError("Name already exists.")
-					for v in self.variables:
-						if v.name == kwargs['name']:
-							raise ValueError("Name already exists.")
-				self.responses[self.responses.index(resp)].edit(**kwargs)
+				resp.edit(**kwargs)
 		except Exception as e:
 			raise e
 		else:
-			self.changedFlag = True
+			self.change_flag()
 
 	def add_proc(self, proc):
 		'''
@@ -325,26 +406,12 @@ class Project(Node):
 		ValueError
 			When proc's name already exists in processes.
 		'''
-		try:
-			if isinstance(proc, Process):
-				for p in self.processes:
-					if p.name == proc.name:
-						raise ValueError("Process's name must be unique.")
-				self.processes.append(proc)
-			elif isinstance(proc, list):
-				for p in proc:
-					if not isinstance(p, Process):
-						raise TypeError(p, "is not of type Process.")
-					for cur_proc in self.processes:
-						if p.name == cur_proc.name:
-							raise ValueError("Name already exists.")
-					self.processes.append(p)
-			else:
-				raise TypeError(proc, "must be of type Process or list of Process.")
-		except Exception as e:
-			raise e
+		if isinstance(proc, Process):
+			self.add_many(processes=[proc])
+		elif isinstance(proc, list):
+			self.add_many(processes=proc)
 		else:
-			self.changedFlag = True
+			raise TypeError(proc, "must be of type Process or list of Process.")
 
 	def del_proc(self, proc):
 		'''
@@ -361,15 +428,16 @@ class Project(Node):
 			When proc is not in processes.
 		'''
 		try:
-			if not proc in self.processes:
+			if not (isinstance(proc, Process) and self.owns(proc)):
 				raise ValueError("Parameter proc not in processes.")
 			else:
-				self.processes.remove(proc)
+				self.abandon(proc, self.processes)
+				del self.proc_names[proc.name]
 		except Exception as e:
 			raise e
 		else:
 			print("deleted ", proc)
-			self.changedFlag = True
+			self.change_flag()
 
 	def edit_proc(self, proc, **kwargs):
 		'''
@@ -388,20 +456,16 @@ class Project(Node):
 			When proc is not in processes.
 		'''
 		try:
-			if not proc in self.processes:
+			if not (isinstance(proc, Process) and self.owns(proc)):
 				raise ValueError("Process not found.")
 			else:
-				if 'name' in kwargs:
-					for p in self.processes:
-						if p.name == kwargs['name']:
-							raise ValueError("Process's name must be unique.")
-				self.processes[self.processes.index(proc)].edit(**kwargs)
+				proc.edit(**kwargs)
 		except Exception as e:
 			raise e
 		else:
-			self.changedFlag = True
+			self.change_flag()
 	
-	def run_opt(self, proc, method, **kwargs):
+	def run_opt(self, proc, method, iterations, evaluator=None, **kwargs):
 		'''
 		Run every module in the process.
 
@@ -411,21 +475,32 @@ class Project(Node):
 			the process to run
 		method : str
 			the algorithm to do the optimization
+		iterations : int
+			the number of iterations of the algorithm
+		evaluator : SerialEvaluator or None
+			the evaluator which runs the process for every design point, e.g. a
+			DistributedEvaluator whose WorkerServers serve ProcessObjective(proc, variables).
+			If None, the process is run in the current process.
 		**kwargs
 			the algorithm parameters
 		'''
+		from ..algorithm.PSO import PSO_Optimizer
 		# check process's validity and organize the process
-		if not proc in self.processes:
+		if not self.owns(proc):
 			raise ValueError("Process not found.")
 		for mod in proc.modules:
 			for in_obj in mod.inlist:
-				if not (in_obj in self.variables or in_obj in self.responses):
+				if not self.owns(in_obj):
 					raise ValueError("Module {}'s inlist contains invalid object.".format(mod.name))
 			for out_obj in mod.outlist:
-				if not out_obj in self.responses:
+				if not (isinstance(out_obj, Response) and self.owns(out_obj)):
 					raise ValueError("Module {}'s outlist contains invalid object.".format(mod.name))
-		proc.organize()
+		proc.organize(self.responses)
 		# create an instance of the optimizer
 		if method == 'PSO':
-			optimizer = PSO_Optimizer(variables=, **kwargs)
-			optimizer.optimize(proc.run_proc, **kwargs)
\ No newline at end of file
+			optimizer = PSO_Optimizer(variables=self.variables, **kwargs)
+			if evaluator is None:
+				optimizer.optimize(iterations, proc.run_proc)
+			else:
+				optimizer.optimize(iterations, ProcessObjective(proc, optimizer.var_list), evaluator=evaluator)
+			return optimizer
@@ -4,6 +4,8 @@ Define parent class Response and subclass Objective, Constraint and Monitored.
 from . import Node
 
 class Response(Node):
+	__slots__ = ('description', 'value')
+
 	def __init__(self, name, description=''):
 		'''
 		Initiate parent class Response.
@@ -14,10 +16,13 @@ class Response(Node):
 			the name of the response
 		description : str
 			the description of the response
+		value : float or None
+			the value of the response, set by the module which outputs it
 		'''
 		super(Response, self).__init__(None, True)
 		self.name = str(name)
 		self.description = str(description)
+		self.value = None
 	
 	def edit(self, **kwargs):
 		'''
@@ -25,14 +30,18 @@ class Response(Node):
 		'''
 		try:
 			if 'name' in kwargs:
-				self.name = str(kwargs['name'])
+				self.rename(str(kwargs['name']))
 			if 'description' in kwargs:
 				self.description = str(kwargs['description'])
 		except Exception as e:
 			raise e
+		else:
+			self.change_flag()
 
 
 class Objective(Response):
+	__slots__ = ('option', 'weight')
+
 	def __init__(self, name, option=0, weight=1.0, description=''):
 		'''
 		Initiate the subclass Objective
@@ -106,6 +115,8 @@ class Objective(Response):
 
 
 class Constraint(Response):
+	__slots__ = ('resp_min', 'resp_max')
+
 	def __init__(self, name, resp_min, resp_max, description=''):
 		'''
 		Initiate the subclass Constraint
@@ -188,6 +199,8 @@ class Constraint(Response):
 
 
 class Monitored(Response):
+	__slots__ = ()
+
 	def __init__(self, name, description=''):
 		super(Monitored, self).__init__(name, description)
 
@@ -1,9 +1,20 @@
 '''
 Define parent class Variable and subclass Continuous, Discrete and Constant.
 '''
+import numbers
 from . import Node
 
+def is_real(value):
+	'''
+	Check whether value is a real number: float, int, or a numpy scalar of them.
+	'''
+	# the ABC check is slow, the built-in types are checked first
+	return isinstance(value, (float, int)) or isinstance(value, numbers.Real)
+
+
 class Variable(Node):
+	__slots__ = ('_value', 'description')
+
 	def __init__(self, name, value, description=''):
 		'''
 		Initiate parent class Variable.
@@ -15,28 +26,42 @@ class Variable(Node):
 		description : str
 			The description of the variable.
 		value : float
-			The value of the variable.
+			The value of the variable, a real number e.g. float, int or a numpy scalar.
 		'''
 		super(Variable, self).__init__(None, True)
 		self.name = str(name)
 		self.value = value
 		self.description = str(description)
 
+	@property
+	def value(self):
+		return self._value
+
+	@value.setter
+	def value(self, value):
+		# is_real() inlined, the optimizer writes the values of every particle
+		if not (isinstance(value, (float, int)) or isinstance(value, numbers.Real)):
+			raise TypeError("Parameter value must be a float or int.")
+		self._value = value
+
 	def edit(self, **kwargs):
 		'''
 		Allow edition of name and description.
 		'''
 		try:
 			if 'name' in kwargs:
-				self.name = str(kwargs['name'])
+				self.rename(str(kwargs['name']))
 			if 'description' in kwargs:
 				self.description = str(kwargs['description'])
 		except Exception as e:
 			raise e
+		else:
+			self.change_flag()
 
 
 class Continuous(Variable):
-	
+	__slots__ = ('var_range', 'baseline', 'resolution')
+
 	def __init__(self, name, var_range, baseline, resolution, description=''):
 		'''
 		Initiate subclass Continuous.
@@ -50,7 +75,7 @@ class Continuous(Variable):
 		baseline : float
 			Base design value for the variable.
 		resolution : int
-			Resolution of the continuous variable.
+			Resolution of the continuous variable, the number of grid steps over var_range, at least 1.
 		description : str
 			The description of the variable.
 		'''
@@ -88,13 +113,14 @@ class Continuous(Variable):
 		ValueError
 			When var_range[0] is not smaller than var_range[1].
 		'''
-		if not isinstance(self.var_range, tuple):
+		var_range = self.var_range
+		if not isinstance(var_range, tuple):
 			raise TypeError("Continuous variable's range must be a tuple.")
-		if not len(self.var_range) == 2:
+		if not len(var_range) == 2:
 			raise IndexError("Continuous variable's range must be of size 2.")
-		if not (isinstance(self.var_range[0], (float, int)) and isinstance(self.var_range[1], (float, int))):
+		if not (is_real(var_range[0]) and is_real(var_range[1])):
 			raise TypeError("Continuous variable's range must be a tuple of float or int.")
-		if not self.var_range[0] < self.var_range[1]:
+		if not var_range[0] < var_range[1]:
 			raise ValueError("Value of var_range[0] must be smaller than var_range[1].")
 	
 	def validator_baseline(self):
@@ -110,11 +136,13 @@ class Continuous(Variable):
 		ValueError
 			When baseline is 0.
 		'''
-		if not isinstance(self.baseline, (float, int)):
+		baseline = self.baseline
+		var_range = self.var_range
+		if not is_real(baseline):
 			raise TypeError("Parameter baseline must be a float or int.")
-		if not (self.baseline >= self.var_range[0] and self.baseline <= self.var_range[1]):
+		if not (baseline >= var_range[0] and baseline <= var_range[1]):
 			raise IndexError("Baseline is out of range.")
-		if self.baseline == 0:
+		if baseline == 0:
 			raise ValueError("Baseline cannot be 0.")
 
 	def validator_resolution(self):
@@ -125,9 +153,13 @@ class Continuous(Variable):
 		------
 		TypeError
 			When resolution is not of type int.
+		ValueError
+			When resolution is smaller than 1.
 		'''
 		if not isinstance(self.resolution, int):
 			raise TypeError("Resolution must be int.")
+		if self.resolution < 1:
+			raise ValueError("Resolution must be at least 1.")
 
 	def edit(self, **kwargs):
 		try:
@@ -148,6 +180,8 @@ class Continuous(Variable):
 
 
 class Discrete(Variable):
+	__slots__ = ('var_range', 'baseline')
+
 	def __init__(self, name, var_range, baseline, description=''):
 		'''
 		Initiate subclass Discrete.
@@ -169,10 +203,7 @@ class Discrete(Variable):
 		self.validator()
 
 	def __str__(self):
-		str_range = '['
-		for i in range(len(self.var_range)-1):
-			str_range += str(self.var_range[i]) + ','
-		str_range += str(self. var_range[-1]) + ']'
+		str_range = '[' + ','.join(str(i) for i in self.var_range) + ']'
 		return (self.name + '\t' + 
 			    'Discrete' + '\t' + 
 			    str_range + '\t' +
@@ -200,7 +231,7 @@ class Discrete(Variable):
 		if not len(self.var_range) > 1:
 			raise IndexError("Discrete variable's range's size must be larger than 1.")
 		for k in self.var_range:
-			if not isinstance(k, (float,int)):
+			if not is_real(k):
 				raise TypeError("Discrete variable's range must be a list of float or int.")
 	
 	def validator_baseline(self):
@@ -216,7 +247,7 @@ class Discrete(Variable):
 		ValueError
 			When baseline is 0.
 		'''
-		if not isinstance(self.baseline, (float, int)):
+		if not is_real(self.baseline):
 			raise TypeError("Parameter baseline must be a float or int.")
 		if not self.baseline in self.var_range:
 			raise IndexError("Baseline is out of range.")
@@ -239,6 +270,8 @@ class Discrete(Variable):
 
 	
 class Constant(Variable):
+	__slots__ = ('baseline',)
+
 	def __init__(self, name, baseline, description=''):
 		'''
 		Initiate subclass Constant.
@@ -274,7 +307,7 @@ class Constant(Variable):
 		TypeError
 			When baseline is not of type float or int.
 		'''
-		if not isinstance(self.baseline, (float, int)):
+		if not is_real(self.baseline):
 			raise TypeError("Parameter baseline must be float or int.")
 
 	def edit(self, **kwargs):
@@ -0,0 +1,333 @@
+'''
+Define class VariableSet, the columnar store of many variables, and its views ContinuousView,
+DiscreteView and ConstantView.
+'''
+import numpy as np
+from . import Continuous, Discrete, Constant
+from .variable import is_real
+
+class VariableSet:
+	'''
+	A VariableSet Class
+
+	This class holds the numbers of its variables in contiguous NumPy arrays, one element per
+	variable. Its variables are views, instances of Continuous, Discrete and Constant whose
+	value, baseline, var_range and resolution are read from and written to the arrays, so they
+	are used like any other variable (in a Project, in the inlists of modules, by the parsers),
+	while an optimizer writes the values of all variables in one operation:
+		vset.value[indices] = position
+	The numbers are stored as float, the resolutions as int.
+
+	Attributes
+	----------
+	size : int
+		the number of variables
+	kind : ndarray of int8
+		the index of the class of each variable in KINDS
+	lower : ndarray of float
+		the minimum of each variable, the baseline for Constant
+	upper : ndarray of float
+		the maximum of each variable, the baseline for Constant
+	baseline : ndarray of float
+		the baseline of each variable
+	value : ndarray of float
+		the value of each variable
+	resolution : ndarray of int
+		the resolution of each Continuous variable, 0 for the others
+	sets : dict
+		{index} : list of float, the value set of each Discrete variable
+	views : list of Variable
+		the variables in order of their indices
+
+	The arrays are allocated with spare capacity, only their first size elements are in use.
+	'''
+	KINDS = (Continuous, Discrete, Constant)
+
+	def __init__(self, variables=None, capacity=0):
+		'''
+		Parameters
+		----------
+		variables : list of Variable or None
+			the variables to copy into the set, see add()
+		capacity : int
+			the number of variables to allocate space for
+		'''
+		self.size = 0
+		self.kind = np.zeros(0, dtype=np.int8)
+		self.lower = np.zeros(0)
+		self.upper = np.zeros(0)
+		self.baseline = np.zeros(0)
+		self.value = np.zeros(0)
+		self.resolution = np.zeros(0, dtype=np.int64)
+		self.sets = {}
+		self.views = []
+		self.reserve(max(capacity, 0 if variables is None else len(variables)))
+		if not variables is None:
+			for var in variables:
+				self.add(var)
+
+	def __len__(self):
+		return self.size
+
+	def __iter__(self):
+		return iter(self.views)
+
+	def __getitem__(self, index):
+		return self.views[index]
+
+	def reserve(self, capacity):
+		'''
+		Grow the arrays to hold at least capacity variables.
+		'''
+		if capacity <= len(self.value):
+			return
+		capacity = max(capacity, 2 * len(self.value))
+		for column in ('kind', 'lower', 'upper', 'baseline', 'value', 'resolution'):
+			old = getattr(self, column)
+			new = np.zeros(capacity, dtype=old.dtype)
+			new[:self.size] = old[:self.size]
+			setattr(self, column, new)
+
+	def append(self, kind, view_class, *args):
+		'''
+		Create a view of view_class in the next element of the arrays.
+		'''
+		self.reserve(self.size + 1)
+		index = self.size
+		self.kind[index] = kind
+		self.size += 1
+		try:
+			view = view_class(self, index, *args)
+		except Exception as e:
+			self.size -= 1
+			self.sets.pop(index, None)
+			raise e
+		self.views.append(view)
+		return view
+
+	def add_continuous(self, name, var_range, baseline, resolution, description=''):
+		'''
+		Add a continuous variable, see Continuous.
+
+		Returns
+		-------
+		var : ContinuousView
+		'''
+		return self.append(0, ContinuousView, name, var_range, baseline, resolution, description)
+
+	def add_discrete(self, name, var_range, baseline, description=''):
+		'''
+		Add a discrete variable, see Discrete.
+
+		Returns
+		-------
+		var : DiscreteView
+		'''
+		return self.append(1, DiscreteView, name, var_range, baseline, description)
+
+	def add_constant(self, name, baseline, description=''):
+		'''
+		Add a constant variable, see Constant.
+
+		Returns
+		-------
+		var : ConstantView
+		'''
+		return self.append(2, ConstantView, name, baseline, description)
+
+	def add(self, var):
+		'''
+		Add a copy of the variable.
+
+		Parameters
+		----------
+		var : Continuous, Discrete or Constant
+
+		Returns
+		-------
+		view : Variable
+			the view of the copy, its value is the value of var
+		'''
+		if isinstance(var, Continuous):
+			view = self.add_continuous(var.name, var.var_range, var.baseline, var.resolution, var.description)
+		elif isinstance(var, Discrete):
+			view = self.add_discrete(var.name, var.var_range, var.baseline, var.description)
+		elif isinstance(var, Constant):
+			view = self.add_constant(var.name, var.baseline, var.description)
+		else:
+			raise TypeError("Parameter var must be of type Continuous, Discrete or Constant.")
+		view.value = var.value
+		return view
+
+	def values(self):
+		'''
+		Return the values of all variables, a view of the array.
+		'''
+		return self.value[:self.size]
+
+	@staticmethod
+	def locate(variables):
+		'''
+		Find the set and the indices of the variables, so their values can be written at once.
+
+		Parameters
+		----------
+		variables : list of Variable
+
+		Returns
+		-------
+		vset : VariableSet or None
+			the set of the variables, None if they are not all views of one set
+		indices : ndarray of int or None
+			the index of each variable in vset
+		'''
+		vset = None
+		indices = np.empty(len(variables), dtype=np.int64)
+		for i, var in enumerate(variables):
+			owner = getattr(var, 'variable_set', None)
+			if owner is None or not (vset is None or owner is vset):
+				return None, None
+			vset = owner
+			indices[i] = var.index
+		return vset, indices
+
+
+def column_property(column):
+	'''
+	Return the property of the element of a view in the column of its set.
+	'''
+	def fget(self):
+		return getattr(self.variable_set, column).item(self.index)
+
+	def fset(self, value):
+		if not is_real(value):
+			raise TypeError("Parameter {} must be a float or int.".format(column))
+		getattr(self.variable_set, column)[self.index] = value
+
+	return property(fget, fset)
+
+def resolution_property():
+	'''
+	Return the property resolution of a view, which must be an int.
+	'''
+	def fget(self):
+		return self.variable_set.resolution.item(self.index)
+
+	def fset(self, resolution):
+		if not isinstance(resolution, int):
+			raise TypeError("Resolution must be int.")
+		self.variable_set.resolution[self.index] = resolution
+
+	return property(fget, fset)
+
+def bound_property():
+	'''
+	Return the property var_range of a view, stored in the columns lower and upper.
+	'''
+	def fget(self):
+		return (self.variable_set.lower.item(self.index), self.variable_set.upper.item(self.index))
+
+	def fset(self, var_range):
+		if not isinstance(var_range, tuple):
+			raise TypeError("Continuous variable's range must be a tuple.")
+		if not len(var_range) == 2:
+			raise IndexError("Continuous variable's range must be of size 2.")
+		if not (is_real(var_range[0]) and is_real(var_range[1])):
+			raise TypeError("Continuous variable's range must be a tuple of float or int.")
+		self.variable_set.lower[self.index] = var_range[0]
+		self.variable_set.upper[self.index] = var_range[1]
+
+	return property(fget, fset)
+
+
+class ContinuousView(Continuous):
+	'''
+	A continuous variable stored in a VariableSet.
+
+	Attributes
+	----------
+	variable_set : VariableSet
+		the set which stores the variable
+	index : int
+		the index of the variable in the arrays of the set
+	See Continuous for the other attributes.
+	'''
+	__slots__ = ('variable_set', 'index')
+	value = column_property('value')
+	baseline = column_property('baseline')
+	var_range = bound_property()
+	resolution = resolution_property()
+
+	def __init__(self, variable_set, index, name, var_range, baseline, resolution, description=''):
+		self.variable_set = variable_set
+		self.index = index
+		super(ContinuousView, self).__init__(name, var_range, baseline, resolution, description)
+
+
+class DiscreteView(Discrete):
+	'''
+	A discrete variable stored in a VariableSet, its value set is kept in the sets of the
+	VariableSet and its minimum and maximum in the arrays lower and upper.
+
+	Attributes
+	----------
+	variable_set : VariableSet
+		the set which stores the variable
+	index : int
+		the index of the variable in the arrays of the set
+	See Discrete for the other attributes.
+	'''
+	__slots__ = ('variable_set', 'index')
+	value = column_property('value')
+	baseline = column_property('baseline')
+
+	def __init__(self, variable_set, index, name, var_range, baseline, description=''):
+		self.variable_set = variable_set
+		self.index = index
+		super(DiscreteView, self).__init__(name, var_range, baseline, description)
+
+	@property
+	def var_range(self):
+		return self.variable_set.sets[self.index]
+
+	@var_range.setter
+	def var_range(self, var_range):
+		self.variable_set.sets[self.index] = var_range
+		# any other range is rejected by validator_range()
+		if isinstance(var_range, list) and var_range and all(is_real(k) for k in var_range):
+			self.variable_set.lower[self.index] = min(var_range)
+			self.variable_set.upper[self.index] = max(var_range)
+
+
+class ConstantView(Constant):
+	'''
+	A constant variable stored in a VariableSet, its bounds in the arrays lower and upper
+	follow its baseline.
+
+	Attributes
+	----------
+	variable_set : VariableSet
+		the set which stores the variable
+	index : int
+		the index of the variable in the arrays of the set
+	See Constant for the other attributes.
+	'''
+	__slots__ = ('variable_set', 'index')
+	value = column_property('value')
+
+	def __init__(self, variable_set, index, name, baseline, description=''):
+		self.variable_set = variable_set
+		self.index = index
+		super(ConstantView, self).__init__(name, baseline, description)
+
+	@property
+	def baseline(self):
+		return self.variable_set.baseline.item(self.index)
+
+	@baseline.setter
+	def baseline(self, baseline):
+		if not is_real(baseline):
+			raise TypeError("Parameter baseline must be float or int.")
+		self.variable_set.baseline[self.index] = baseline
+		self.variable_set.lower[self.index] = baseline
+		self.variable_set.upper[self.index] = baseline
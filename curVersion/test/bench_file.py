@@ -0,0 +1,194 @@
+'''
+Benchmark utils.file on a project of 100k variables: the streaming save and the single-pass
+open_proj against the string concatenation of Project.__str__ and the readline parser with the
+linear name search, and check that save -> open -> save reproduces the file.
+Then load the same project from the binary data.npz, and its variable columns only, and compare
+the full save of a one-field edit with the journal save of it. The last module has a timeout,
+so the conversions check that it survives both formats.
+The legacy open is quadratic in the number of names, it is timed on a project of LEGACY_VARIABLES.
+
+Run from the repository root:
+	python -m curVersion.test.bench_file
+'''
+import gc
+import os
+import time
+import tempfile
+from ..optkit.workflow import Continuous, Discrete, Constant, Objective, Monitored, Module, Process, Project
+from ..optkit.utils import file
+from ..optkit.utils.file import parse_var, parse_resp, parse_proc, parse_description
+from ..optkit.utils.binfile import read_columns
+from ..optkit.utils.file import Journal
+
+VARIABLES = 100000
+RESPONSES = 1000
+MODULES = 1000
+LEGACY_VARIABLES = 10000
+
+def build(n_variables):
+	variables = []
+	for i in range(n_variables):
+		if i % 3 == 0:
+			variables.append(Continuous('var' + str(i), (-32.0, 32.0), 1.0, 100, 'continuous'))
+		elif i % 3 == 1:
+			variables.append(Discrete('var' + str(i), [1.0, 2.0, 3.0, 4.0], 2.0, 'discrete'))
+		else:
+			variables.append(Constant('var' + str(i), 5.0, 'constant'))
+	responses = [Monitored('resp' + str(i), 'monitored') for i in range(RESPONSES - 1)]
+	responses.append(Objective('obj', 0, 1.0, 'objective'))
+	step = n_variables // MODULES
+	modules = [Module('mod' + str(i), 'General', variables[i * step:(i + 1) * step], [responses[i]], 'module')
+			   for i in range(MODULES - 1)]
+	modules.append(Module('final', 'General', responses[:-1], [responses[-1]], 'final', timeout=30.0))
+	proc = Process('proc', modules, 'process')
+	return Project('bench', variables, responses, [proc], '')
+
+def legacy_str(proj):
+	'''
+	Project.__str__ before the line generators: one string grown by concatenation.
+	'''
+	str_self = proj.name + '\t' + proj.directory + '\n'
+	str_vars = 'variables:\n'
+	for var in proj.variables:
+		str_vars += var.__str__() + '\n'
+	str_resps = 'responses:\n'
+	for resp in proj.responses:
+		str_resps += resp.__str__() + '\n'
+	str_procs = 'processes:\n'
+	for proc in proj.processes:
+		str_proc = proc.name + '\t' + str(len(proc.modules)) + '\t' + proc.description + '\n'
+		for mod in proc.modules:
+			str_proc += mod.__str__() + '\n'
+		str_procs += str_proc
+	return str_self + str_vars + str_resps + str_procs
+
+def legacy_parse_mod(line, objects):
+	'''
+	parse_mod with a linear search of every name in the variables and responses.
+	'''
+	info = line.split('\t')
+	inlist = []
+	for name in info[2][1:-1].split(','):
+		for obj in objects:
+			if obj.name == name:
+				inlist.append(obj)
+				break
+	outlist = []
+	for name in info[3][1:-1].split(','):
+		for obj in objects:
+			if obj.name == name:
+				outlist.append(obj)
+				break
+	return Module(info[0], info[1], inlist, outlist, parse_description(info[4:]))
+
+def legacy_open(proj_dir):
+	'''
+	open_proj before the single pass: readline loops, linear name search, add_mod per module.
+	'''
+	f = open(os.path.join(proj_dir, 'data.txt'), 'r')
+	try:
+		proj_info = f.readline().rstrip('\n').split('\t')
+		variables = []
+		responses = []
+		processes = []
+		f.readline()
+		line = f.readline().rstrip('\n')
+		while not line == "responses:":
+			variables.append(parse_var(line))
+			line = f.readline().rstrip('\n')
+		line = f.readline().rstrip('\n')
+		while not line == "processes:":
+			responses.append(parse_resp(line))
+			line = f.readline().rstrip('\n')
+		objects = variables + responses
+		line = f.readline().rstrip('\n')
+		while not line == '':
+			proc, mod_num = parse_proc(line)
+			line = f.readline().rstrip('\n')
+			for i in range(mod_num):
+				proc.add_mod(legacy_parse_mod(line, objects))
+				line = f.readline().rstrip('\n')
+			processes.append(proc)
+		return Project(proj_info[0], variables, responses, processes, proj_info[1])
+	finally:
+		f.close()
+
+def timing(func, *args):
+	# like timeit, without the garbage collector scanning the live projects
+	gc.collect()
+	gc.disable()
+	try:
+		time_start = time.time()
+		result = func(*args)
+		return time.time() - time_start, result
+	finally:
+		gc.enable()
+
+
+proj = build(VARIABLES)
+with tempfile.TemporaryDirectory() as directory:
+	legacy_dir = os.path.join(directory, 'legacy')
+	stream_dir = os.path.join(directory, 'stream')
+	os.mkdir(legacy_dir)
+
+	def legacy_save():
+		with open(os.path.join(legacy_dir, 'data.txt'), 'w') as f:
+			f.write(legacy_str(proj))
+		proj.flags2False()
+
+	time_legacy_save, _ = timing(legacy_save)
+	time_save, _ = timing(file.save_as, proj, 'bench', stream_dir)
+	time_open, opened = timing(file.open_proj, stream_dir)
+	file.save_as(build(LEGACY_VARIABLES), 'small', legacy_dir)
+	time_legacy_open, _ = timing(legacy_open, legacy_dir)
+	time_small_open, _ = timing(file.open_proj, legacy_dir)
+
+	# round trip, the header holds the directory
+	file.save_as(opened, 'bench', legacy_dir)
+	with open(os.path.join(stream_dir, 'data.txt'), 'r') as f:
+		text = f.read()
+	with open(os.path.join(legacy_dir, 'data.txt'), 'r') as f:
+		assert f.read().split('\n', 1)[1] == text.split('\n', 1)[1], "save -> open -> save changed the project file"
+	size = len(text)
+
+	# binary file
+	time_convert, _ = timing(file.convert, stream_dir, 'npz')
+	time_npz, opened = timing(file.open_proj, stream_dir, 'npz')
+	assert ''.join(opened.lines()) == text, "data.npz and data.txt hold different projects"
+	# npz -> txt -> npz
+	file.convert(stream_dir, 'txt')
+	file.convert(stream_dir, 'npz')
+	opened = file.open_proj(stream_dir, 'npz')
+	assert ''.join(opened.lines()) == text, "the conversions changed the project"
+	assert opened.processes[0].modules[-1].timeout == 30.0
+
+	def load_columns():
+		with read_columns(os.path.join(stream_dir, 'data.npz')) as columns:
+			return columns['var_lower'], columns['var_upper'], columns['var_baseline']
+
+	time_columns, _ = timing(load_columns)
+	size_npz = os.path.getsize(os.path.join(stream_dir, 'data.npz'))
+
+	# one-field edits, full save against journal save
+	var = proj.variables[VARIABLES // 2]
+	proj.edit_var(var, description='edited')
+	time_full, _ = timing(file.save, proj)
+	journal = Journal(proj)
+	times = []
+	for i in range(10):
+		proj.edit_var(var, description='edited ' + str(i))
+		times.append(timing(journal.save)[0])
+	time_journal = sum(times) / len(times)
+	assert str(file.open_proj(stream_dir)) == str(proj), "the journal does not restore the project"
+
+print("{} variables, {} responses, {} modules, {:.1f} MB".format(VARIABLES, RESPONSES, MODULES, size / 1e6))
+print("legacy save:      {:.3f} s".format(time_legacy_save))
+print("streaming save:   {:.3f} s".format(time_save))
+print("single-pass open: {:.3f} s".format(time_open))
+print("{} variables: legacy open {:.3f} s, single-pass open {:.3f} s".format(
+	LEGACY_VARIABLES, time_legacy_open, time_small_open))
+print("round trip identical")
+print("convert to npz:   {:.3f} s, {:.1f} MB".format(time_convert, size_npz / 1e6))
+print("npz open:         {:.3f} s".format(time_npz))
+print("npz columns:      {:.4f} s".format(time_columns))
+print("one-field edit:   full save {:.3f} s, journal save {:.5f} s".format(time_full, time_journal))
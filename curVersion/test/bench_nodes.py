@@ -0,0 +1,71 @@
+'''
+Benchmark the memory and the creation time of a project of 500k workflow nodes:
+300k variables, 100k responses, 100k modules in 100 processes.
+
+Run from the repository root:
+	python -m curVersion.test.bench_nodes
+'''
+import gc
+import time
+import tracemalloc
+from ..optkit.workflow import Continuous, Discrete, Constant, Monitored, Module, Process, Project
+
+VARIABLES = 300000
+RESPONSES = 100000
+PROCESSES = 100
+
+def build():
+	variables = []
+	for i in range(VARIABLES):
+		if i % 3 == 0:
+			variables.append(Continuous('var' + str(i), (-1.0 - i, 1.0 + i), 0.5 + i, 100))
+		elif i % 3 == 1:
+			variables.append(Discrete('var' + str(i), [1.0, 2.0, 3.0], 2.0))
+		else:
+			variables.append(Constant('var' + str(i), 1.0 + i))
+	responses = [Monitored('resp' + str(i)) for i in range(RESPONSES)]
+	# module i reads 3 variables and writes response i
+	modules = [Module('mod' + str(i), 'General', variables[3 * i:3 * i + 3], [responses[i]])
+			   for i in range(RESPONSES)]
+	step = RESPONSES // PROCESSES
+	processes = [Process('proc' + str(i), modules[i * step:(i + 1) * step]) for i in range(PROCESSES)]
+	return Project('bench', variables, responses, processes)
+
+def access(proj):
+	'''
+	Read the attributes of every variable, as the parsers and the optimizer setup do.
+	'''
+	total = 0.0
+	for var in proj.variables:
+		total += var.baseline
+		if var.changedFlag:
+			total += 1
+	return total
+
+
+gc.collect()
+time_start = time.time()
+proj = build()
+time_build = time.time() - time_start
+del proj
+gc.collect()
+# tracemalloc slows the creation down, the memory is measured on a second build
+tracemalloc.start()
+proj = build()
+memory = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+nodes = 1 + VARIABLES + RESPONSES + RESPONSES + PROCESSES
+time_start = time.time()
+for i in range(10):
+	access(proj)
+time_access = (time.time() - time_start) / 10
+time_start = time.time()
+proj.flags2False()
+time_clear = time.time() - time_start
+
+print("{} nodes".format(nodes))
+print("memory:   {:.1f} MB, {:.0f} bytes/node".format(memory / 1e6, memory / nodes))
+print("creation: {:.3f} s".format(time_build))
+print("attribute reads over the variables: {:.4f} s".format(time_access))
+print("flags2False: {:.4f} s".format(time_clear))
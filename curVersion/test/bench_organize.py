@@ -0,0 +1,123 @@
+'''
+Benchmark Process.organize on synthetic layered DAGs, and the incremental update of an
+organized process on small edits against organizing it again after every edit.
+Every module of a layer uses responses produced by random modules of the previous layers.
+
+Run from the repository root:
+	python -m curVersion.test.bench_organize
+'''
+import time
+import random
+from queue import Queue
+from ..optkit.workflow import Continuous, Monitored, Module, Process
+
+def legacy_organize(self, resp_list):
+	'''
+	The organize before the sparse graph: dense module-response matrices, a triple loop for the
+	module graph and a queue.Queue.
+	'''
+	sourceMatrix = []
+	targetMatrix = []
+	moduleGraph = []
+	module_num = len(self.modules)
+	for mod in self.modules:
+		stemp = []
+		ttemp = []
+		for resp in resp_list:
+			stemp.append(1 if resp in mod.outlist else 0)
+			ttemp.append(1 if resp in mod.inlist else 0)
+		sourceMatrix.append(stemp)
+		targetMatrix.append(ttemp)
+	for i in range(module_num):
+		temp = []
+		for j in range(module_num):
+			addition = 0
+			for n in range(len(resp_list)):
+				addition += sourceMatrix[i][n] * targetMatrix[j][n]
+			temp.append(addition)
+		moduleGraph.append(temp)
+	topol_que = Queue()
+	topol_info = []
+	temp_organized = []
+	for i in range(module_num):
+		indegree = 0
+		for j in range(module_num):
+			indegree += moduleGraph[j][i]
+		if indegree == 0:
+			topol_info.append([indegree, 0])
+			topol_que.put(i)
+			if len(temp_organized) == 0:
+				temp_organized.append([])
+			temp_organized[0].append(self.modules[i])
+		else:
+			topol_info.append([indegree, -1])
+	while not topol_que.empty():
+		mod_index = topol_que.get()
+		for i in range(module_num):
+			if not moduleGraph[mod_index][i] == 0:
+				topol_info[i][0] -= 1
+				if topol_info[i][0] == 0:
+					topol_info[i][1] = topol_info[mod_index][1] + 1
+					topol_que.put(i)
+					if len(temp_organized) <= topol_info[i][1]:
+						temp_organized.append([])
+					temp_organized[topol_info[i][1]].append(self.modules[i])
+	return temp_organized
+
+def synthetic(modules, layers, fan_in=3, seed=0):
+	'''
+	Return a process of modules in layers and its responses, each module produces one response.
+	'''
+	rng = random.Random(seed)
+	variable = Continuous('x', (-1, 1), 1, 10)
+	responses = []
+	mods = []
+	per_layer = modules // layers
+	for layer in range(layers):
+		produced = len(responses)
+		for i in range(per_layer):
+			resp = Monitored('r{}_{}'.format(layer, i))
+			if layer == 0:
+				inlist = [variable]
+			else:
+				# one distinct response of each of fan_in random modules of the previous layers
+				inlist = rng.sample(responses[:produced], min(fan_in, produced))
+			mods.append(Module('m{}_{}'.format(layer, i), 'General', inlist, [resp]))
+			responses.append(resp)
+	rng.shuffle(mods)
+	return Process('proc', mods), responses
+
+def timing(organize, proc, responses):
+	time_start = time.time()
+	organized = organize(proc, responses)
+	return time.time() - time_start, organized
+
+for modules in [100, 300, 1000, 10000, 100000]:
+	proc, responses = synthetic(modules, 10)
+	time_sparse, _ = timing(Process.organize, proc, responses)
+	sparse = [[mod.name for mod in step] for step in proc.organized]
+	line = "modules={:>6}: sparse {:.4f} s".format(modules, time_sparse)
+	if modules <= 300:
+		time_legacy, legacy = timing(legacy_organize, proc, responses)
+		assert sparse == [[mod.name for mod in step] for step in legacy]
+		line += ", legacy {:.4f} s".format(time_legacy)
+	print(line)
+
+edits = 1000
+proc, responses = synthetic(10000, 10)
+proc.organize(responses)
+rng = random.Random(1)
+mods = [rng.choice(proc.modules) for i in range(edits)]
+resps = [rng.choice(responses[:1000]) for i in range(edits)]
+time_start = time.time()
+for mod, resp in zip(mods, resps):
+	mod.add_inlist(resp)
+	mod.del_inlist(resp)
+time_incremental = (time.time() - time_start) / (2 * edits)
+time_start = time.time()
+for mod, resp in zip(mods[:10], resps[:10]):
+	mod.inlist.append(resp)
+	proc.organize(responses)
+time_reorganize = (time.time() - time_start) / 10
+print("modules={:>6}: incremental edit {:.6f} s, organize after edit {:.4f} s".format(
+	10000, time_incremental, time_reorganize))
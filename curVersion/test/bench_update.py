@@ -0,0 +1,73 @@
+'''
+Benchmark the per-iteration overhead of PSO_Optimizer with a trivial objective.
+P = 10000 particles, D = 200 dimensions.
+Both variants time the same step, the update of pbest, gbest, velocity and position, without
+the evaluation and the snapping of the discrete dimensions.
+
+Run from the repository root:
+	python -m curVersion.test.bench_update
+'''
+import time
+import numpy as np
+from ..optkit.workflow import Continuous
+from ..optkit.algorithm.PSO import PSO_Optimizer, Ring, Callback
+
+PARTICLES = 10000
+DIMENSIONS = 200
+ITERATIONS = 20
+
+def trivial(position):
+	return position[:, 0]
+
+def legacy_iteration(opt, i, iterations):
+	'''
+	The swarm update before the in-place kernel: Python loop over the particles for pbest and
+	temporary arrays for every term of the velocity update.
+	'''
+	swarm = opt.pswarm
+	for j in range(opt.particles):
+		if swarm.evaluation[j] < swarm.pbest_eval[j]:
+			swarm.pbest_eval[j] = swarm.evaluation[j]
+			swarm.pbest_pos[j] = swarm.position[j]
+	swarm.gbest_eval = swarm.pbest_eval.min(axis=0)
+	swarm.gbest_pos = swarm.pbest_pos[swarm.pbest_eval.argmin(axis=0)]
+	local_best = opt.topology.local_best(swarm, opt.all_index)
+	w = 0.5 * (iterations - i) / iterations + 0.4
+	cognitive = 2 * opt.rng.uniform(0, 1, (opt.particles, opt.dimensions)) * (swarm.pbest_pos - swarm.position)
+	social = 2 * opt.rng.uniform(0, 1, (opt.particles, opt.dimensions)) * (local_best - swarm.position)
+	temp_velocity = w * swarm.velocity + cognitive + social
+	temp_velocity = np.where(temp_velocity >= -opt.v_limit, temp_velocity, -opt.v_limit)
+	swarm.velocity = np.where(temp_velocity <= opt.v_limit, temp_velocity, opt.v_limit)
+	temp_position = swarm.position + swarm.velocity
+	temp_position = np.where(temp_position >= opt.lower, temp_position, opt.lower)
+	swarm.position = np.where(temp_position <= opt.upper, temp_position, opt.upper)
+
+
+class Timer(Callback):
+	def __init__(self):
+		self.times = []
+
+	def on_iteration_end(self, optimizer, info):
+		self.times.append(info['iteration_time'] - info['evaluation_time'] - info['snap_time'])
+
+
+variables = [Continuous('var' + str(i), (-32, 32), 1, 100) for i in range(DIMENSIONS)]
+
+opt = PSO_Optimizer(PARTICLES, 3, variables, seed=0, topology=Ring())
+opt.optimize(1, trivial, batch=True)
+times = []
+for i in range(1, ITERATIONS + 1):
+	opt.pswarm.evaluation = trivial(opt.pswarm.position)
+	time_start = time.time()
+	legacy_iteration(opt, i, ITERATIONS + 1)
+	times.append(time.time() - time_start)
+time_legacy = np.mean(times)
+
+opt = PSO_Optimizer(PARTICLES, 3, variables, seed=0, topology=Ring())
+timer = Timer()
+opt.optimize(ITERATIONS + 1, trivial, batch=True, callback=timer)
+time_inplace = np.mean(timer.times[1:])
+
+print("P={}, D={}, {} iterations".format(PARTICLES, DIMENSIONS, ITERATIONS))
+print("legacy update:   {:.4f} s/iteration".format(time_legacy))
+print("in-place update: {:.4f} s/iteration".format(time_inplace))
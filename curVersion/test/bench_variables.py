@@ -0,0 +1,74 @@
+'''
+Benchmark 100k variables as plain Continuous objects against the views of a VariableSet:
+the memory of the variables, writing one position to their values and creating a
+PSO_Optimizer over them.
+
+Run from the repository root:
+	python -m curVersion.test.bench_variables
+'''
+import gc
+import time
+import tracemalloc
+import numpy as np
+from ..optkit.workflow import Continuous, VariableSet
+from ..optkit.algorithm.PSO import PSO_Optimizer
+
+VARIABLES = 100000
+WRITES = 20
+
+# every variable has its own bounds, as when they are loaded from a project file
+def build_plain():
+	return [Continuous('var' + str(i), (-32.0 - i, 32.0 + i), 1.0 + i, 100 + i) for i in range(VARIABLES)]
+
+def build_set():
+	vset = VariableSet(capacity=VARIABLES)
+	for i in range(VARIABLES):
+		vset.add_continuous('var' + str(i), (-32.0 - i, 32.0 + i), 1.0 + i, 100 + i)
+	return vset
+
+def measure(build):
+	gc.collect()
+	tracemalloc.start()
+	time_start = time.time()
+	variables = build()
+	time_build = time.time() - time_start
+	memory = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return variables, time_build, memory
+
+def write_plain(variables, position):
+	for var, value in zip(variables, position):
+		var.value = value
+
+def write_set(vset, indices, position):
+	vset.value[indices] = position
+
+def timing(func, *args):
+	time_start = time.time()
+	for i in range(WRITES):
+		func(*args)
+	return (time.time() - time_start) / WRITES
+
+
+position = np.random.default_rng(0).uniform(-32, 32, VARIABLES)
+plain, build_plain_time, memory_plain = measure(build_plain)
+vset, build_set_time, memory_set = measure(build_set)
+views = list(vset)
+_, indices = VariableSet.locate(views)
+
+time_write_plain = timing(write_plain, plain, position)
+time_write_set = timing(write_set, vset, indices, position)
+assert np.array_equal([var.value for var in views], position)
+
+time_start = time.time()
+PSO_Optimizer(2, 1, plain, seed=0)
+time_opt_plain = time.time() - time_start
+time_start = time.time()
+PSO_Optimizer(2, 1, views, seed=0)
+time_opt_set = time.time() - time_start
+
+print("{} variables".format(VARIABLES))
+print("plain:       {:.0f} bytes/variable, created in {:.3f} s".format(memory_plain / VARIABLES, build_plain_time))
+print("VariableSet: {:.0f} bytes/variable, created in {:.3f} s".format(memory_set / VARIABLES, build_set_time))
+print("write one position: plain {:.5f} s, VariableSet {:.5f} s".format(time_write_plain, time_write_set))
+print("PSO_Optimizer(): plain {:.3f} s, VariableSet {:.3f} s".format(time_opt_plain, time_opt_set))
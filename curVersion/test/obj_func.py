@@ -2,6 +2,7 @@
 Test objective functions for the optimization.
 '''
 import math
+import numpy as np
 
 def ackley_func(variables):
 	'''
@@ -28,4 +29,16 @@ def rastrigin_func(variables):
 	_sum = 0
 	for var in variables:
 		_sum += va.value ** 2.0 - 10.0 * math.cos(2.0 * math.pi * var.value)
-	return 10.0 * d + _sum
\ No newline at end of file
+	return 10.0 * d + _sum
+
+def ackley_batch(position):
+	'''
+	Vectorised ackley_func for batch evaluation.
+	position is of size (particles, dimensions).
+	'''
+	position = np.asarray(position, dtype=float)
+	dim = position.shape[-1]
+	return (-20.0 * np.exp(-0.2 * np.sqrt((position ** 2).sum(axis=-1) / dim))
+			- np.exp(np.cos(2.0 * np.pi * position).sum(axis=-1) / dim)
+			+ 20.0
+			+ math.exp(1))
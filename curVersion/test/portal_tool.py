@@ -0,0 +1,42 @@
+'''
+A stand-in for a simulation software, used by test_portal and test_parallel.
+Reads "name value" lines and writes "<prefix>sq <sum of squares>" and "<prefix>sum <sum>".
+	python portal_tool.py                                 one-shot, stdin -> stdout
+	python portal_tool.py --input in.txt --output out.txt one-shot, input file -> output file
+	python portal_tool.py --server                        server mode, requests end with a line "END"
+	--delay seconds : the start-up cost of the software
+	--prefix str : the prefix of the output names
+'''
+import sys
+import time
+import argparse
+
+def simulate(lines, prefix):
+	values = [float(line.split()[1]) for line in lines if line.strip()]
+	return '{0}sq {1!r}\n{0}sum {2!r}\n'.format(prefix, sum(v ** 2 for v in values), sum(values))
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--server', action='store_true')
+	parser.add_argument('--input')
+	parser.add_argument('--output')
+	parser.add_argument('--delay', type=float, default=0.2)
+	parser.add_argument('--prefix', default='')
+	args = parser.parse_args()
+	time.sleep(args.delay)
+	if args.server:
+		request = []
+		for line in sys.stdin:
+			if line.strip() == 'END':
+				sys.stdout.write(simulate(request, args.prefix) + 'END\n')
+				sys.stdout.flush()
+				request = []
+			else:
+				request.append(line)
+	elif not args.input is None:
+		with open(args.input) as f:
+			output = simulate(f.readlines(), args.prefix)
+		with open(args.output, 'w') as f:
+			f.write(output)
+	else:
+		sys.stdout.write(simulate(sys.stdin.readlines(), args.prefix))
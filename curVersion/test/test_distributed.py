@@ -0,0 +1,19 @@
+from ..optkit.workflow import Continuous
+from ..optkit.algorithm import WorkerServer, DistributedEvaluator
+from ..optkit.algorithm.PSO import PSO_Optimizer, ConsoleReporter
+from .obj_func import ackley_batch
+
+variables = []
+for i in range(20):
+	name = 'var' + str(i)
+	variables.append(Continuous(name, (-32,32), 1, 100))
+
+if __name__ == '__main__':
+	# two local worker servers stand in for the machines of the farm
+	with WorkerServer(ackley_batch, workers=2) as server0, WorkerServer(ackley_batch, workers=2) as server1:
+		with DistributedEvaluator([server0.address, server1.address], batch_size=8, timeout=10.0) as evaluator:
+			opt = PSO_Optimizer(30, 20, variables, seed=0)
+			opt.optimize(100, ackley_batch, evaluator=evaluator, callback=ConsoleReporter(every=10))
+
+			opt = PSO_Optimizer(30, 20, variables, seed=0)
+			opt.optimize_async(100, ackley_batch, evaluator, callback=ConsoleReporter(every=10))
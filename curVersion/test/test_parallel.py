@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+from ..optkit.workflow import Continuous, Objective, Monitored, Module, Process
+from ..optkit.utils.portals import Portal, add_portal
+
+tool = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'portal_tool.py')
+add_portal(Portal('A', [sys.executable, tool, '--prefix', 'a_', '--delay', '0.2']))
+add_portal(Portal('B', [sys.executable, tool, '--prefix', 'b_', '--delay', '0.2']))
+add_portal(Portal('C', [sys.executable, tool, '--prefix', 'c_', '--delay', '0.6']))
+add_portal(Portal('D', [sys.executable, tool, '--prefix', 'd_', '--delay', '0.2']))
+
+x0 = Continuous('x0', (-5, 5), 1, 100)
+x1 = Continuous('x1', (-5, 5), 2, 100)
+responses = [Monitored('a_sq'), Monitored('b_sq'), Monitored('c_sq'), Objective('d_sum')]
+a_sq, b_sq, c_sq, d_sum = responses
+
+# levels: [mod_a, mod_c], [mod_b], [mod_d]
+# mod_b can start when mod_a is done, while the slow mod_c is still running
+mod_a = Module('mod_a', 'A', [x0], [a_sq])
+mod_b = Module('mod_b', 'B', [a_sq], [b_sq])
+mod_c = Module('mod_c', 'C', [x1], [c_sq])
+mod_d = Module('mod_d', 'D', [b_sq, c_sq], [d_sum])
+proc = Process('proc', [mod_a, mod_b, mod_c, mod_d])
+proc.organize(responses)
+print(proc.print_organized())
+
+for executor, schedule in [(None, 'level'), ('thread', 'level'), ('thread', 'dag'), ('process', 'dag')]:
+	proc.set_parallel(executor, schedule=schedule)
+	proc.invalidate()
+	time_start = time.time()
+	evaluation = proc.run_proc()
+	print(executor, schedule, evaluation, 'time consume: {:.3f}'.format(time.time() - time_start))
+
+# only the modules downstream of a changed variable are run again
+x1.value = 3
+proc.run_proc()
+print('x1 changed, executed:', [mod.name for mod in proc.executed])
+proc.run_proc()
+print('nothing changed, executed:', [mod.name for mod in proc.executed])
+proc.close()
+
+# a module sent to a worker process does not carry the project which holds its variables
+import pickle
+from ..optkit.workflow import Project
+variables = [Continuous('v' + str(i), (-5, 5), 1, 100) for i in range(20000)]
+out = Monitored('out')
+mod = Module('mod', 'A', variables[:2], [out])
+size = len(pickle.dumps(mod.compute))
+big = Project('big', variables, [out], [Process('big_proc', [mod])])
+assert len(pickle.dumps(mod.compute)) == size, "the pickled module carries its ancestors"
+print('pickled module:', size, 'bytes')
+
+# the restored nodes are linked to their parents again
+big.flags2False()
+restored = pickle.loads(pickle.dumps(big))
+assert not restored.changedFlag
+var = restored.variables[0]
+assert restored.processes[0].modules[0].inlist[0] is var
+var.rename('w0')
+assert restored.changedFlag and restored.names['w0'] is var
+assert not big.changedFlag
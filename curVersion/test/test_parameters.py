@@ -7,6 +7,15 @@ var_const = Constant('var_const', 9, 'Constant variable.')
 
 var_list = [var_cont, var_disc, var_const]
 
+# the grid of a continuous variable has at least one step
+for resolution in (0, -1):
+	try:
+		Continuous('var_grid', (1.0, 10.0), 5, resolution)
+	except ValueError:
+		pass
+	else:
+		raise AssertionError("Continuous accepted resolution {}".format(resolution))
+
 resp_obj1 = Objective('resp_obj1', 0, 1.0, 'Objective response.')
 resp_obj2 = Objective('resp_obj2', 0, 1.0, 'Objective response.')
 resp_constr1 = Constraint('resp_constr1', 0, 10, 'Constraint response.')
@@ -27,4 +36,83 @@ print(proj)
 for p in proj.processes:
 	for m in p.modules:
 		for r in m.outlist:
-			print(r)
\ No newline at end of file
+			print(r)
+# the views of a VariableSet accept and reject the same values as the plain variables
+import numpy as np
+makers = {'Continuous' : lambda: Continuous('var_cont', (1.0, 10.0), 5, 100),
+		  'Discrete' : lambda: Discrete('var_disc', [1, 2, 3, 4, 5, 6, 7], 3),
+		  'Constant' : lambda: Constant('var_const', 9)}
+
+def outcome(var, name, value):
+	try:
+		if name == 'value':
+			var.value = value
+		else:
+			var.edit(**{name : value})
+	except Exception as e:
+		return type(e)
+	return getattr(var, name)
+
+# kind, attribute, value, whether the value is valid
+for kind, name, value, valid in [
+		('Continuous', 'value', '3', False), ('Continuous', 'value', np.float32(0.5), True),
+		('Continuous', 'value', np.int64(2), True), ('Continuous', 'baseline', '3', False),
+		('Continuous', 'baseline', np.float32(4.0), True), ('Continuous', 'baseline', np.int64(4), True),
+		('Continuous', 'var_range', ('1', 10.0), False), ('Continuous', 'var_range', (np.float32(2), 9), True),
+		('Continuous', 'resolution', 2.0, False), ('Continuous', 'resolution', 20, True),
+		('Discrete', 'value', '3', False), ('Discrete', 'var_range', ['1', '2'], False),
+		('Discrete', 'var_range', [np.float32(1), 3.0], True),
+		('Constant', 'value', None, False), ('Constant', 'baseline', '9', False),
+		('Constant', 'baseline', np.float32(8), True)]:
+	plain = makers[kind]()
+	view = VariableSet([plain])[0]
+	expected = outcome(plain, name, value)
+	assert outcome(view, name, value) == expected, "{}.{} = {!r}".format(kind, name, value)
+	assert (expected is TypeError) == (not valid), "{}.{} = {!r}".format(kind, name, value)
+
+# copied and unpickled nodes take new children
+import copy
+import pickle
+for restore in (copy.copy, copy.deepcopy, lambda node: pickle.loads(pickle.dumps(node))):
+	proc = restore(Process('proc_empty'))
+	proc.add_mod(Module('mod_new', 'General', [var_cont], [resp_moni]))
+	assert proc.changedFlag and proc.modules[0].parents == [proc]
+	empty = restore(Project('proj_empty'))
+	empty.flags2False()
+	empty.add_var(Continuous('var_new', (1.0, 10.0), 5, 100))
+	assert empty.changedFlag and empty.variables[0].parents == [empty]
+
+# a shallow copy shares the modules but leaves the original process unchanged
+mod_shared = Module('mod_shared', 'General', [var_cont], [resp_moni])
+proc_orig = Process('proc_orig', [mod_shared])
+proc_copy = copy.copy(proc_orig)
+assert proc_copy.child is proc_copy.modules and not proc_copy.child is proc_orig.child
+assert proc_copy.modules[0] is mod_shared and mod_shared.parents == [proc_orig]
+proc_copy.add_mod(Module('mod_added', 'General', [var_const], [resp_obj1]))
+assert [mod.name for mod in proc_orig.modules] == ['mod_shared'] and not 'mod_added' in proc_orig.mod_names
+proc_orig.clear_flags()
+proc_copy.del_mod(mod_shared)
+assert not proc_orig.changedFlag and mod_shared.parents == [proc_orig]
+
+# the module timeout is saved in data.txt and in the journal
+import os
+import tempfile
+from ..optkit.utils import file
+from ..optkit.utils.file import Journal, parse_mod
+timed = Module('mod_timed', 'General', [var_cont], [resp_moni], 'Timed\tmodule.', timeout=2.5)
+untimed = Module('mod_untimed', 'General', [var_const], [resp_obj1], 'Untimed module.')
+proj_timed = Project('proj_timed', [var_cont, var_const], [resp_obj1, resp_moni],
+					 [Process('proc_timed', [timed, untimed])])
+with tempfile.TemporaryDirectory() as directory:
+	file.save_as(proj_timed, 'proj_timed', directory)
+	opened = file.open_proj(directory)
+	assert [mod.timeout for mod in opened.processes[0].modules] == [2.5, None]
+	assert opened.processes[0].modules[0].description == 'Timed\tmodule.'
+	journal = Journal(opened)
+	opened.processes[0].modules[1].edit(timeout=7.0)
+	journal.save()
+	reopened = file.open_proj(directory)
+	assert [mod.timeout for mod in reopened.processes[0].modules] == [2.5, 7.0]
+# the module lines written before the timeout field
+old = parse_mod('mod_old\tGeneral\t[var_cont]\t[resp_moni]\tOld module.', {'var_cont' : var_cont, 'resp_moni' : resp_moni})
+assert old.timeout is None and old.description == 'Old module.'
@@ -0,0 +1,25 @@
+import os
+import sys
+import time
+from ..optkit.workflow import Continuous, Objective, Monitored, Module, Process
+from ..optkit.utils.portals import Portal, add_portal
+
+tool = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'portal_tool.py')
+add_portal(Portal('Tool', [sys.executable, tool], timeout=10))
+add_portal(Portal('ToolFile', [sys.executable, tool, '--input', 'in.txt', '--output', 'out.txt'], input_file='in.txt', output_file='out.txt'))
+add_portal(Portal('ToolServer', [sys.executable, tool, '--server'], server=True))
+
+x0 = Continuous('x0', (-5, 5), 1, 100)
+x1 = Continuous('x1', (-5, 5), 2, 100)
+sq = Monitored('sq')
+total = Objective('sum')
+
+for portal in ['Tool', 'ToolFile', 'ToolServer']:
+	mod = Module('mod', portal, [x0, x1], [sq, total], timeout=5)
+	proc = Process('proc', [mod])
+	proc.organize([sq, total])
+	time_start = time.time()
+	for i in range(5):
+		x0.value = i
+		evaluation = proc.run_proc()
+	print(portal, sq.value, evaluation, 'time consume: {:.3f}'.format(time.time() - time_start))
@@ -1,6 +1,10 @@
+import os
+import tempfile
 from ..optkit.workflow import Continuous, Discrete
-from ..optkit.algorithm.PSO import PSO_Optimizer
-from .obj_func import ackley_func
+from ..optkit.algorithm import SerialEvaluator, ThreadEvaluator, ProcessEvaluator
+from ..optkit.algorithm.PSO import (PSO_Optimizer, IslandOptimizer, ConsoleReporter, JSONLinesLogger, Callback,
+									Checkpoint, Stall)
+from .obj_func import ackley_func, ackley_batch
 
 variables = []
 #var_range = list(range(-32, 33))
@@ -10,4 +14,82 @@ for i in range(20):
 	#variables.append(Discrete(name, var_range, 1))
 
 opt = PSO_Optimizer(30, 20, variables)
-opt.optimize(100, ackley_func, variables)
\ No newline at end of file
+opt.optimize(100, lambda: ackley_func(variables))
+
+# the options are keyword-only, a positional third argument is not taken for batch
+opt = PSO_Optimizer(30, 20, variables)
+try:
+	opt.optimize(100, ackley_func, variables)
+except TypeError:
+	pass
+else:
+	raise AssertionError("optimize() accepted a positional option")
+
+opt = PSO_Optimizer(30, 20, variables)
+opt.optimize(100, ackley_batch, batch=True, callback=ConsoleReporter())
+
+opt = PSO_Optimizer(30, 20, variables)
+try:
+	opt.optimize(100, ackley_batch, batch=True, evaluator=SerialEvaluator())
+except ValueError:
+	pass
+else:
+	raise AssertionError("optimize() accepted both batch and evaluator")
+
+# a run resumed from its checkpoint stops where the uninterrupted run stops, the stall count
+# of Stall is saved in the checkpoint
+class Interrupt(Callback):
+	def __init__(self, iteration):
+		self.iteration = iteration
+
+	def on_iteration_start(self, optimizer, info):
+		if info['iteration'] == self.iteration:
+			raise KeyboardInterrupt
+
+opt = PSO_Optimizer(30, 20, variables, seed=0)
+opt.optimize(200, ackley_batch, batch=True, termination=Stall(10, 0.5))
+with tempfile.TemporaryDirectory() as directory:
+	path = os.path.join(directory, 'checkpoint.npz')
+	other = PSO_Optimizer(30, 20, variables, seed=0)
+	try:
+		other.optimize(200, ackley_batch, batch=True, checkpoint=Checkpoint(path, every=5),
+					   callback=Interrupt(50), termination=Stall(10, 0.5))
+	except KeyboardInterrupt:
+		pass
+	other = PSO_Optimizer(30, 20, variables, seed=0)
+	other.resume(path, ackley_batch, batch=True, termination=Stall(10, 0.5))
+assert other.iteration == opt.iteration and other.stop_reason == opt.stop_reason
+assert other.pswarm.gbest_eval == opt.pswarm.gbest_eval
+
+# an interrupted run still flushes and closes the log
+with tempfile.TemporaryDirectory() as directory:
+	path = os.path.join(directory, 'log.jsonl')
+	logger = JSONLinesLogger(path)
+	opt = PSO_Optimizer(30, 20, variables, seed=0)
+	try:
+		opt.optimize(100, ackley_batch, batch=True, callback=[logger, Interrupt(5)])
+	except KeyboardInterrupt:
+		pass
+	assert logger.file is None
+	with open(path) as f:
+		# iteration_start and iteration_end of 5 iterations, iteration_start of the interrupted one
+		assert len(f.readlines()) == 5 * 2 + 1
+
+if __name__ == '__main__':
+	# the evaluators follow the same trajectory as the batch evaluation for a given seed
+	opt = PSO_Optimizer(30, 20, variables, seed=0)
+	opt.optimize(20, ackley_batch, batch=True)
+	for evaluator_type in (SerialEvaluator, ThreadEvaluator, ProcessEvaluator):
+		with evaluator_type(2) as evaluator:
+			other = PSO_Optimizer(30, 20, variables, seed=0)
+			other.optimize(20, ackley_batch, evaluator=evaluator)
+		assert other.pswarm.gbest_eval == opt.pswarm.gbest_eval, evaluator_type.__name__
+		assert (other.pswarm.gbest_pos == opt.pswarm.gbest_pos).all(), evaluator_type.__name__
+
+	opt = IslandOptimizer(3, 30, 20, variables, migration_interval=10, migrants=2, seed=0)
+	opt.optimize(100, ackley_batch, batch=True, callback=ConsoleReporter(every=10))
+
+	# obj_func(position) per particle follows the same trajectory as the batch evaluation
+	other = IslandOptimizer(3, 30, 20, variables, migration_interval=10, migrants=2, seed=0)
+	other.optimize(100, ackley_batch)
+	assert other.island_best == opt.island_best